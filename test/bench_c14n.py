@@ -0,0 +1,112 @@
+"""
+Time RDF canonicalization of blank node heavy datasets, with and without
+reuse of first degree hashes (see `CanonicalizationState.first_degree_hashes`),
+in worker processes (see `trld.c14n_parallel`) and with refined hashes (see
+`CanonicalizationState.refine_hashes`).
+
+Run with: python3 test/bench_c14n.py [SIZE] [JOBS]
+"""
+import sys
+import time
+from unittest.mock import patch
+
+from trld.c14n import CanonicalizationState, canonicalize
+from trld.c14n_parallel import canonicalize_parallel
+from trld.jsonld.rdf import RdfDataset, RdfGraph, RdfLiteral, RdfTriple
+
+from c14n_helpers import EX, part_hubs
+
+RDF = 'http://www.w3.org/1999/02/22-rdf-syntax-ns#'
+RDFS = 'http://www.w3.org/2000/01/rdf-schema#'
+OWL = 'http://www.w3.org/2002/07/owl#'
+SEC = 'https://w3id.org/security#'
+CRED = 'https://www.w3.org/2018/credentials#'
+
+
+def owl_restrictions(size: int) -> RdfDataset:
+    """
+    Classes restricted by some values from the same union of classes, giving
+    large groups of blank nodes with equal first degree hashes.
+    """
+    ds = RdfDataset()
+    graph = ds.default_graph
+    for i in range(size):
+        restriction, union = f'_:r{i}', f'_:u{i}'
+        graph.add(RdfTriple(f'{EX}C{i}', f'{RDFS}subClassOf', restriction))
+        graph.add(RdfTriple(restriction, f'{RDF}type', f'{OWL}Restriction'))
+        graph.add(RdfTriple(restriction, f'{OWL}onProperty', f'{EX}p'))
+        graph.add(RdfTriple(restriction, f'{OWL}someValuesFrom', union))
+        graph.add(RdfTriple(union, f'{RDF}type', f'{OWL}Class'))
+        items = [f'_:l{i}_{j}' for j in range(3)]
+        graph.add(RdfTriple(union, f'{OWL}unionOf', items[0]))
+        for j, item in enumerate(items):
+            graph.add(RdfTriple(item, f'{RDF}first', f'{EX}U{j}'))
+            rest = items[j + 1] if j + 1 < len(items) else f'{RDF}nil'
+            graph.add(RdfTriple(item, f'{RDF}rest', rest))
+    return ds
+
+
+def credential_proofs(size: int) -> RdfDataset:
+    """
+    A presentation of credentials, each with a blank node subject and a proof
+    (in a blank node named graph) of the same shape.
+    """
+    ds = RdfDataset()
+    graph = ds.default_graph
+    graph.add(RdfTriple('_:vp', f'{RDF}type', f'{CRED}VerifiablePresentation'))
+    for i in range(size):
+        cred, subject, proof_graph, proof = f'_:c{i}', f'_:s{i}', f'_:g{i}', f'_:p{i}'
+        graph.add(RdfTriple('_:vp', f'{CRED}verifiableCredential', cred))
+        graph.add(RdfTriple(cred, f'{RDF}type', f'{CRED}VerifiableCredential'))
+        graph.add(RdfTriple(cred, f'{CRED}issuer', f'{EX}issuer'))
+        graph.add(RdfTriple(cred, f'{CRED}credentialSubject', subject))
+        graph.add(RdfTriple(subject, f'{EX}degree', f'{EX}Bachelor'))
+        graph.add(RdfTriple(cred, f'{SEC}proof', proof_graph))
+        named = RdfGraph()
+        named.add(RdfTriple(proof, f'{RDF}type', f'{SEC}DataIntegrityProof'))
+        named.add(RdfTriple(proof, f'{SEC}verificationMethod', f'{EX}issuer#key-1'))
+        named.add(RdfTriple(proof, f'{SEC}proofValue', RdfLiteral('z58DAdFfa9SkqZMVPxAQpic7ndSayn1PzZs6ZjWp1CktyGesjuTSwRdoWhAfGFCF5bppETSTojQCrfFPP2oumHKtz')))
+        ds.add(proof_graph, named)
+    return ds
+
+
+def run(ds: RdfDataset, repeat: int = 3, jobs: int = 0, refine=False) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if jobs:
+            canonicalize_parallel(ds, jobs=jobs)
+        else:
+            canonicalize(ds, refine=refine)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    jobs = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    for name, ds in [
+        ('owl restrictions', owl_restrictions(size)),
+        ('credential proofs', credential_proofs(size)),
+        ('part hubs', part_hubs(min(size, 6))),
+    ]:
+        with patch.object(
+            CanonicalizationState,
+            'hash_first_degree_quads',
+            CanonicalizationState._hash_first_degree_quads,
+        ):
+            uncached = run(ds)
+        cached = run(ds)
+        parallel = run(ds, jobs=jobs)
+        refined = run(ds, refine=True)
+
+        print(f'{name}:')
+        print(f'  recomputed first degree hashes: {uncached:.3f}s')
+        print(f'  reused first degree hashes: {cached:.3f}s ({uncached / cached:.2f}x)')
+        print(f'  in {jobs} worker processes: {parallel:.3f}s ({cached / parallel:.2f}x)')
+        print(f'  with refined hashes: {refined:.3f}s ({cached / refined:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Compare expansion of records using a simple context, with and without the
+shortcut for simple contexts (see `trld.jsonld.expansion.is_simple_context`).
+
+Run with: python3 test/bench_expansion.py [RECORDS]
+"""
+import sys
+import time
+from unittest.mock import patch
+
+from trld.jsonld import expansion
+from trld.jsonld.expansion import expand
+
+CONTEXT = {
+    "@vocab": "http://example.org/ns#",
+    "id": "@id",
+    "type": "@type",
+    "sameAs": {"@id": "http://www.w3.org/2002/07/owl#sameAs", "@type": "@id"},
+    "hasPart": {"@type": "@id", "@container": "@set"},
+    "seq": {"@container": "@list"},
+    "labelByLang": {"@id": "label", "@container": "@language"},
+    "year": {"@type": "http://www.w3.org/2001/XMLSchema#gYear"},
+}
+
+
+def make_record(i: int) -> dict:
+    return {
+        "@context": CONTEXT,
+        "id": f"http://example.org/record/{i}",
+        "type": ["Record", "Thing"],
+        "sameAs": [f"http://example.net/{i}", f"http://example.com/{i}"],
+        "labelByLang": {"en": f"Record {i}", "sv": f"Post {i}"},
+        "year": str(1900 + i % 100),
+        "seq": [1, 2, 3],
+        "hasPart": [f"http://example.org/part/{i}/{j}" for j in range(5)],
+        "instanceOf": {
+            "type": "Work",
+            "title": {"mainTitle": f"Title {i}"},
+            "contribution": [
+                {"type": "Contribution", "agent": {"id": f"http://example.org/agent/{j}"}}
+                for j in range(3)
+            ],
+        },
+    }
+
+
+def run(docs, repeat=5) -> tuple:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [expand(doc, "http://example.org/") for doc in docs]
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+def compare(label, docs):
+    with patch.object(expansion, "is_simple_context", lambda context: False):
+        general, expected = run(docs)
+    simple, results = run(docs)
+    assert results == expected
+
+    print(f"{label}:")
+    print(f"  general: {general:.3f}s")
+    print(f"  simple: {simple:.3f}s ({general / simple:.2f}x)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    records = [make_record(i) for i in range(count)]
+
+    compare("records with own context", records)
+
+    graph = {"@context": CONTEXT, "@graph": []}
+    for record in records:
+        graph["@graph"].append({k: v for k, v in record.items() if k != "@context"})
+    compare("records in one graph", [graph])
+
+
+if __name__ == "__main__":
+    main()
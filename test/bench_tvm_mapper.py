@@ -0,0 +1,101 @@
+"""
+Time TVM mapping of a large graph, with the data index made up front (with
+reverse links, as before) and on demand (see `trld.tvm.mapper.DataIndex`).
+Also time mapping to several targets, one at a time and in one traversal
+(see `trld.tvm.mapper.map_to_targets`).
+
+Run with: python3 test/bench_tvm_mapper.py [SIZE]
+"""
+import sys
+import time
+from unittest.mock import patch
+
+from trld.jsonld.extras.index import make_index
+from trld.tvm import mapper
+from trld.tvm.mapmaker import make_target_map
+from trld.tvm.mapper import map_to, map_to_targets
+
+EX = 'http://example.org/ns#'
+SDO = 'http://schema.org/'
+OWL = 'http://www.w3.org/2002/07/owl#'
+RDFS = 'http://www.w3.org/2000/01/rdf-schema#'
+DC = 'http://purl.org/dc/terms/'
+
+VOCAB = [
+    {'@id': f'{EX}name', f'{OWL}equivalentProperty': [{'@id': f'{SDO}name'}]},
+    {'@id': f'{EX}author', f'{RDFS}subPropertyOf': [{'@id': f'{SDO}author'}]},
+    {'@id': f'{EX}Book', f'{RDFS}subClassOf': [{'@id': f'{SDO}Book'}]},
+    {'@id': f'{SDO}name', f'{OWL}equivalentProperty': [{'@id': f'{DC}title'}]},
+]
+
+
+class EagerIndex(mapper.DataIndex):
+    def __init__(self, graph):
+        super().__init__(graph)
+        self._index = make_index(graph)
+
+
+def make_graph(size: int) -> list:
+    graph = []
+    for i in range(size):
+        graph.append({
+            '@id': f'http://example.org/book/{i}',
+            '@type': [f'{EX}Book'],
+            f'{EX}name': [{'@value': f'Book {i}'}],
+            f'{EX}author': [{'@id': f'http://example.org/person/{i % 100}'}],
+        })
+    for i in range(100):
+        graph.append({
+            '@id': f'http://example.org/person/{i}',
+            f'{EX}name': [{'@value': f'Person {i}'}],
+        })
+    return graph
+
+
+def run(size: int, repeat: int = 3) -> float:
+    target_map = make_target_map(VOCAB, {'@context': {'@vocab': SDO}})
+    best = float('inf')
+    for _ in range(repeat):
+        graph = make_graph(size)
+        start = time.perf_counter()
+        map_to(target_map, graph)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_targets(size: int, together: bool, repeat: int = 3) -> float:
+    target_maps = [
+        make_target_map(VOCAB, {'@context': {'@vocab': vocab}}) for vocab in (SDO, DC, EX)
+    ]
+    best = float('inf')
+    for _ in range(repeat):
+        graph = make_graph(size)
+        start = time.perf_counter()
+        if together:
+            map_to_targets(target_maps, graph)
+        else:
+            for target_map in target_maps:
+                map_to(target_map, graph)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    with patch.object(mapper, 'DataIndex', EagerIndex):
+        eager = run(size)
+    lazy = run(size)
+
+    print(f'index made up front: {eager:.3f}s')
+    print(f'index made on demand: {lazy:.3f}s ({eager / lazy:.2f}x)')
+
+    separate = run_targets(size, False)
+    together = run_targets(size, True)
+
+    print(f'3 targets, one at a time: {separate:.3f}s')
+    print(f'3 targets, in one traversal: {together:.3f}s ({separate / together:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Datasets and helpers shared by the RDF canonicalization tests (and
+bench_c14n).
+"""
+from typing import List
+
+from trld.jsonld.rdf import RdfDataset, RdfLiteral, RdfTriple
+from trld.nq.serializer import repr_quad
+
+EX = 'http://example.org/'
+
+
+def clique(size: int) -> RdfDataset:
+    # Blank nodes all linked to each other, indistinguishable by their quads.
+    ds = RdfDataset()
+    for i in range(size):
+        for j in range(size):
+            if i != j:
+                ds.default_graph.add(RdfTriple(f'_:n{i}', f'{EX}p', f'_:n{j}'))
+    return ds
+
+
+def ring(size: int) -> RdfDataset:
+    # Blank nodes in a cycle, recursed through by the Hash N-Degree Quads algorithm.
+    ds = RdfDataset()
+    for i in range(size):
+        ds.default_graph.add(RdfTriple(f'_:n{i}', f'{EX}next', f'_:n{(i + 1) % size}'))
+    return ds
+
+
+def part_hubs(size: int) -> RdfDataset:
+    # Blank nodes with parts of the same shape, only told apart by the values
+    # of the parts (requiring permutations of all parts in RDFC-1.0).
+    ds = RdfDataset()
+    for h in range(2):
+        for i in range(size):
+            part, value = f'_:p{h}_{i}', f'_:v{h}_{i}'
+            ds.default_graph.add(RdfTriple(f'_:h{h}', f'{EX}hasPart', part))
+            ds.default_graph.add(RdfTriple(part, f'{EX}value', value))
+            ds.default_graph.add(RdfTriple(value, f'{EX}label', RdfLiteral(f'{h}.{i}')))
+    return ds
+
+
+def quad_lines(ds: RdfDataset) -> List[str]:
+    # The N-Quads lines of a dataset, in its order.
+    return [repr_quad(triple, name) for name, graph in ds for triple in graph]
+
+
+def sorted_quad_lines(ds: RdfDataset) -> List[str]:
+    return sorted(quad_lines(ds))
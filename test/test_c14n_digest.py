@@ -0,0 +1,35 @@
+import hashlib
+
+import pytest
+
+from trld.c14n import canonicalize, dataset_digest
+from trld.jsonld.rdf import RdfDataset, RdfGraph, RdfLiteral, RdfTriple
+
+from c14n_helpers import EX, quad_lines
+
+
+def _dataset(labels) -> RdfDataset:
+    a, b, g = labels
+    ds = RdfDataset()
+    ds.default_graph.add(RdfTriple(f'{EX}s', f'{EX}p', f'_:{a}'))
+    ds.default_graph.add(RdfTriple(f'_:{a}', f'{EX}q', f'_:{b}'))
+    ds.default_graph.add(RdfTriple(f'_:{b}', f'{EX}q', RdfLiteral('b', language='en')))
+    # A duplicate quad (the dataset is a set).
+    ds.default_graph.add(RdfTriple(f'_:{a}', f'{EX}q', f'_:{b}'))
+    named = RdfGraph()
+    named.add(RdfTriple(f'_:{a}', f'{EX}r', RdfLiteral('1', f'{EX}num')))
+    ds.add(f'_:{g}', named)
+    return ds
+
+
+@pytest.mark.parametrize('algorithm', ['sha256', 'sha384', 'sha512'])
+def test_digest_of_canonical_nquads(algorithm):
+    ds = _dataset('xyz')
+    # The same text as output by canonicalization to N-Quads.
+    text = ''.join(f'{line}\n' for line in sorted(set(quad_lines(canonicalize(ds)))))
+    expected = hashlib.new(algorithm, text.encode('utf-8')).hexdigest()
+    assert dataset_digest(ds, algorithm) == expected
+
+
+def test_digest_ignores_blank_node_labels():
+    assert dataset_digest(_dataset('xyz')) == dataset_digest(_dataset('zyx'))
@@ -0,0 +1,40 @@
+import pytest
+
+from trld.c14n import (CanonicalizationLimitError, CanonicalizationLimits,
+                       canonicalize)
+
+from c14n_helpers import clique, ring, sorted_quad_lines
+
+
+@pytest.mark.parametrize(
+    'ds, limits, limit',
+    [
+        (ring(10), CanonicalizationLimits(max_depth=2), 'max_depth'),
+        (clique(6), CanonicalizationLimits(max_n_degree_calls=50), 'max_n_degree_calls'),
+        (clique(6), CanonicalizationLimits(max_permutations=100), 'max_permutations'),
+        (clique(6), CanonicalizationLimits(timeout=0.0), 'timeout'),
+    ],
+)
+def test_poisoned_dataset_exceeds_limit(ds, limits, limit):
+    with pytest.raises(CanonicalizationLimitError) as excinfo:
+        canonicalize(ds, limits=limits)
+
+    error = excinfo.value
+    assert error.limit == limit
+    assert error.n_degree_calls > 0
+    assert limit in str(error)
+    if limit == 'max_depth':
+        assert error.depth == 3
+    elif limit == 'max_n_degree_calls':
+        assert error.n_degree_calls == 51
+    elif limit == 'max_permutations':
+        assert error.permutations <= 100
+
+
+@pytest.mark.parametrize('ds', [clique(3), ring(5)])
+def test_limits_do_not_change_result(ds):
+    limits = CanonicalizationLimits(
+        max_depth=10, max_n_degree_calls=1000, max_permutations=1000, timeout=60.0
+    )
+    expected = sorted_quad_lines(canonicalize(ds))
+    assert sorted_quad_lines(canonicalize(ds, limits=limits)) == expected
@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from trld.c14n import (CanonicalizationLimitError, CanonicalizationLimits,
+                       canonicalize)
+from trld.c14n_parallel import canonicalize_parallel
+from trld.jsonld.rdf import RdfDataset, RdfGraph, RdfTriple
+
+from c14n_helpers import EX, clique, quad_lines
+
+
+def _random_dataset(seed: int) -> RdfDataset:
+    # Few predicates and many blank nodes, giving groups with equal hashes.
+    rnd = random.Random(seed)
+    ds = RdfDataset()
+    graphs = [ds.default_graph]
+    for g in range(2):
+        graph = RdfGraph()
+        ds.add(f'_:g{g}', graph)
+        graphs.append(graph)
+    for _ in range(40):
+        s = f'_:b{rnd.randrange(12)}'
+        o = rnd.choice([f'_:b{rnd.randrange(12)}', f'{EX}o'])
+        rnd.choice(graphs).add(RdfTriple(s, f'{EX}p{rnd.randrange(2)}', o))
+    return ds
+
+
+@pytest.mark.parametrize('threads', [False, True])
+def test_parallel_result_is_identical(threads):
+    for seed in range(10):
+        ds = _random_dataset(seed)
+        expected = quad_lines(canonicalize(ds))
+        assert quad_lines(canonicalize_parallel(ds, jobs=3, threads=threads)) == expected
+
+
+@pytest.mark.parametrize('threads', [False, True])
+def test_parallel_limits(threads):
+    ds = clique(6)
+
+    with pytest.raises(CanonicalizationLimitError) as excinfo:
+        canonicalize_parallel(
+            ds, limits=CanonicalizationLimits(max_permutations=100), jobs=2, threads=threads
+        )
+    assert excinfo.value.limit == 'max_permutations'
@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from trld.c14n import canonicalize
+from trld.jsonld.rdf import RdfDataset, RdfGraph, RdfTriple
+
+from c14n_helpers import part_hubs, ring, sorted_quad_lines
+
+
+def _relabelled(ds: RdfDataset, seed: int) -> RdfDataset:
+    # The same dataset, with shuffled blank node labels and quad order.
+    rnd = random.Random(seed)
+    quads = [(name, triple) for name, graph in ds for triple in graph]
+    rnd.shuffle(quads)
+    labels: dict = {}
+
+    def relabel(term):
+        if isinstance(term, str) and term.startswith('_:'):
+            if term not in labels:
+                labels[term] = f'_:x{rnd.randrange(10**9)}_{len(labels)}'
+            return labels[term]
+        return term
+
+    result = RdfDataset()
+    for name, triple in quads:
+        graph = result.default_graph
+        if name is not None:
+            name = relabel(name)
+            if name not in result.named_graphs:
+                result.add(name, RdfGraph())
+            graph = result.named_graphs[name]
+        graph.add(RdfTriple(relabel(triple.subject), triple.predicate, relabel(triple.object)))
+    return result
+
+
+@pytest.mark.parametrize('ds', [part_hubs(5), ring(6)])
+def test_refined_result_is_canonical(ds):
+    expected = sorted_quad_lines(canonicalize(ds, refine=True))
+    for seed in range(5):
+        assert sorted_quad_lines(canonicalize(_relabelled(ds, seed), refine=True)) == expected
+
+
+def test_refinement_keeps_groups_it_cannot_split():
+    ds = ring(6)
+    expected = sorted_quad_lines(canonicalize(ds))
+    assert sorted_quad_lines(canonicalize(ds, refine=True)) == expected
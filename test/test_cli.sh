@@ -12,3 +12,5 @@ python3 -m trld test/data/examples/test-basic-data.json -e test/data/examples/te
 python3 -m trld test/data/examples/test-custom-data.jsonld -r
 
 python3 -m trld test/data/examples/test-denormalized.ttl -rottl
+
+python3 -m trld test/data/examples/misc.trig --digest
@@ -0,0 +1,48 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+EXAMPLES = ROOT / 'test' / 'data' / 'examples'
+
+
+def _run(*args: str, stdin: str | None = None) -> str:
+    result = subprocess.run(
+        [sys.executable, '-m', 'trld', *args],
+        input=stdin,
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        check=True,
+    )
+    return result.stdout
+
+
+def test_jobs_keep_source_order():
+    sources = [str(EXAMPLES / name) for name in ['misc.trig', 'test-denormalized.ttl']] * 2
+
+    expected = _run(*sources, '-o', 'nq')
+    assert expected
+
+    assert _run(*sources, '-o', 'nq', '-j', '2') == expected
+    unordered = _run(*sources, '-o', 'nq', '-j', '2', '--unordered')
+    assert sorted(unordered.splitlines()) == sorted(expected.splitlines())
+
+
+def test_jobs_keep_line_order():
+    lines = ''.join(
+        json.dumps({
+            '@context': {'@vocab': 'http://example.org/'},
+            '@id': f'http://example.org/r{i}',
+            'part': {'n': i},
+        }) + '\n'
+        for i in range(200)
+    )
+
+    expected = _run('-i', 'ndjson', '-o', 'nq', stdin=lines)
+    assert len(expected.splitlines()) == 400
+
+    assert _run('-i', 'ndjson', '-o', 'nq', '-j', '3', stdin=lines) == expected
+    unordered = _run('-i', 'ndjson', '-o', 'nq', '-j', '3', '--unordered', stdin=lines)
+    assert sorted(unordered.splitlines()) == sorted(expected.splitlines())
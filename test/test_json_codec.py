@@ -0,0 +1,62 @@
+import io
+import json
+
+import pytest
+
+from trld.platform import common
+from trld.platform.common import (json_decode, json_dump, json_encode_bytes,
+                                  json_load)
+
+
+DATA = {
+    "@context": {"@vocab": "http://example.org/"},
+    "@id": "x",
+    "name": ["Å", "\"quoted\"\n", "😀"],
+    "values": [0, -1, 2**63 - 1, 1.5, True, False, None, [], {}],
+    "nested": {"b": 1, "a": [{"z": "", "y": 0.25}]},
+}
+
+
+@pytest.fixture(params=["fast", "json"])
+def backend(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(common, "orjson", None)
+    elif common.orjson is None:
+        pytest.skip("no faster JSON library installed")
+    return request.param
+
+
+@pytest.mark.parametrize("pretty", [False, True])
+@pytest.mark.parametrize("sort_keys", [False, True])
+def test_encode_bytes_is_backend_independent(backend, pretty, sort_keys):
+    expected = json.dumps(
+        DATA,
+        indent=2 if pretty else None,
+        separators=None if pretty else (",", ":"),
+        ensure_ascii=False,
+        sort_keys=sort_keys,
+    )
+    assert json_encode_bytes(DATA, pretty, sort_keys) == expected.encode("utf-8")
+    assert json_encode_bytes(DATA, pretty, sort_keys, newline=True).endswith(b"}\n")
+
+
+def test_decode(backend):
+    text = json.dumps(DATA)
+    assert json_decode(text) == DATA
+    assert json_decode(text.encode("utf-8")) == DATA
+    assert json_load(io.StringIO(text)) == DATA
+    assert json_load(io.BytesIO(text.encode("utf-8"))) == DATA
+
+
+def test_codec_handles_what_only_stdlib_supports(backend):
+    assert json_decode("[18446744073709551616, NaN]")[0] == 2**64
+    assert json_encode_bytes({1: 2**64}) == b'{"1":18446744073709551616}'
+    with pytest.raises(json.JSONDecodeError):
+        json_decode("[1,]")
+
+
+def test_dump_writes_text_or_bytes(backend):
+    text, binary = io.StringIO(), io.BytesIO()
+    json_dump(DATA, text, newline=True)
+    json_dump(DATA, binary, newline=True)
+    assert binary.getvalue() == text.getvalue().encode("utf-8")
@@ -0,0 +1,122 @@
+import json
+from io import StringIO
+
+import pytest
+
+from trld.api import parse_json_graph, text_input
+from trld.c14n import canonicalize
+from trld.jsonld.expansion import expand
+from trld.jsonld.flattening import BNodes, flatten
+from trld.jsonld.rdf import RdfDataset, RdfGraph, iter_rdf_quads, to_rdf_dataset
+from trld.nq.serializer import repr_quad
+from trld.jsonstream import JsonGraphReader
+
+
+CONTEXT = {"@vocab": "http://example.org/", "knows": {"@type": "@id"}}
+
+MEMBERS = [
+    {"@id": "a", "name": "A", "knows": "_:x", "size": -1.5e-07},
+    {"@id": "_:x", "name": "X", "list": {"@list": [1, 2.5, True, None]}},
+    {"@id": "a", "knows": ["b", "_:x"], "note": "\\\"å😀"},
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 65536])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_reader_yields_graph_members(chunk_size, indent):
+    doc = {"@context": CONTEXT, "@id": "g", "@graph": MEMBERS, "tail": [0.5]}
+    reader = JsonGraphReader(StringIO(json.dumps(doc, indent=indent)), chunk_size)
+
+    assert list(reader) == MEMBERS
+    assert reader.head == {"@context": CONTEXT, "@id": "g"}
+    assert reader.tail == {"tail": [0.5]}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 65536])
+def test_reader_yields_array_items(chunk_size):
+    reader = JsonGraphReader(StringIO(json.dumps(MEMBERS)), chunk_size)
+    assert list(reader) == MEMBERS
+    assert reader.head is None
+
+
+@pytest.mark.parametrize("text", ['[1, 2', '{"@graph": [1,]}', '[1 2]', '[1] 2', '{1: 2}', ''])
+def test_reader_rejects_invalid_json(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(JsonGraphReader(StringIO(text), 2))
+
+
+class _CountingReader(StringIO):
+    consumed = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.consumed += len(data)
+        return data
+
+
+def test_reader_fails_early_on_invalid_member():
+    members = ", ".join('{"@id": "urn:x:%d", "urn:x:p": true}' % i for i in range(10000))
+    stream = _CountingReader('{"@graph": [{"@id": "urn:x:a" 1}, %s]}' % members)
+    reader = JsonGraphReader(stream, 64)
+    with pytest.raises(json.JSONDecodeError):
+        list(reader)
+    assert stream.consumed <= 128
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7])
+def test_reader_reads_tokens_split_across_chunks(chunk_size):
+    items = ["aé\"b", -1.5e-3, True, False, None, {"x": [float("-inf")]}]
+    text = json.dumps(items)
+    assert list(JsonGraphReader(StringIO(text), chunk_size)) == items
+
+
+def _canonical_lines(dataset):
+    return sorted(
+        repr_quad(triple, name)
+        for name, graph in canonicalize(dataset)
+        for triple in graph
+    )
+
+
+def _streamed_dataset(text):
+    flat_bnodes, quad_bnodes = BNodes(), BNodes()
+    dataset = RdfDataset()
+    seen = set()
+    for doc in parse_json_graph(text_input(text, "jsonld")):
+        flat = flatten(expand(doc, "http://example.org/"), bnodes=flat_bnodes)
+        for quad in iter_rdf_quads(flat, quad_bnodes):
+            # Nodes occurring in several members may produce the same quads.
+            key = repr_quad(quad.triple, quad.graph_name)
+            if key in seen:
+                continue
+            seen.add(key)
+            if quad.graph_name is None:
+                dataset.default_graph.add(quad.triple)
+            else:
+                if quad.graph_name not in dataset.named_graphs:
+                    dataset.add(quad.graph_name, RdfGraph())
+                dataset.named_graphs[quad.graph_name].add(quad.triple)
+    return dataset
+
+
+@pytest.mark.parametrize(
+    "doc",
+    [
+        {"@context": CONTEXT, "@graph": MEMBERS},
+        {"@context": CONTEXT, "@id": "g", "@graph": MEMBERS},
+        {"@context": CONTEXT, "@id": "g", "name": "G", "@graph": MEMBERS},
+        {"@context": CONTEXT, "@id": "g", "name": "G", "@graph": []},
+        {"@context": CONTEXT, "name": "No graph"},
+        [{"@context": CONTEXT, **member} for member in MEMBERS],
+    ],
+)
+def test_parse_json_graph_matches_whole_document(doc):
+    expected = to_rdf_dataset(expand(doc, "http://example.org/"))
+    streamed = _streamed_dataset(json.dumps(doc))
+    assert _canonical_lines(streamed) == _canonical_lines(expected)
+
+
+def test_parse_json_graph_rejects_entries_after_graph():
+    text = json.dumps({"@graph": MEMBERS, "@context": CONTEXT})
+    with pytest.raises(ValueError):
+        list(parse_json_graph(text_input(text, "jsonld")))
@@ -0,0 +1,71 @@
+from unittest.mock import patch
+
+import pytest
+
+from trld.jsonld import expansion
+from trld.jsonld.context import get_context
+from trld.jsonld.expansion import expand, is_simple_context
+
+
+SIMPLE = {
+    "@vocab": "http://example.org/ns#",
+    "@language": "en",
+    "id": "@id",
+    "type": "@type",
+    "ref": {"@type": "@id"},
+    "parts": {"@type": "@vocab", "@container": "@set"},
+    "seq": {"@container": "@list"},
+    "labels": {"@id": "label", "@container": "@language"},
+    "year": {"@type": "http://www.w3.org/2001/XMLSchema#gYear"},
+    "note": {"@language": None},
+}
+
+DOCS = [
+    {
+        "@context": SIMPLE,
+        "@graph": [
+            {
+                "id": "item/1",
+                "type": ["Thing", "Item"],
+                "ref": "item/2",
+                "parts": ["Part", "http://example.net/other"],
+                "seq": [1, "two", {"id": "item/3"}, [4]],
+                "labels": {"en": "One", "sv": ["Ett", None]},
+                "year": "2020",
+                "note": "plain",
+                "name": "Named",
+                "ignored:": None,
+                "nested": {"type": "Thing", "seq": [], "name": [None, True]},
+                "value": {"@value": "literal", "@language": "fr"},
+            },
+            {"id": "item/2"},
+            {},
+        ],
+    },
+    {"@context": SIMPLE, "name": "Top", "more": [{"id": "x"}, {"name": 1.5}]},
+]
+
+
+@pytest.mark.parametrize("doc", DOCS)
+@pytest.mark.parametrize("ordered", [False, True])
+def test_simple_expansion_matches_general(doc, ordered):
+    with patch.object(expansion, "is_simple_context", lambda context: False):
+        expected = expand(doc, "http://example.org/", ordered=ordered)
+    assert expand(doc, "http://example.org/", ordered=ordered) == expected
+
+
+def test_is_simple_context():
+    assert is_simple_context(get_context({"@context": SIMPLE}))
+
+    for term in [
+        {"@context": {}},
+        {"@reverse": "http://example.org/ns#of"},
+        {"@container": "@index"},
+        {"@container": "@graph"},
+        {"@type": "@json"},
+        {"@id": "http://example.org/ns#nested", "@nest": "@nest"},
+    ]:
+        ctx = get_context({"@context": dict(SIMPLE, term=term)})
+        assert not is_simple_context(ctx), term
+
+    assert not is_simple_context(get_context({"@context": dict(SIMPLE, **{"@propagate": False})}))
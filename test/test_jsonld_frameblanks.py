@@ -0,0 +1,53 @@
+import sys
+
+from trld.jsonld.keys import GRAPH, ID
+from trld.jsonld.extras.frameblanks import frameblanks, frameblanks_records
+
+
+def test_embed_blank_nodes_referenced_once():
+    doc = {
+        GRAPH: [
+            {ID: "a", "knows": [{ID: "_:x"}, {ID: "_:y"}]},
+            {ID: "b", "knows": {ID: "_:y"}},
+            {ID: "_:x", "name": "X"},
+            {ID: "_:y", "name": "Y"},
+        ]
+    }
+
+    assert frameblanks(doc) == {
+        GRAPH: [
+            {ID: "a", "knows": [{"name": "X"}, {ID: "_:y"}]},
+            {ID: "_:y", "name": "Y"},
+            {ID: "b", "knows": {ID: "_:y"}},
+        ]
+    }
+
+
+def test_embed_deeply_nested_blank_nodes():
+    depth = sys.getrecursionlimit() * 2
+    graph = [{ID: "a", "next": {ID: "_:b0"}}]
+    for i in range(depth):
+        graph.append({ID: f"_:b{i}", "next": {ID: f"_:b{i + 1}"}})
+
+    result = frameblanks(graph)
+
+    assert len(result) == 1
+    assert result[0][ID] == "a"
+
+    node = result[0]
+    for i in range(depth):
+        node = node["next"]
+        assert ID not in node
+    assert node["next"] == {ID: f"_:b{depth}"}
+
+
+def test_frame_each_record_alone():
+    records = [
+        {GRAPH: [{ID: "a", "knows": {ID: "_:x"}}, {ID: "_:x", "name": "X"}]},
+        {GRAPH: [{ID: "b", "knows": {ID: "_:x"}}]},
+    ]
+
+    assert list(frameblanks_records(records)) == [
+        {GRAPH: [{ID: "a", "knows": {"name": "X"}}]},
+        {GRAPH: [{ID: "b", "knows": {ID: "_:x"}}]},
+    ]
@@ -1,5 +1,5 @@
 from trld.jsonld.keys import ID, REVERSE
-from trld.jsonld.extras.index import make_index
+from trld.jsonld.extras.index import GraphIndex, make_graph_index, make_index
 
 g1 = [
     {
@@ -73,3 +73,72 @@ def test_index_with_undescribed():
             REVERSE: {"references": [{ID: "a"}, {ID: "b"}]}
         }
     }
+
+
+def test_index_popular_target():
+    g = [{ID: f"n{i}", "references": [{ID: "hub"}, {ID: "hub"}]} for i in range(1000)]
+
+    idx = make_index(g)
+
+    assert idx["hub"][REVERSE]["references"] == [{ID: f"n{i}"} for i in range(1000)]
+
+
+def test_graph_index_add_and_replace():
+    index = GraphIndex([{ID: "a", "references": {ID: "c"}}])
+    index.add({ID: "b", "references": [{ID: "a"}, {ID: "c"}]})
+
+    assert index.get("c") == {
+        ID: "c",
+        REVERSE: {"references": [{ID: "a"}, {ID: "b"}]}
+    }
+
+    index.add({ID: "c", "name": "C"})
+    index.add({ID: "b", "references": {ID: "c"}})
+
+    assert index.nodes == {
+        "a": {
+            ID: "a",
+            "references": {ID: "c"}
+        },
+        "b": {
+            ID: "b",
+            "references": {ID: "c"}
+        },
+        "c": {
+            ID: "c",
+            "name": "C",
+            REVERSE: {"references": [{ID: "a"}, {ID: "b"}]}
+        }
+    }
+
+
+def test_graph_index_remove():
+    index = GraphIndex([
+        {ID: "a", "references": {ID: "b"}},
+        {ID: "b", "references": {ID: "c"}}
+    ])
+
+    assert index.remove("b") == {ID: "b", "references": {ID: "c"}, REVERSE: {"references": [{ID: "a"}]}}
+
+    assert index.nodes == {
+        "a": {
+            ID: "a",
+            "references": {ID: "b"}
+        },
+        "b": {
+            ID: "b",
+            REVERSE: {"references": [{ID: "a"}]}
+        }
+    }
+
+    assert index.remove("a") is not None
+    assert index.nodes == {}
+
+
+def test_make_graph_index():
+    g = [{ID: "a", "references": {ID: "b"}}]
+    index = make_graph_index(g)
+    assert index.nodes == make_index(g)
+
+    index.add({ID: "b", "name": "B"})
+    assert index.get("b") == {ID: "b", "name": "B", REVERSE: {"references": [{ID: "a"}]}}
@@ -0,0 +1,54 @@
+from trld.jsonld.compaction import compact
+from trld.jsonld.context import get_context
+from trld.jsonld.invcontext import MAX_SHARED_INVERSE_CONTEXTS, get_inverse_context
+
+
+CONTEXT = {
+    "@context": {
+        "@vocab": "http://example.org/",
+        "ref": {"@type": "@id"},
+        "labels": {"@container": "@language"},
+    }
+}
+
+
+def test_identical_contexts_share_inverse_context():
+    base = get_context(CONTEXT)
+    first = base.get_subcontext({"@vocab": "http://example.org/"})
+    second = base.get_subcontext({"@vocab": "http://example.org/"})
+    assert first is not second
+    assert get_inverse_context(first) is get_inverse_context(second)
+    assert get_inverse_context(base.copy()) is get_inverse_context(base)
+    assert get_inverse_context(first) is get_inverse_context(base)
+
+
+def test_separately_built_contexts_share_given_table():
+    shared: dict = {}
+    first = get_context(CONTEXT, None, shared)
+    second = get_context(dict(CONTEXT), None, shared)
+    assert first is not second
+    assert get_inverse_context(first) is get_inverse_context(second)
+    assert len(shared) == 1
+
+    doc = [{"http://example.org/ref": [{"@id": "http://example.org/a"}]}]
+    for _ in range(3):
+        result = compact(CONTEXT, doc, shared_inverse_contexts=shared)
+        assert result == {"ref": "http://example.org/a"}
+    assert len(shared) == 1
+
+
+def test_shared_table_is_bounded():
+    shared: dict = {}
+    for i in range(MAX_SHARED_INVERSE_CONTEXTS + 10):
+        get_inverse_context(get_context({"@context": {"t": f"urn:x:{i}"}}, None, shared))
+    assert len(shared) == MAX_SHARED_INVERSE_CONTEXTS
+
+
+def test_different_contexts_get_own_inverse_context():
+    inverse = get_inverse_context(get_context(CONTEXT))
+
+    with_language = {"@context": dict(CONTEXT["@context"], **{"@language": "en"})}
+    assert get_inverse_context(get_context(with_language)) is not inverse
+
+    with_coercion = {"@context": dict(CONTEXT["@context"], ref={"@type": "@vocab"})}
+    assert get_inverse_context(get_context(with_coercion)) is not inverse
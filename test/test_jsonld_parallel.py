@@ -0,0 +1,65 @@
+import os
+from unittest.mock import patch
+
+from trld.c14n import canonicalize
+from trld.jsonld.extras import parallel
+from trld.jsonld.extras.parallel import flatten_documents, flatten_parallel
+from trld.jsonld.flattening import flatten
+from trld.jsonld.rdf import to_rdf_dataset
+from trld.nq.serializer import repr_quad
+
+P = 'urn:x:p'
+Q = 'urn:x:q'
+
+DOCUMENT = [
+    {'@id': 'urn:x:1', P: [{'@id': '_:a'}, {Q: [{'@value': 1}]}]},
+    {'@id': '_:a', Q: [{'@value': 2}], P: [{'@id': '_:b'}]},
+    {'@id': 'urn:x:2', P: [{'@id': '_:a'}, {Q: [{'@value': 3}]}]},
+    {'@id': '_:b', Q: [{'@value': 4}]},
+    {'@id': 'urn:x:1', P: [{'@id': '_:b'}, {Q: [{'@value': 5}]}]},
+    {'@id': '_:a', Q: [{'@value': 6}]},
+]
+
+
+def _canonical_lines(flattened):
+    return sorted(
+        repr_quad(triple, name)
+        for name, graph in canonicalize(to_rdf_dataset(flattened))
+        for triple in graph
+    )
+
+
+def test_flatten_parallel_like_flatten():
+    expected = _canonical_lines(flatten(DOCUMENT))
+
+    for partition_size in [1, 2, 4]:
+        result = flatten_parallel(DOCUMENT, jobs=2, partition_size=partition_size)
+        assert _canonical_lines(result) == expected
+
+
+def test_flatten_parallel_relabels_blank_nodes():
+    result = flatten_parallel(DOCUMENT, jobs=2, partition_size=1)
+
+    ids = [node['@id'] for node in result]
+    assert '_:l_a' in ids and '_:l_b' in ids
+    # Unlabelled blank nodes get identifiers unique to their partition.
+    assert {id for id in ids if id.startswith('_:b')} == {'_:b0_0', '_:b2_0', '_:b4_0'}
+
+
+def test_flatten_parallel_defaults_to_cpu_count():
+    with patch.object(os, 'cpu_count', return_value=2) as cpu_count, patch.object(
+        parallel, 'ProcessPoolExecutor', wraps=parallel.ProcessPoolExecutor
+    ) as executor:
+        result = flatten_parallel(DOCUMENT)
+
+    cpu_count.assert_called()
+    executor.assert_called_once_with(2)
+    assert _canonical_lines(result) == _canonical_lines(flatten(DOCUMENT))
+
+
+def test_flatten_documents_in_order():
+    documents = [DOCUMENT[i : i + 2] for i in range(0, len(DOCUMENT), 2)]
+
+    results = list(flatten_documents(documents, jobs=2))
+
+    assert results == [flatten(document) for document in documents]
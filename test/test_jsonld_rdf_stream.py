@@ -0,0 +1,145 @@
+import json
+import random
+
+import pytest
+
+from trld.api import parse_rdf_nodes, text_input
+from trld.c14n import canonicalize
+from trld.jsonld.extras.fromrdf import to_jsonld_stream
+from trld.jsonld.flattening import BNodes, flatten
+from trld.jsonld.keys import GRAPH, ID, LIST, TYPE, VALUE
+from trld.jsonld.rdf import (RdfDataset, RdfGraph, RdfQuad, iter_rdf_quads,
+                             to_jsonld, to_rdf_dataset)
+from trld.nq.serializer import repr_quad
+from trld.rdfterms import RDF_FIRST, RDF_NIL, RDF_REST
+
+
+DATA = [
+    {
+        ID: "_:g",
+        GRAPH: [
+            {
+                ID: "_:x",
+                "urn:x:l": [{LIST: [{VALUE: 1}, {ID: "_:b0"}, {LIST: [{VALUE: 2}]}]}],
+                "urn:x:p": [{"urn:x:q": [{VALUE: "nested"}]}],
+            }
+        ],
+    },
+    {
+        ID: "urn:x:g",
+        "urn:x:m": [{VALUE: "meta"}],
+        GRAPH: [{ID: "urn:x:s", TYPE: ["_:t"], "urn:x:p": [{ID: "_:x"}]}],
+    },
+    {ID: "_:b0", "urn:x:p": [{VALUE: "x", "@language": "en"}]},
+]
+
+
+def _canonical_lines(dataset):
+    return sorted(
+        repr_quad(triple, name)
+        for name, graph in canonicalize(dataset)
+        for triple in graph
+    )
+
+
+def _to_dataset(quads):
+    dataset = RdfDataset()
+    for quad in quads:
+        if quad.graph_name is None:
+            dataset.default_graph.add(quad.triple)
+        else:
+            if quad.graph_name not in dataset.named_graphs:
+                dataset.add(quad.graph_name, RdfGraph())
+            dataset.named_graphs[quad.graph_name].add(quad.triple)
+    return dataset
+
+
+def test_iter_rdf_quads_matches_to_rdf_dataset():
+    flat = flatten(DATA)
+    streamed = _to_dataset(iter_rdf_quads(flat))
+    assert _canonical_lines(streamed) == _canonical_lines(to_rdf_dataset(DATA))
+
+
+def test_iter_rdf_quads_scopes_blank_nodes_per_batch():
+    first = list(iter_rdf_quads(flatten(DATA), BNodes("r0_")))
+    second = list(iter_rdf_quads(flatten(DATA), BNodes("r1_")))
+
+    def blanks(quads):
+        return {
+            term
+            for quad in quads
+            for term in (quad.triple.subject, quad.triple.object, quad.graph_name)
+            if isinstance(term, str) and term.startswith("_:")
+        }
+
+    assert blanks(first) and blanks(second)
+    assert not blanks(first) & blanks(second)
+
+
+def _shuffled_groups(quads, seed):
+    groups = {}
+    for quad in quads:
+        groups.setdefault((quad.graph_name, quad.triple.subject), []).append(quad)
+    ordered = list(groups.values())
+    random.Random(seed).shuffle(ordered)
+    return [quad for group in ordered for quad in group]
+
+
+@pytest.mark.parametrize("window", [1, 10000])
+@pytest.mark.parametrize("seed", [None, 1, 2])
+def test_to_jsonld_stream_roundtrips(seed, window):
+    quads = list(iter_rdf_quads(flatten(DATA)))
+    if seed is not None:
+        quads = _shuffled_groups(quads, seed)
+
+    nodes = list(to_jsonld_stream(quads, window=window))
+
+    assert _canonical_lines(to_rdf_dataset(nodes)) == _canonical_lines(
+        _to_dataset(quads)
+    )
+
+
+def test_to_jsonld_stream_matches_to_jsonld_for_grouped_quads():
+    dataset = to_rdf_dataset(DATA[0][GRAPH] + DATA[2:])
+    quads = [RdfQuad(triple, name) for name, graph in dataset for triple in graph]
+
+    stream = to_jsonld_stream(_shuffled_groups(quads, 3))
+
+    def key(node):
+        return json.dumps(node, sort_keys=True)
+
+    assert sorted(map(key, stream)) == sorted(map(key, to_jsonld(dataset)))
+    assert stream.held == 0
+    assert stream.max_held > 0
+
+
+def test_parse_rdf_nodes_from_nquads():
+    nquads = "\n".join(
+        [
+            "<urn:x:s> <urn:x:p> _:l1 <urn:x:g> .",
+            f"_:l1 <{RDF_FIRST}> \"a\" <urn:x:g> .",
+            f"_:l1 <{RDF_REST}> <{RDF_NIL}> <urn:x:g> .",
+        ]
+    )
+    nodes = list(parse_rdf_nodes(text_input(nquads, "nq")))
+    assert nodes == [
+        {ID: "urn:x:g", GRAPH: [{ID: "urn:x:s", "urn:x:p": [{LIST: [{VALUE: "a"}]}]}]}
+    ]
+
+
+@pytest.mark.parametrize("window", [1, 10000])
+def test_to_jsonld_stream_keeps_list_referenced_twice(window):
+    nquads = "\n".join(
+        [
+            "<urn:x:a> <urn:x:p> _:l1 .",
+            f"_:l1 <{RDF_FIRST}> \"x\" .",
+            f"_:l1 <{RDF_REST}> <{RDF_NIL}> .",
+            "<urn:x:b> <urn:x:p> _:l1 .",
+        ]
+    )
+    nodes = list(parse_rdf_nodes(text_input(nquads, "nq"), window=window))
+    assert nodes == [
+        {ID: "urn:x:a", "urn:x:p": [{LIST: [{VALUE: "x"}]}]},
+        {ID: "_:l1", RDF_FIRST: [{VALUE: "x"}], RDF_REST: [{LIST: []}]},
+        {ID: "urn:x:b", "urn:x:p": [{ID: "_:l1"}]},
+    ]
@@ -0,0 +1,54 @@
+import random
+
+from trld.jsonld.base import node_equals
+from trld.jsonld.flattening import ValueIndex, flatten
+from trld.jsonld.keys import ID, LANGUAGE, LIST, TYPE, VALUE
+
+
+def _values():
+    rnd = random.Random(4)
+    scalars = ["a", "b", "1", 1, 1.0, 0, 0.0, -0.0, True, False, {"x": 1}, [1]]
+    values = []
+    for i in range(400):
+        kind = rnd.randrange(5)
+        if kind == 0:
+            values.append({ID: f"urn:x:{rnd.randrange(20)}"})
+        elif kind == 1:
+            values.append({VALUE: rnd.choice(scalars)})
+        elif kind == 2:
+            values.append({VALUE: rnd.choice(scalars), LANGUAGE: rnd.choice(["en", "sv"])})
+        elif kind == 3:
+            values.append({VALUE: rnd.choice(scalars), TYPE: "urn:x:dt"})
+        else:
+            values.append({LIST: [{VALUE: rnd.choice(scalars)}]})
+    return values
+
+
+def test_candidates_find_all_node_equals_matches():
+    index = ValueIndex()
+    existing = []
+    for value in _values():
+        candidates = index.candidates("g", "s", "p", existing, value)
+        for v in existing:
+            if node_equals(value, v) or node_equals(v, value):
+                assert any(c is v for c in candidates)
+        index.append("g", "s", "p", existing, value)
+
+
+def test_flatten_deduplicates_values():
+    result = flatten([{
+        ID: "urn:x:1",
+        "urn:x:p": [
+            {VALUE: "a"}, {VALUE: "a"},
+            {VALUE: 1}, {VALUE: 1.0}, {VALUE: True}, {VALUE: 1},
+            {VALUE: 0.0}, {VALUE: -0.0},
+            {ID: "urn:x:2"}, {ID: "urn:x:2"},
+        ]
+    }])
+
+    assert result[0]["urn:x:p"] == [
+        {VALUE: "a"},
+        {VALUE: 1}, {VALUE: 1.0}, {VALUE: True},
+        {VALUE: 0.0},
+        {ID: "urn:x:2"},
+    ]
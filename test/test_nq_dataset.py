@@ -0,0 +1,35 @@
+import pytest
+
+from trld.api import parse_rdf_dataset, text_input
+from trld.c14n import canonicalize
+from trld.nq.serializer import repr_quad
+
+NQUADS = '''\
+_:x <http://example.org/p> "01"^^<http://www.w3.org/2001/XMLSchema#integer> .
+_:x <http://example.org/p> _:y _:g .
+_:x <http://example.org/p> _:y _:g .
+_:y <http://example.org/q> "y"@en _:g .
+'''
+
+
+def test_parse_rdf_dataset_keeps_input_as_is():
+    dataset = parse_rdf_dataset(text_input(NQUADS, 'nq'))
+    lines = [repr_quad(triple, name) for name, graph in dataset for triple in graph]
+    expected = NQUADS.splitlines()
+    del expected[2]  # The duplicate.
+    assert lines == expected
+
+
+def test_canonicalize_parsed_dataset():
+    dataset = parse_rdf_dataset(text_input(NQUADS, 'nq'))
+    lines = sorted(repr_quad(triple, name) for name, graph in canonicalize(dataset) for triple in graph)
+    assert lines == [
+        '_:c14n0 <http://example.org/p> "01"^^<http://www.w3.org/2001/XMLSchema#integer> .',
+        '_:c14n0 <http://example.org/p> _:c14n2 _:c14n1 .',
+        '_:c14n2 <http://example.org/q> "y"@en _:c14n1 .',
+    ]
+
+
+def test_parse_rdf_dataset_requires_nquads():
+    with pytest.raises(ValueError):
+        parse_rdf_dataset(text_input('{}', 'jsonld'))
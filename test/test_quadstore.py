@@ -0,0 +1,113 @@
+import itertools
+import random
+
+from trld.api import parse_rdf_store, text_input
+from trld.jsonld.keys import DEFAULT
+from trld.jsonld.rdf import RdfDataset, RdfGraph, RdfLiteral, RdfQuad, RdfTriple
+from trld.quadstore import QuadStore
+from trld.rdfterms import RDF_TYPE
+
+
+def _random_quads(n: int, seed: int = 0):
+    rnd = random.Random(seed)
+    subjects = [f'urn:x:s{i}' for i in range(8)] + ['_:b0', '_:b1']
+    predicates = [f'urn:x:p{i}' for i in range(4)]
+    objects = subjects + [RdfLiteral('1'), RdfLiteral('1', language='en')]
+    graphs = [None, 'urn:x:g1', 'urn:x:g2']
+    return [
+        RdfQuad(
+            RdfTriple(rnd.choice(subjects), rnd.choice(predicates), rnd.choice(objects)),
+            rnd.choice(graphs),
+        )
+        for _ in range(n)
+    ]
+
+
+def test_match_any_pattern():
+    quads = _random_quads(300)
+    store = QuadStore()
+    assert store.add_quads(quads) == len(set(quads))
+
+    distinct = list(dict.fromkeys(quads))
+    assert len(store) == len(distinct)
+
+    s, p, o = distinct[0].triple
+    for subject, predicate, object, graph_name in itertools.product(
+        [None, s], [None, p], [None, o], [None, DEFAULT, 'urn:x:g1', 'urn:x:g3']
+    ):
+        expected = {
+            q for q in distinct
+            if (subject is None or q.triple.subject == subject)
+            and (predicate is None or q.triple.predicate == predicate)
+            and (object is None or q.triple.object == object)
+            and (graph_name is None or q.graph_name == (None if graph_name == DEFAULT else graph_name))
+        }
+        found = list(store.match(subject, predicate, object, graph_name))
+        assert len(found) == len(expected)
+        assert set(found) == expected
+        assert store.count(subject, predicate, object, graph_name) == len(expected)
+
+
+def test_remove_quads():
+    quads = list(dict.fromkeys(_random_quads(200, seed=1)))
+    store = QuadStore()
+    store.add_quads(quads)
+
+    for quad in quads[::2]:
+        assert store.remove(quad.triple, quad.graph_name)
+        assert not store.remove(quad.triple, quad.graph_name)
+
+    kept = quads[1::2]
+    assert len(store) == len(kept)
+    assert set(store) == set(kept)
+
+    rebuilt = QuadStore()
+    rebuilt.add_quads(kept)
+    assert store.index_sizes() == rebuilt.index_sizes()
+
+    for quad in kept:
+        store.remove(quad.triple, quad.graph_name)
+    assert len(store) == 0
+    assert store.index_sizes() == {'spo': 0, 'pos': 0, 'osp': 0, 'graph': 0}
+
+
+def test_subjects_of_type():
+    store = QuadStore()
+    store.add(RdfTriple('urn:x:a', RDF_TYPE, 'urn:x:Thing'))
+    store.add(RdfTriple('urn:x:b', RDF_TYPE, 'urn:x:Thing'), 'urn:x:g')
+    store.add(RdfTriple('urn:x:c', RDF_TYPE, 'urn:x:Other'))
+
+    assert store.subjects(RDF_TYPE, 'urn:x:Thing') == ['urn:x:a', 'urn:x:b']
+    assert store.subjects(RDF_TYPE, 'urn:x:Thing', DEFAULT) == ['urn:x:a']
+    assert store.objects('urn:x:a') == ['urn:x:Thing']
+
+
+def test_dataset_roundtrip():
+    dataset = RdfDataset()
+    dataset.default_graph.add(RdfTriple('urn:x:a', 'urn:x:p', RdfLiteral('A', language='en')))
+    named = RdfGraph()
+    named.add(RdfTriple('urn:x:a', 'urn:x:p', 'urn:x:b'))
+    dataset.add('urn:x:g', named)
+
+    store = QuadStore(dataset)
+
+    assert store.graph_names() == ['urn:x:g']
+    assert [(name, list(graph)) for name, graph in store.to_dataset()] == [
+        (name, list(graph)) for name, graph in dataset
+    ]
+    assert store.to_jsonld() == [
+        {'@id': 'urn:x:a', 'urn:x:p': [{'@value': 'A', '@language': 'en'}]},
+        {'@id': 'urn:x:g', '@graph': [{'@id': 'urn:x:a', 'urn:x:p': [{'@id': 'urn:x:b'}]}]},
+    ]
+
+
+def test_parse_rdf_store():
+    nq = '<urn:x:a> <urn:x:p> _:b1 <urn:x:g> .\n_:b1 <urn:x:p> "1" .\n_:b1 <urn:x:p> "1" .\n'
+    store = parse_rdf_store(text_input(nq, 'nq'))
+    assert len(store) == 2
+    assert store.objects('urn:x:a') == ['_:b1']
+
+    trig = 'prefix : <urn:x:>\n:g { :a :p :b . }\n:a a :Thing .\n'
+    store = parse_rdf_store(text_input(trig, 'trig'))
+    assert store.subjects(RDF_TYPE, 'urn:x:Thing') == ['urn:x:a']
+    assert store.count(graph_name='urn:x:g') == 1
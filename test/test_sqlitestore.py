@@ -0,0 +1,127 @@
+import io
+import itertools
+import random
+
+from trld.api import parse_rdf_store, text_input
+from trld.jsonld.keys import DEFAULT
+from trld.jsonld.rdf import RdfLiteral, RdfQuad, RdfTriple
+from trld.nq.serializer import repr_quad
+from trld.platform.io import Output
+from trld.quadstore import QuadStore
+from trld.rdfterms import XSD_INTEGER
+from trld.sqlitestore import SqliteQuadStore
+
+
+def _random_quads(n: int, seed: int = 0):
+    rnd = random.Random(seed)
+    subjects = [f'urn:x:s{i}' for i in range(8)] + ['_:b0']
+    predicates = [f'urn:x:p{i}' for i in range(4)]
+    objects = subjects + [
+        RdfLiteral('1'),
+        RdfLiteral('1', XSD_INTEGER),
+        RdfLiteral('1', language='en'),
+        RdfLiteral('urn:x:s0'),
+    ]
+    graphs = [None, 'urn:x:g1', 'urn:x:s1']
+    return [
+        RdfQuad(
+            RdfTriple(rnd.choice(subjects), rnd.choice(predicates), rnd.choice(objects)),
+            rnd.choice(graphs),
+        )
+        for _ in range(n)
+    ]
+
+
+def test_match_like_quadstore():
+    quads = _random_quads(300)
+    memory = QuadStore()
+    memory.add_quads(quads)
+
+    with SqliteQuadStore(batch_size=7, cache_size=5) as store:
+        assert store.add_quads(quads) == len(memory)
+        assert store.add_quads(quads[:10]) == 0
+        assert len(store) == len(memory)
+
+        s, p, o = quads[0].triple
+        for pattern in itertools.product(
+            [None, s], [None, p], [None, o, RdfLiteral('1', XSD_INTEGER)],
+            [None, DEFAULT, 'urn:x:g1', 'urn:x:g3'],
+        ):
+            assert set(store.match(*pattern)) == set(memory.match(*pattern))
+            assert store.count(*pattern) == memory.count(*pattern)
+
+        assert set(store.subjects(p, o)) == set(memory.subjects(p, o))
+        assert set(store.objects(s, p)) == set(memory.objects(s, p))
+        assert set(store.graph_names()) == set(memory.graph_names())
+        assert quads[0] in store
+        assert RdfQuad(quads[0].triple, 'urn:x:g3') not in store
+
+
+def test_remove_quads():
+    quads = list(dict.fromkeys(_random_quads(100, seed=1)))
+
+    with SqliteQuadStore() as store:
+        store.add_quads(quads)
+        for quad in quads[::2]:
+            assert store.remove(quad.triple, quad.graph_name)
+            assert not store.remove(quad.triple, quad.graph_name)
+
+        assert set(store) == set(quads[1::2])
+
+
+def test_export_grouped_by_graph_and_subject():
+    quads = _random_quads(200, seed=2)
+
+    with SqliteQuadStore() as store:
+        store.add_quads(quads)
+
+        exported = list(store.iter_quads())
+        assert len(exported) == len(set(quads))
+        assert set(exported) == set(quads)
+
+        groups = [(q.graph_name, q.triple.subject) for q in exported]
+        seen = set()
+        for key, _ in itertools.groupby(groups):
+            assert key not in seen
+            seen.add(key)
+
+        buf = io.StringIO()
+        store.write_nquads(Output(buf))
+        assert buf.getvalue().splitlines() == [repr_quad(q.triple, q.graph_name) for q in exported]
+
+        assert len(store.to_dataset().named_graphs) == len(store.graph_names())
+
+
+def test_write_trig_roundtrip():
+    trig = '''
+    prefix : <urn:x:>
+    :a :name "A"@en ; :size 3 ; :list ( :b :c ) .
+    :g1 { :a :knows :b . :b :knows :c . }
+    :g2 { :c :knows :a . }
+    '''
+    with SqliteQuadStore() as store:
+        store.load(text_input(trig, 'trig'))
+
+        buf = io.StringIO()
+        store.write_trig(Output(buf), chunk_size=1)
+
+        reloaded = parse_rdf_store(text_input(buf.getvalue(), 'trig'))
+        ground = {q for q in store if not q.triple.subject.startswith('_:')}
+        assert {q for q in reloaded if not q.triple.subject.startswith('_:')} == ground
+        assert len(reloaded) == len(store)
+
+
+def test_persist_to_file(tmp_path):
+    path = str(tmp_path / 'quads.db')
+    nq = '<urn:x:a> <urn:x:p> _:b1 <urn:x:g> .\n_:b1 <urn:x:p> "1" .\n'
+
+    with SqliteQuadStore(path) as store:
+        assert store.load(text_input(nq, 'nq')) == 2
+
+    with SqliteQuadStore(path) as store:
+        assert store.load(text_input(nq, 'nq')) == 0
+        assert store.objects('urn:x:a') == ['_:b1']
+        assert list(store.iter_nodes(use_native_types=True)) == [
+            {'@id': '_:b1', 'urn:x:p': [{'@value': '1'}]},
+            {'@id': 'urn:x:g', '@graph': [{'@id': 'urn:x:a', 'urn:x:p': [{'@id': '_:b1'}]}]},
+        ]
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from trld.tvm import cache
+from trld.tvm.cache import TargetMapCache
+from trld.tvm.mapmaker import make_target_map
+
+VOCAB = {
+    "@context": {
+        "@vocab": "http://example.org/ns#",
+        "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+        "owl": "http://www.w3.org/2002/07/owl#",
+        "subClassOf": {"@id": "rdfs:subClassOf", "@type": "@id"},
+        "equivalentProperty": {"@id": "owl:equivalentProperty", "@type": "@id"},
+    },
+    "@graph": [
+        {"@id": "http://example.org/ns#Book", "subClassOf": "http://schema.org/Book"},
+        {"@id": "http://example.org/ns#title", "equivalentProperty": "http://schema.org/name"},
+    ],
+}
+
+TARGET = {"@context": {"@vocab": "http://schema.org/"}}
+
+
+@pytest.fixture
+def vocab_file(tmp_path):
+    path = tmp_path / 'vocab.jsonld'
+    path.write_text(json.dumps(VOCAB))
+    return str(path)
+
+
+def test_target_map_is_made_once(vocab_file, monkeypatch):
+    calls = []
+
+    def counting_make_target_map(vocab, target):
+        calls.append(target)
+        return make_target_map(vocab, target)
+
+    monkeypatch.setattr(cache, 'make_target_map', counting_make_target_map)
+
+    target_maps = TargetMapCache()
+    target_map = target_maps.get([vocab_file], TARGET)
+    assert target_map['http://example.org/ns#title'] == ['http://schema.org/name']
+    assert target_maps.get([vocab_file], TARGET) is target_map
+    assert len(calls) == 1
+
+
+def test_target_map_is_stored_by_content(vocab_file, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / 'cache')
+    target_map = TargetMapCache(cache_dir).get([vocab_file], TARGET)
+
+    def fail(vocab, target):
+        raise AssertionError('Expected a stored target map')
+
+    monkeypatch.setattr(cache, 'make_target_map', fail)
+    assert TargetMapCache(cache_dir).get([vocab_file], TARGET) == target_map
+
+    with open(vocab_file, 'w') as f:
+        json.dump(VOCAB | {"@graph": VOCAB["@graph"][:1]}, f)
+    with pytest.raises(AssertionError):
+        TargetMapCache(cache_dir).get([vocab_file], TARGET)
@@ -0,0 +1,49 @@
+import json
+
+from trld.jsonld.compaction import compact
+from trld.jsonld.expansion import expand
+from trld.tvm.mapmaker import make_target_map
+from trld.tvm.mapper import map_to
+from trld.tvm.stream import map_record_lines
+
+VOCAB = [
+    {
+        "@id": "http://example.org/ns#title",
+        "http://www.w3.org/2002/07/owl#equivalentProperty": [{"@id": "http://schema.org/name"}],
+    },
+    {
+        "@id": "http://example.org/ns#Book",
+        "http://www.w3.org/2000/01/rdf-schema#subClassOf": [{"@id": "http://schema.org/Book"}],
+    },
+]
+
+TARGET = {"@context": {"@vocab": "http://schema.org/"}}
+
+RECORDS = [
+    {
+        "@context": {"@vocab": "http://example.org/ns#"},
+        "@id": f"http://example.org/{i}",
+        "@type": "Book",
+        "title": f"Book {i}",
+    }
+    for i in range(25)
+]
+
+
+def test_map_record_lines_in_order():
+    target_map = make_target_map(VOCAB, TARGET)
+    lines = [json.dumps(record) + "\n" for record in RECORDS]
+    lines.insert(3, "\n")
+
+    expected = []
+    for record in RECORDS:
+        result = compact(TARGET, map_to(target_map, expand(record, None)))
+        result.pop("@context", None)
+        expected.append(result)
+
+    serial = list(map_record_lines(lines, target_map, TARGET))
+    assert [json.loads(line) for line in serial] == expected
+    assert expected[0] == {"@id": "http://example.org/0", "@type": "Book", "name": "Book 0"}
+
+    parallel = map_record_lines(lines, target_map, TARGET, jobs=2, batch_size=4)
+    assert list(parallel) == serial
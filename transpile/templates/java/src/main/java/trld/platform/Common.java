@@ -75,6 +75,10 @@ public class Common {
         }
     }
 
+    public static double monotonicTime() {
+        return System.nanoTime() / 1e9;
+    }
+
     public static String uuid4() {
         return java.util.UUID.randomUUID().toString();
     }
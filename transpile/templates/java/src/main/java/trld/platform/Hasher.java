@@ -0,0 +1,45 @@
+package trld.platform;
+
+import java.nio.charset.StandardCharsets;
+import java.security.MessageDigest;
+import java.security.NoSuchAlgorithmException;
+
+public class Hasher {
+
+    private MessageDigest digest;
+
+    public Hasher(String algorithm) {
+        try {
+            digest = MessageDigest.getInstance(toJavaAlgorithm(algorithm));
+        } catch (NoSuchAlgorithmException e) {
+            throw new RuntimeException(e);
+        }
+    }
+
+    static String toJavaAlgorithm(String algorithm) {
+        switch (algorithm) {
+            case "sha256": return "SHA-256";
+            case "sha384": return "SHA-384";
+            case "sha512": return "SHA-512";
+            default:
+                throw new IllegalArgumentException("Unsupported hash algorithm: " + algorithm);
+        }
+    }
+
+    public void update(String data) {
+        digest.update(data.getBytes(StandardCharsets.UTF_8));
+    }
+
+    public String hexdigest() {
+        byte[] hash = digest.digest();
+        StringBuilder hexString = new StringBuilder(2 * hash.length);
+        for (int i = 0; i < hash.length; i++) {
+            String hex = Integer.toHexString(0xff & hash[i]);
+            if(hex.length() == 1) {
+                hexString.append('0');
+            }
+            hexString.append(hex);
+        }
+        return hexString.toString();
+    }
+}
@@ -1,16 +1,20 @@
 import io
 import json
 import sys
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional, Set
 
-from .jsonld.keys import CONTEXT, GRAPH
+from .jsonld.keys import CONTEXT, GRAPH, ID
 from .jsonld.extras.contexts import to_context_data
+from .jsonld.rdf import RdfDataset, RdfQuad
+from .jsonstream import JsonGraphReader
 from .mimetypes import SUFFIX_MIME_TYPE_MAP
-from .platform.common import json_encode
+from .platform.common import json_dump
 from .platform.io import Input, Output
+from .quadstore import QuadStore
 
 TURTLE_OR_TRIG = {SUFFIX_MIME_TYPE_MAP[s] for s in ['trig', 'ttl']}
 NT_OR_NQ = {SUFFIX_MIME_TYPE_MAP[s] for s in ['nt', 'nq']}
+NDJSON_FORMATS = {'ndjson', 'jsonl'}
 
 
 def text_input(text: str, fmt: str = 'trig') -> Input:
@@ -25,14 +29,14 @@ def _to_headers(fmt: Optional[str]) -> Dict:
     return headers
 
 
-def parse_rdf(source: Any, fmt: Optional[str] = None) -> Any:
-    headers = _to_headers(fmt)
+def open_input(source: Any, fmt: Optional[str] = None) -> Input:
+    if isinstance(source, Input):
+        return source
+    return Input(None if source == '-' else source, _to_headers(fmt))
+
 
-    inp = (
-        source
-        if isinstance(source, Input)
-        else Input(None if source == '-' else source, headers)
-    )
+def parse_rdf(source: Any, fmt: Optional[str] = None) -> Any:
+    inp = open_input(source, fmt)
 
     if inp.content_type in TURTLE_OR_TRIG:
         from .trig import parser as trig
@@ -47,19 +51,128 @@ def parse_rdf(source: Any, fmt: Optional[str] = None) -> Any:
     return inp.load_json()
 
 
+def parse_rdf_nodes(source: Any, fmt: Optional[str] = None, window: int = 10000):
+    """
+    Stream node objects from N-Triples or N-Quads grouped by subject. See
+    `trld.jsonld.extras.fromrdf.FromRdfStream`.
+    """
+    inp = open_input(source, fmt)
+
+    if inp.content_type not in NT_OR_NQ:
+        raise ValueError(f'Cannot stream nodes from {inp.content_type}')
+
+    from .jsonld.extras.fromrdf import to_jsonld_stream
+    from .nq import parser as nq
+
+    return to_jsonld_stream(nq.read_quads(inp), use_native_types=True, window=window)
+
+
+def parse_rdf_dataset(source: Any, fmt: Optional[str] = None) -> RdfDataset:
+    """
+    Parse N-Triples or N-Quads straight into an RDF dataset, keeping the
+    blank node labels of the input (as used by `trld.c14n.canonicalize`).
+    Duplicate quads are dropped.
+    """
+    inp = open_input(source, fmt)
+
+    if inp.content_type not in NT_OR_NQ:
+        raise ValueError(f'Cannot read a dataset from {inp.content_type}')
+
+    from .nq import parser as nq
+
+    dataset = RdfDataset()
+    seen: Set[RdfQuad] = set()
+    with inp:
+        for quad in nq.read_quads(inp):
+            if quad not in seen:
+                seen.add(quad)
+                nq.add_quad(dataset, quad)
+
+    return dataset
+
+
+def parse_rdf_store(source: Any, fmt: Optional[str] = None) -> QuadStore:
+    """
+    Parse any supported RDF format into an indexed `trld.quadstore.QuadStore`.
+    N-Triples and N-Quads are read straight into it (keeping the blank node
+    labels of the input); other formats are expanded and converted first.
+    """
+    inp = open_input(source, fmt)
+    store = QuadStore()
+
+    if inp.content_type in NT_OR_NQ:
+        from .nq import parser as nq
+
+        with inp:
+            store.add_quads(nq.read_quads(inp))
+    else:
+        from .jsonld.expansion import expand
+        from .jsonld.rdf import to_rdf_dataset
+
+        data = parse_rdf(inp)
+        store.load_dataset(to_rdf_dataset(expand(data, inp.document_url or '')))
+
+    return store
+
+
+def parse_json_graph(source: Any, fmt: Optional[str] = None) -> Iterator[Any]:
+    """
+    Read a JSON-LD document incrementally, yielding a document for each member
+    of its top-level `@graph` (or array), carrying the `@context` (and `@id`)
+    of the top-level object. These can be expanded (and flattened) one at a
+    time, to process huge documents in bounded memory. (The top-level object
+    itself, if it has any other entries, is yielded first, without `@graph`.)
+
+    Entries are expected to precede `@graph`; any following it raise a
+    ValueError once read.
+    """
+    inp = open_input(source, fmt)
+
+    with inp:
+        reader = JsonGraphReader(inp)
+        graph_head: Optional[Dict] = None
+
+        for member in reader:
+            if reader.head is None:
+                yield member
+                continue
+
+            if graph_head is None:
+                graph_head = {k: v for k, v in reader.head.items() if k in {CONTEXT, ID}}
+                if len(graph_head) < len(reader.head):
+                    if ID not in graph_head:
+                        raise ValueError('Cannot stream the @graph of a blank node')
+                    yield reader.head
+
+            yield graph_head | {GRAPH: [member]}
+
+        if reader.head is not None and graph_head is None:
+            yield reader.head
+
+        if reader.tail:
+            raise ValueError(f'Cannot stream entries after @graph: {", ".join(reader.tail)}')
+
+
 def serialize_rdf(result: Any, fmt: Optional[str], out=None, context=None) -> None:
     if fmt is None or fmt == 'jsonld':
-        if out is not None:
-            json.dump(result, out, indent=2, ensure_ascii=False)
-            print(file=out)
-        else:
-            print(json_encode(result, pretty=True))
+        json_dump(result, out if out is not None else sys.stdout, pretty=True, newline=True)
 
         return
 
     if not isinstance(out, Output):
         out = Output(out or sys.stdout)
 
+    if fmt in NDJSON_FORMATS:
+        nodes = (
+            result.get(GRAPH, [result]) if isinstance(result, dict)
+            else result
+        )
+        dest = out.get_captured()
+        for node in nodes:
+            json_dump(node, dest, newline=True)
+
+        return
+
     if fmt in {'trig', 'ttl', 'turtle', 'turtle-union'}:
         from .trig import serializer as trig
 
@@ -0,0 +1,62 @@
+from collections import deque
+from concurrent.futures import (FIRST_COMPLETED, Future, ProcessPoolExecutor,
+                                as_completed, wait)
+from itertools import islice
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, Set, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def batched(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """
+    >>> list(batched(range(5), 2))
+    [[0, 1], [2, 3], [4]]
+    """
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def map_batches(
+    func: Callable[[List[T]], R],
+    items: Iterable[T],
+    jobs: int,
+    batch_size: int = 1,
+    initializer: Optional[Callable] = None,
+    initargs: tuple = (),
+    ordered=True,
+) -> Iterator[R]:
+    """
+    Call `func` with batches of the given items in a pool of `jobs` worker
+    processes, yielding the results in input order (or as soon as each batch
+    is done, unless ordered).
+
+    Batches are submitted as results are consumed, so at most two per worker
+    are pending at any time, and memory use is bounded regardless of the
+    number of items.
+    """
+    max_pending = jobs * 2
+    pending: Deque[Future] = deque()
+    running: Set[Future] = set()
+
+    with ProcessPoolExecutor(jobs, initializer=initializer, initargs=initargs) as executor:
+        for batch in batched(items, batch_size):
+            future = executor.submit(func, batch)
+
+            if ordered:
+                pending.append(future)
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+            else:
+                running.add(future)
+                if len(running) >= max_pending:
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                    for finished in done:
+                        yield finished.result()
+
+        for future in pending:
+            yield future.result()
+
+        for future in as_completed(running):
+            yield future.result()
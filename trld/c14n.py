@@ -11,15 +11,30 @@ from collections import OrderedDict
 from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, cast
 
 from .jsonld.rdf import RdfDataset, RdfGraph, RdfLiteral, RdfObject, RdfTriple
-from .nq.serializer import repr_quad
-from .platform.common import hash_hexdigest, permutations
-
-
-def canonicalize(input_ds: RdfDataset, hash_algorithm: Optional[str] = None) -> RdfDataset:
+from .nq.serializer import repr_quad, repr_term
+from .platform.common import Hasher, hash_hexdigest, monotonic_time, permutations
+
+
+def canonicalize(
+    input_ds: RdfDataset,
+    hash_algorithm: Optional[str] = None,
+    limits: Optional[CanonicalizationLimits] = None,
+    refine=False,
+) -> RdfDataset:
+    """
+    Canonicalize a dataset using RDFC-1.0. If refine is set, blank nodes
+    sharing a first degree hash are first told apart by the hashes of their
+    neighbours, if possible (see `CanonicalizationState.refine_hashes`).
+    That yields a canonical form as well, but blank node labels can differ
+    from those of RDFC-1.0 (whenever the refinement splits a group).
+    """
     if hash_algorithm is None:
         hash_algorithm = 'sha256'
 
-    c14n_state = CanonicalizationState(hash_algorithm)
+    return canonicalize_with_state(CanonicalizationState(hash_algorithm, limits, refine), input_ds)
+
+
+def canonicalize_with_state(c14n_state: CanonicalizationState, input_ds: RdfDataset) -> RdfDataset:
     c14n_state.canonicalize(input_ds)
     mapper = c14n_state.get_mapper()
 
@@ -46,19 +61,135 @@ def canonicalize(input_ds: RdfDataset, hash_algorithm: Optional[str] = None) ->
     return canon_ds
 
 
+def dataset_digest(
+    input_ds: RdfDataset,
+    hash_algorithm: Optional[str] = None,
+    limits: Optional[CanonicalizationLimits] = None,
+    refine=False,
+    c14n_algorithm: Optional[str] = None,
+) -> str:
+    """
+    Hash the canonical N-Quads form of a dataset (as output by `canonicalize`
+    and `trld.nq.serializer`) with the given hash algorithm, feeding the
+    sorted quads to the hash one at a time. The canonicalized dataset and
+    the serialization are not created, but the canonical N-Quads lines are
+    collected in order to be sorted.
+
+    Canonicalization uses sha256 (the RDFC-1.0 default) unless a
+    `c14n_algorithm` is given, so the hash algorithm only changes the digest,
+    not the text hashed.
+    """
+    if hash_algorithm is None:
+        hash_algorithm = 'sha256'
+    if c14n_algorithm is None:
+        c14n_algorithm = 'sha256'
+
+    c14n_state = CanonicalizationState(c14n_algorithm, limits, refine)
+    c14n_state.canonicalize(input_ds)
+    mapper = c14n_state.get_mapper()
+
+    nquads: List[str] = []
+    for name, graph in input_ds:
+        canon_name: Optional[str] = mapper.remap_id(name) if name is not None else None
+        for triple in graph:
+            canon_triple = RdfTriple(
+                mapper.remap_id(triple.subject),
+                mapper.remap_id(triple.predicate),
+                mapper.remap(triple.object),
+            )
+            nquads.append(repr_quad(canon_triple, canon_name))
+    nquads.sort()
+
+    hasher = Hasher(hash_algorithm)
+    prev: Optional[str] = None
+    for nquad in nquads:
+        # A dataset has no duplicate quads.
+        if prev is None or nquad != prev:
+            hasher.update(f'{nquad}\n')
+        prev = nquad
+    return hasher.hexdigest()
+
+
+# NOTE: Not part of the spec. Bounds the work done by the Hash N-Degree Quads
+# algorithm, which is exponential for some (poisoned) datasets. See
+# <https://www.w3.org/TR/rdf-canon/#dataset-poisoning>.
+class CanonicalizationLimits:
+    max_depth: Optional[int]
+    max_n_degree_calls: Optional[int]
+    max_permutations: Optional[int]
+    timeout: Optional[float]
+
+    def __init__(
+        self,
+        max_depth: Optional[int] = None,
+        max_n_degree_calls: Optional[int] = None,
+        max_permutations: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.max_depth = max_depth
+        self.max_n_degree_calls = max_n_degree_calls
+        self.max_permutations = max_permutations
+        self.timeout = timeout
+
+
+class CanonicalizationLimitError(Exception):
+
+    limit: str
+    depth: int
+    n_degree_calls: int
+    permutations: int
+    elapsed: float
+
+    def __init__(self, limit: str, depth: int, n_degree_calls: int, permutations: int, elapsed: float):
+        super().__init__(limit)
+        self.limit = limit
+        self.depth = depth
+        self.n_degree_calls = n_degree_calls
+        self.permutations = permutations
+        self.elapsed = elapsed
+
+    def __str__(self) -> str:
+        return (f'Canonicalization exceeded {self.limit}'
+                f' (depth: {self.depth}, N-degree calls: {self.n_degree_calls},'
+                f' permutations: {self.permutations}, seconds: {self.elapsed})')
+
+
 class CanonicalizationState:
     blank_node_to_quads_map: Dict[str, List[Quad]]
+    blank_node_to_templates_map: Dict[str, List[QuadTemplate]]
     hash_to_blank_nodes_map: Dict[str, List[str]]
+    first_degree_hashes: Dict[str, str]
     canonical_issuer: BNodeIdentifierIssuer
     hash_algorithm: str
-
-    def __init__(self, hash_algorithm: str):
+    limits: Optional[CanonicalizationLimits]
+    depth: int
+    n_degree_calls: int
+    permutation_count: int
+    started: float
+    refine: bool
+
+    def __init__(
+        self,
+        hash_algorithm: str,
+        limits: Optional[CanonicalizationLimits] = None,
+        refine=False,
+    ):
         self.blank_node_to_quads_map = {}
+        self.blank_node_to_templates_map = {}
         self.hash_to_blank_nodes_map = {}
+        self.first_degree_hashes = {}
         self.canonical_issuer = BNodeIdentifierIssuer()
         self.hash_algorithm = hash_algorithm
+        self.limits = limits
+        self.depth = 0
+        self.n_degree_calls = 0
+        self.permutation_count = 0
+        self.started = 0.0
+        self.refine = refine
 
     def canonicalize(self, input_ds: RdfDataset) -> None:
+        self.started = monotonic_time()
+
         # 1) Create the canonicalization state.
         # If the input dataset is an N-Quads document,
         # parse that document into a dataset in the canonicalized dataset,
@@ -69,12 +200,18 @@ class CanonicalizationState:
         for name, graph in input_ds:
             for triple in graph:
                 q = Quad(triple.subject, triple.predicate, triple.object, name)
+                if not _has_blank_node(q):
+                    continue
+
+                # NOTE: Not part of the spec. The quad is serialized once, into
+                # a template used by the Hash First Degree Quads algorithm.
+                template = QuadTemplate(q)
 
                 # 2.1) For each blank node that is a component of Q, add a reference to Q from the map entry for the blank node identifier identifier in the blank node to quads map, creating a new entry if necessary, using the identifier for the blank node found in the input blank node identifier map.
-                self._add_component_ref(q.s, q)
-                self._add_component_ref(q.p, q)
-                self._add_component_ref(q.o, q)
-                self._add_component_ref(q.g, q)
+                self._add_component_ref(q.s, q, template)
+                self._add_component_ref(q.p, q, template)
+                self._add_component_ref(q.o, q, template)
+                self._add_component_ref(q.g, q, template)
 
         # 3) For each key n in the blank node to quads map:
         for n in self.blank_node_to_quads_map.keys():
@@ -85,6 +222,11 @@ class CanonicalizationState:
                 self.hash_to_blank_nodes_map[hf_n] = []
             self.hash_to_blank_nodes_map[hf_n].append(n)
 
+        # NOTE: Not part of the spec. Split the groups of blank nodes if
+        # possible, to avoid the Hash N-Degree Quads algorithm (in step 5).
+        if self.refine:
+            self.refine_hashes()
+
         # 4) For each hash to identifier list map entry in hash to blank nodes map, code point ordered by hash:
         for hash in sorted(self.hash_to_blank_nodes_map.keys()):
             id_list = self.hash_to_blank_nodes_map[hash]
@@ -100,18 +242,10 @@ class CanonicalizationState:
         for hash in sorted(self.hash_to_blank_nodes_map.keys()):
             id_list = self.hash_to_blank_nodes_map[hash]
             # 5.1) Create hash path list where each item will be a result of running the Hash N-Degree Quads algorithm.
-            hash_path_list: List[Tuple[BNodeIdentifierIssuer, str]] = []
-            # 5.2) For each blank node identifier n in identifier list:
-            for n in id_list:
-                # 5.2.1) If a canonical identifier has already been issued for n, continue to the next blank node identifier.
-                if n in self.canonical_issuer.issued_identifiers_map:
-                    continue
-                # 5.2.2) Create temporary issuer, an identifier issuer initialized with the prefix b.
-                temp_issuer = BNodeIdentifierIssuer("b")
-                # 5.2.3) Use the Issue Identifier algorithm, passing temporary issuer and n, to issue a new temporary blank node identifier bn to n.
-                bn = temp_issuer.issue_identifier(n)
-                # 5.2.4) Run the Hash N-Degree Quads algorithm, passing the canonicalization state, n for identifier, and temporary issuer, appending the result to the hash path list.
-                hash_path_list.append(self.hash_n_degree_quads(n, temp_issuer))
+            # 5.2) (See hash_n_degree_group.)
+            hash_path_list: List[Tuple[BNodeIdentifierIssuer, str]] = self.hash_n_degree_group(
+                [n for n in id_list if n not in self.canonical_issuer.issued_identifiers_map]
+            )
             # 5.3) For each result in the hash path list, code point ordered by the hash in result:
             hash_path_list.sort(key=lambda item: cast(str, cast(Tuple, item)[1]))
             for result_issuer, result_hash in hash_path_list:
@@ -125,13 +259,103 @@ class CanonicalizationState:
         # Upon request, alternatively (or additionally) return the canonicalized dataset itself,
         # which includes the input blank node identifier map, and issued identifiers map from the canonical issuer.
 
-    def _add_component_ref(self, component: Optional[RdfObject], q: Quad) -> None:
+    def refine_hashes(self) -> None:
+        # NOTE: Not part of the spec. Colour refinement of the first degree
+        # hashes: each round, the hash of a blank node is combined with the
+        # hashes of the blank nodes it shares quads with. This is repeated
+        # until no group of blank nodes in the hash to blank nodes map is
+        # split any further.
+        hashes: Dict[str, str] = {}
+        for n in self.blank_node_to_templates_map.keys():
+            hashes[n] = self.hash_first_degree_quads(n)
+
+        group_count: int = len(self.hash_to_blank_nodes_map)
+        refining: bool = group_count < len(hashes)
+        while refining:
+            refined: Dict[str, str] = {}
+            for n, templates in self.blank_node_to_templates_map.items():
+                # (A blank node alone in its group is already told apart.)
+                if len(self.hash_to_blank_nodes_map[hashes[n]]) == 1:
+                    refined[n] = hashes[n]
+                    continue
+                nquads: List[str] = []
+                for template in templates:
+                    nquads.append(template.render_hashes(n, hashes))
+                nquads.sort()
+                refined[n] = self.make_hash(f"{hashes[n]}{''.join(nquads)}")
+
+            groups: Dict[str, List[str]] = _group_by_hash(refined)
+            # Since refined hashes include the previous ones, groups can only
+            # be split; once none is, the refinement is stable.
+            refining = len(groups) > group_count and len(groups) < len(refined)
+            if len(groups) > group_count:
+                hashes = refined
+                group_count = len(groups)
+                self.hash_to_blank_nodes_map = groups
+
+    def hash_n_degree_group(self, id_list: List[str]) -> List[Tuple[BNodeIdentifierIssuer, str]]:
+        # NOTE: Not part of the spec. Step 5.2 of canonicalize, given the
+        # identifiers without a canonical identifier (step 5.2.1). The results
+        # only depend on the state as of before the group, so they may be
+        # computed in any order (see trld.c14n_parallel).
+        hash_path_list: List[Tuple[BNodeIdentifierIssuer, str]] = []
+        # 5.2) For each blank node identifier n in identifier list:
+        for n in id_list:
+            # 5.2.2) Create temporary issuer, an identifier issuer initialized with the prefix b.
+            temp_issuer = BNodeIdentifierIssuer("b")
+            # 5.2.3) Use the Issue Identifier algorithm, passing temporary issuer and n, to issue a new temporary blank node identifier bn to n.
+            bn = temp_issuer.issue_identifier(n)
+            # 5.2.4) Run the Hash N-Degree Quads algorithm, passing the canonicalization state, n for identifier, and temporary issuer, appending the result to the hash path list.
+            hash_path_list.append(self.hash_n_degree_quads(n, temp_issuer))
+        return hash_path_list
+
+    def _add_component_ref(self, component: Optional[RdfObject], q: Quad, template: QuadTemplate) -> None:
         if isinstance(component, str):
             bnode_id = _get_bnode_id(component)
             if bnode_id is not None:
                 if bnode_id not in self.blank_node_to_quads_map:
                     self.blank_node_to_quads_map[bnode_id] = []
+                    self.blank_node_to_templates_map[bnode_id] = []
                 self.blank_node_to_quads_map[bnode_id].append(q)
+                self.blank_node_to_templates_map[bnode_id].append(template)
+
+    def _check_limits(self, pending_permutations: int) -> None:
+        limits: Optional[CanonicalizationLimits] = self.limits
+        if limits is not None:
+            exceeded: Optional[str] = self._exceeded_limit(limits, pending_permutations)
+            if exceeded is not None:
+                raise CanonicalizationLimitError(
+                    exceeded,
+                    self.depth,
+                    self.n_degree_calls,
+                    self.permutation_count,
+                    monotonic_time() - self.started,
+                )
+
+    def _exceeded_limit(self, limits: CanonicalizationLimits, pending_permutations: int) -> Optional[str]:
+        if limits.max_depth is not None and self.depth > limits.max_depth:
+            return 'max_depth'
+        if limits.max_n_degree_calls is not None and self.n_degree_calls > limits.max_n_degree_calls:
+            return 'max_n_degree_calls'
+        if (limits.max_permutations is not None
+                and self.permutation_count + pending_permutations > limits.max_permutations):
+            return 'max_permutations'
+        if limits.timeout is not None and monotonic_time() - self.started > limits.timeout:
+            return 'timeout'
+        return None
+
+    def _count_pending_permutations(self, size: int) -> int:
+        # The factorial of size, but capped to stay within the limit (if any).
+        limits: Optional[CanonicalizationLimits] = self.limits
+        if limits is None or limits.max_permutations is None:
+            return 0
+        cap: int = limits.max_permutations - self.permutation_count + 1
+        count = 1
+        i = 2
+        while i <= size and count < cap:
+            count = count * i
+            i += 1
+        return count if count < cap else cap
 
     def get_mapper(self) -> CanonicalIdMapper:
         return CanonicalIdMapper(self.canonical_issuer.issued_identifiers_map)
@@ -140,15 +364,25 @@ class CanonicalizationState:
         return hash_hexdigest(self.hash_algorithm, data)
 
     def hash_first_degree_quads(self, ref_blank_node_id: str) -> str:
+        # NOTE: Not part of the spec. The hash of a blank node never changes
+        # once its quads are mapped (in step 2 of canonicalize), so it is
+        # kept for reuse by the Hash Related Blank Node algorithm.
+        hash: Optional[str] = self.first_degree_hashes.get(ref_blank_node_id)
+        if hash is None:
+            hash = self._hash_first_degree_quads(ref_blank_node_id)
+            self.first_degree_hashes[ref_blank_node_id] = hash
+        return hash
+
+    def _hash_first_degree_quads(self, ref_blank_node_id: str) -> str:
         # 1. Initialize nquads to an empty list. It will be used to store quads in canonical n-quads form.
         nquads: List[str] = []
         # 2. Get the list of quads quads from the map entry for reference blank node identifier in the blank node to quads map.
-        quads = self.blank_node_to_quads_map[ref_blank_node_id]
+        # (Using the templates serialized from those quads.)
+        templates = self.blank_node_to_templates_map[ref_blank_node_id]
         # 3. For each quad quad in quads:
-        for quad in quads:
+        for template in templates:
             # 3.1 Serialize the quad in canonical n-quads form with the following special rule:
-            nquad = _to_special_quad(quad, ref_blank_node_id)
-            nquads.append(nquad)
+            nquads.append(template.render(ref_blank_node_id))
         # 4. Sort nquads in Unicode code point order.
         nquads.sort()
         # 5. Return the hash that results from passing the sorted and concatenated nquads through the hash algorithm.
@@ -180,6 +414,12 @@ class CanonicalizationState:
     def hash_n_degree_quads(
         self, identifier: str, issuer: BNodeIdentifierIssuer
     ) -> Tuple[BNodeIdentifierIssuer, str]:
+        # NOTE: Not part of the spec. Count the work done (see
+        # CanonicalizationLimits).
+        self.n_degree_calls += 1
+        self.depth += 1
+        self._check_limits(0)
+
         # 1. Create a new map Hn for relating hashes to related blank nodes.
         hn: Dict[str, List[str]] = {}
         # 2. Get a reference, quads, to the list of quads from the map entry for identifier in the blank node to quads map.
@@ -210,8 +450,12 @@ class CanonicalizationState:
             chosen_path = ""
             # 5.3 Create an unset chosen issuer variable.
             chosen_issuer: Optional[BNodeIdentifierIssuer] = None
+            # (Fail before generating more permutations than allowed.)
+            self._check_limits(self._count_pending_permutations(len(bnode_list)))
             # 5.4 For each permutation p of blank node list:
             for p in cast(List[List[str]], permutations(bnode_list)):
+                self.permutation_count += 1
+                self._check_limits(0)
                 skip_to_next_p = False
 
                 # 5.4.1 Create a copy of issuer, issuer copy.
@@ -285,6 +529,8 @@ class CanonicalizationState:
             assert chosen_issuer is not None  # TODO: if?!
             issuer = chosen_issuer
 
+        self.depth -= 1
+
         # 6. Return issuer and the hash that results from passing data to hash through the hash algorithm.
         return issuer, self.make_hash(''.join(data))
 
@@ -349,6 +595,54 @@ class Quad(NamedTuple):
         return repr_quad(triple, self.g) + '\n'
 
 
+# NOTE: Not part of the spec. A quad serialized in canonical n-quads form,
+# split at the blank node components (into one more chunk than slots).
+class QuadTemplate:
+    chunks: List[str]
+    slots: List[str]
+
+    def __init__(self, quad: Quad):
+        self.chunks = []
+        self.slots = []
+        terms: List[RdfObject] = [quad.s, quad.p, quad.o]
+        if quad.g:
+            terms.append(quad.g)
+        chunk: str = ''
+        for term in terms:
+            bnode_id: Optional[str] = _get_bnode_id(term) if isinstance(term, str) else None
+            if bnode_id is not None:
+                self.chunks.append(chunk)
+                self.slots.append(bnode_id)
+                chunk = ' '
+            else:
+                chunk = f'{chunk}{repr_term(term)} '
+        self.chunks.append(f'{chunk}.\n')
+
+    def render(self, ref_blank_node_id: str) -> str:
+        parts: List[str] = []
+        i = 0
+        for bnode_id in self.slots:
+            parts.append(self.chunks[i])
+            # 3.1.1 If any component in quad is an blank node, then serialize it using a special identifier as follows:
+            # 3.1.1.1 If the blank node's existing blank node identifier matches the reference blank node identifier then use the blank node identifier a, otherwise, use the blank node identifier z.
+            parts.append('_:a' if bnode_id == ref_blank_node_id else '_:z')
+            i += 1
+        parts.append(self.chunks[i])
+        return ''.join(parts)
+
+    def render_hashes(self, ref_blank_node_id: str, hashes: Dict[str, str]) -> str:
+        # Like render, but with the hashes of other blank nodes (see
+        # CanonicalizationState.refine_hashes).
+        parts: List[str] = []
+        i = 0
+        for bnode_id in self.slots:
+            parts.append(self.chunks[i])
+            parts.append('_:a' if bnode_id == ref_blank_node_id else f'_:{hashes[bnode_id]}')
+            i += 1
+        parts.append(self.chunks[i])
+        return ''.join(parts)
+
+
 class CanonicalIdMapper:
 
     _canonical_id_map: OrderedDict[str, str]
@@ -373,25 +667,22 @@ def _get_bnode_id(component: str) -> Optional[str]:
     return component[2:] if component.startswith("_:") else None
 
 
-def _to_special_quad(quad: Quad, ref_blank_node_id: str) -> str:
-    s = cast(str, _remap_quad_component(quad.s, ref_blank_node_id))
-    p = cast(str, _remap_quad_component(quad.p, ref_blank_node_id))
-    o = _remap_quad_component(quad.o, ref_blank_node_id)
-    g = quad.g
-    if quad.g is not None:
-        g = cast(str, _remap_quad_component(quad.g, ref_blank_node_id))
-
-    return str(Quad(s, p, o, g))
+def _group_by_hash(hashes: Dict[str, str]) -> Dict[str, List[str]]:
+    groups: Dict[str, List[str]] = {}
+    for n, hash in hashes.items():
+        if hash not in groups:
+            groups[hash] = []
+        groups[hash].append(n)
+    return groups
 
 
-def _remap_quad_component(component: RdfObject, ref_blank_node_id: str) -> RdfObject:
-    # 3.1.1 If any component in quad is an blank node, then serialize it using a special identifier as follows:
-    if isinstance(component, str):
-        bnode_id = _get_bnode_id(component)
-        if bnode_id is not None:
-            return "_:a" if bnode_id == ref_blank_node_id else "_:z"
-    return component
-    # 3.1.1.1 If the blank node's existing blank node identifier matches the reference blank node identifier then use the blank node identifier a, otherwise, use the blank node identifier z.
+def _has_blank_node(quad: Quad) -> bool:
+    return (
+        _get_bnode_id(quad.s) is not None
+        or _get_bnode_id(quad.p) is not None
+        or (isinstance(quad.o, str) and _get_bnode_id(quad.o) is not None)
+        or (quad.g is not None and _get_bnode_id(quad.g) is not None)
+    )
 
 
 if __name__ == '__main__':
@@ -0,0 +1,178 @@
+import copy
+import copyreg
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from typing import List, Optional, OrderedDict, Tuple
+
+from .c14n import (BNodeIdentifierIssuer, CanonicalizationLimitError,
+                   CanonicalizationLimits, CanonicalizationState,
+                   canonicalize_with_state)
+from .jsonld.rdf import RdfDataset
+
+HashPathList = List[Tuple[BNodeIdentifierIssuer, str]]
+Counts = Tuple[int, int]
+
+
+def canonicalize_parallel(
+    input_ds: RdfDataset,
+    hash_algorithm: Optional[str] = None,
+    limits: Optional[CanonicalizationLimits] = None,
+    jobs: Optional[int] = None,
+    threads=False,
+    refine=False,
+) -> RdfDataset:
+    """
+    Canonicalize a dataset like `trld.c14n.canonicalize`, but run the Hash
+    N-Degree Quads algorithm for the blank nodes sharing a first degree hash
+    in a pool of worker processes (or threads). The result is the same.
+
+    Any limits are checked by each worker, against the counts as of the
+    start of the group of blank nodes it is given a part of.
+
+    >>> from trld.jsonld.rdf import RdfTriple
+    >>> ds = RdfDataset()
+    >>> for i in range(3):
+    ...     ds.default_graph.add(RdfTriple(f'_:n{i}', 'urn:x:next', f'_:n{(i + 1) % 3}'))
+    >>> canon = canonicalize_parallel(ds, jobs=2, threads=True)
+    >>> for triple in canon.default_graph: print(triple.subject, triple.object)
+    _:c14n0 _:c14n1
+    _:c14n1 _:c14n2
+    _:c14n2 _:c14n0
+    """
+    if hash_algorithm is None:
+        hash_algorithm = 'sha256'
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+
+    c14n_state = ParallelCanonicalizationState(hash_algorithm, limits, jobs, threads, refine)
+    try:
+        return canonicalize_with_state(c14n_state, input_ds)
+    finally:
+        c14n_state.shutdown()
+
+
+class ParallelCanonicalizationState(CanonicalizationState):
+    """
+    Distributes each group of blank nodes given to `hash_n_degree_group` in
+    contiguous chunks over the workers, and concatenates the results in
+    order. Worker processes are given a copy of the state (with its quad
+    maps) once, and the issued canonical identifiers for each group.
+    """
+
+    jobs: int
+    threads: bool
+    _executor: Optional[Executor]
+
+    def __init__(
+        self,
+        hash_algorithm: str,
+        limits: Optional[CanonicalizationLimits] = None,
+        jobs: int = 1,
+        threads=False,
+        refine=False,
+    ):
+        super().__init__(hash_algorithm, limits, refine)
+        self.jobs = jobs
+        self.threads = threads
+        self._executor = None
+
+    def hash_n_degree_group(self, id_list: List[str]) -> HashPathList:
+        if self.jobs < 2 or len(id_list) < 2:
+            return super().hash_n_degree_group(id_list)
+
+        size = -(-len(id_list) // self.jobs)
+        chunks = [id_list[i : i + size] for i in range(0, len(id_list), size)]
+
+        executor = self._get_executor()
+        if self.threads:
+            results = executor.map(_hash_chunk_in_copy, repeat(self), chunks)
+        else:
+            issued = self.canonical_issuer.issued_identifiers_map
+            counts = (self.n_degree_calls, self.permutation_count)
+            results = executor.map(_hash_chunk, repeat(issued), repeat(counts), chunks)
+
+        hash_path_list: HashPathList = []
+        for chunk_results, (n_degree_calls, permutation_count) in list(results):
+            hash_path_list += chunk_results
+            self.n_degree_calls += n_degree_calls
+            self.permutation_count += permutation_count
+
+        return hash_path_list
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _get_executor(self) -> Executor:
+        # Created on demand, when the quad maps (and first degree hashes)
+        # are complete, and thus can be copied once to worker processes.
+        if self._executor is None:
+            if self.threads:
+                self._executor = ThreadPoolExecutor(self.jobs)
+            else:
+                self._executor = ProcessPoolExecutor(
+                    self.jobs, initializer=_init_worker, initargs=(self._worker_copy(),)
+                )
+        return self._executor
+
+    def _worker_copy(self) -> CanonicalizationState:
+        state = CanonicalizationState(self.hash_algorithm, self.limits)
+        state.blank_node_to_quads_map = self.blank_node_to_quads_map
+        state.blank_node_to_templates_map = self.blank_node_to_templates_map
+        state.first_degree_hashes = self.first_degree_hashes
+        state.started = self.started
+        return state
+
+
+_worker_state: Optional[CanonicalizationState] = None
+
+
+def _reduce_limit_error(error: CanonicalizationLimitError):
+    return CanonicalizationLimitError, (
+        error.limit,
+        error.depth,
+        error.n_degree_calls,
+        error.permutations,
+        error.elapsed,
+    )
+
+
+# Pass the counters of a limit exceeded in a worker process.
+copyreg.pickle(CanonicalizationLimitError, _reduce_limit_error)
+
+
+def _init_worker(state: CanonicalizationState) -> None:
+    global _worker_state
+    _worker_state = state
+
+
+def _hash_chunk(
+    issued: OrderedDict[str, str], counts: Counts, id_list: List[str]
+) -> Tuple[HashPathList, Counts]:
+    state = _worker_state
+    assert state is not None
+    state.canonical_issuer.issued_identifiers_map = issued
+    return _count_hashing(state, counts, id_list)
+
+
+def _hash_chunk_in_copy(
+    shared: CanonicalizationState, id_list: List[str]
+) -> Tuple[HashPathList, Counts]:
+    # A shallow copy shares the (read only) maps, but has its own counters.
+    state = copy.copy(shared)
+    return _count_hashing(state, (shared.n_degree_calls, shared.permutation_count), id_list)
+
+
+def _count_hashing(
+    state: CanonicalizationState, counts: Counts, id_list: List[str]
+) -> Tuple[HashPathList, Counts]:
+    state.depth = 0
+    state.n_degree_calls, state.permutation_count = counts
+    results = CanonicalizationState.hash_n_degree_group(state, id_list)
+    return results, (
+        state.n_degree_calls - counts[0],
+        state.permutation_count - counts[1],
+    )
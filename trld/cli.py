@@ -1,36 +1,65 @@
 import argparse
-import json
+import io
 import os
 import sys
-from typing import Any, cast
+from contextlib import redirect_stdout
+from typing import Any, Dict, Iterable, List, Optional, Tuple, cast
 
-from .platform.common import json_encode
+from .batches import map_batches
+from .platform.common import json_decode
 from .platform.io import Output
 from .jsonld.keys import BASE, CONTAINER, CONTEXT, TYPE
 from .jsonld.compaction import compact
-from .jsonld.context import get_context
+from .jsonld.context import Context, get_context
 from .jsonld.docloader import set_document_loader, any_document_loader
 from .jsonld.expansion import expand
 from .jsonld.extras.contexts import to_simple_context
-from .jsonld.flattening import flatten
-from .api import parse_rdf, serialize_rdf
+from .jsonld.flattening import BNodes, flatten
+from .api import (NDJSON_FORMATS, NT_OR_NQ, open_input, parse_json_graph,
+                  parse_rdf, parse_rdf_dataset, parse_rdf_nodes, serialize_rdf)
 
 
 set_document_loader(any_document_loader)
 
+# Number of NDJSON lines given to a worker at a time (when using --jobs).
+LINE_BATCH_SIZE = 64
+
+_doc_cache: Dict[str, Any] = {}
+_context_cache: Dict[str, Context] = {}
+# Shared by the contexts given inline (e.g. in each NDJSON record).
+_inverse_contexts: Dict[str, Dict] = {}
+
 
 def printerr(msg):
     print(msg, file=sys.stderr)
 
 
-def process_source(source, args) -> None:
+def cached_document_loader(url, options=None):
+    if url not in _doc_cache:
+        _doc_cache[url] = any_document_loader(url, options)
+    return _doc_cache[url]
+
+
+def _get_context(context_ref) -> Context:
+    # Contexts referenced by URL or path are kept, along with their inverse
+    # contexts (made on first use by compaction).
+    if not isinstance(context_ref, str):
+        return get_context(context_ref, None, _inverse_contexts)
+
+    context = _context_cache.get(context_ref)
+    if context is None:
+        context = _context_cache[context_ref] = get_context(context_ref)
+    return context
+
+
+def process_source(source, args, bnodes: BNodes | None = None) -> None:
     source_is_data = isinstance(source, (dict, list))
 
     ordered = args.sorted
 
     expand_context = args.expand_context
 
-    if not expand_context and (args.c14n or args.output_format == 'nq'):
+    if not expand_context and (args.c14n or args.digest or args.output_format == 'nq'):
         expand_context = True
 
     base_iri = (
@@ -44,12 +73,33 @@ def process_source(source, args) -> None:
 
     try:
         result: Any
+        dataset = None
         if source_is_data:
             data = source
         else:
-            data = parse_rdf(source, args.input_format)
+            inp = open_input(source, args.input_format)
 
-        if expand_context:
+            if args.output_format in NDJSON_FORMATS and inp.content_type in NT_OR_NQ:
+                nodes = parse_rdf_nodes(inp)
+                serialize_rdf(nodes, args.output_format, out)
+                if args.stats:
+                    printerr(f'Held back at most {nodes.max_held} nodes')
+                return
+
+            if args.stream:
+                _process_json_stream(inp, args, base_iri, expand_context, out)
+                return
+
+            if (args.c14n or args.digest) and inp.content_type in NT_OR_NQ:
+                # Canonicalize the parsed quads as is (keeping their blank node labels).
+                dataset = parse_rdf_dataset(inp)
+                data = None
+            else:
+                data = parse_rdf(inp)
+
+        if dataset is not None:
+            result = None
+        elif expand_context:
             if isinstance(expand_context, str):
                 expand_context = _absolutize(args.expand_context)
             elif expand_context == True:
@@ -59,14 +109,20 @@ def process_source(source, args) -> None:
         else:
             result = data
 
-        if args.flatten or args.c14n or args.output_format in {'nq', True}:
+        if dataset is None and (args.flatten or args.c14n or args.digest or args.output_format in {'nq', True}):
             result = flatten(result, ordered=ordered)
 
-        if args.c14n:
+        if args.c14n or args.digest:
             from .jsonld import rdf
             from . import c14n
 
-            dataset = rdf.to_rdf_dataset(result)
+            if dataset is None:
+                dataset = rdf.to_rdf_dataset(result)
+
+            if args.digest:
+                out.writeln(c14n.dataset_digest(dataset, args.digest))
+                return
+
             canon_dataset = c14n.canonicalize(dataset)
 
             if args.output_format == 'nq':
@@ -77,6 +133,13 @@ def process_source(source, args) -> None:
             else:
                 result = rdf.to_jsonld(canon_dataset)
 
+        elif args.output_format == 'nq':
+            from .jsonld.rdf import iter_rdf_quads
+            from .nq import serializer as nq
+
+            nq.write_quads(iter_rdf_quads(result, bnodes), out)
+            return
+
         context = None
 
         context_ref = args.context
@@ -100,7 +163,7 @@ def process_source(source, args) -> None:
                     context_ref = {CONTEXT: to_simple_context(get_context(expand_context))}
 
             if context_ref:
-                context = get_context(context_ref)
+                context = _get_context(context_ref)
                 if args.base is not None:
                     context.base_iri = args.base
 
@@ -133,20 +196,56 @@ def process_source(source, args) -> None:
         traceback.print_exc()
 
 
-def process_linestream(args, stream):
-    doc_cache = {}
+def _process_json_stream(inp, args, base_iri, expand_context, out) -> None:
+    if args.output_format not in NDJSON_FORMATS | {'nq'} or args.c14n or args.context:
+        raise ValueError('Streaming only supports plain nq or ndjson output')
 
-    def cached_document_loader(url, options=None):
-        if url not in doc_cache:
-            doc_cache[url] = any_document_loader(url, options)
-        return doc_cache[url]
+    if isinstance(expand_context, str):
+        expand_context = _absolutize(expand_context)
+    elif expand_context == True:
+        expand_context = None
 
+    # Shared across the graph members, since they are parts of one document.
+    flat_bnodes = BNodes()
+    quad_bnodes = BNodes()
+
+    def results():
+        for doc in parse_json_graph(inp):
+            if args.expand_context or args.output_format == 'nq':
+                result = expand(doc, base_iri, expand_context, ordered=args.sorted)
+            else:
+                result = doc
+
+            if args.flatten or args.output_format == 'nq':
+                result = flatten(result, ordered=args.sorted, bnodes=flat_bnodes)
+
+            yield result
+
+    if args.output_format == 'nq':
+        from .jsonld.rdf import iter_rdf_quads
+        from .nq import serializer as nq
+
+        for result in results():
+            nq.write_quads(iter_rdf_quads(result, quad_bnodes), out)
+    else:
+        records = results()
+        if args.embed_blanks:
+            # Frame each member on its own, embedding the blank nodes within it.
+            from .jsonld.extras.frameblanks import frameblanks_records
+
+            records = frameblanks_records(records)
+
+        for result in records:
+            serialize_rdf(result, args.output_format, out)
+
+
+def process_linestream(args, stream):
     set_document_loader(cached_document_loader)
 
     container_context = {}
 
     if isinstance(args.context, str):
-        context = get_context(_absolutize(args.context))
+        context = _get_context(_absolutize(args.context))
 
         # Hack to get compact terms but supress prefix declarations in trig output.
         container_context[CONTEXT] = {
@@ -158,8 +257,70 @@ def process_linestream(args, stream):
         # Print prefix declarations
         process_source({CONTEXT: ctx}, args)
 
-    for l in stream:
-        process_source(json.loads(l) | container_context, args)
+    if args.jobs:
+        run_in_pool(stream, args, container_context, LINE_BATCH_SIZE)
+        return
+
+    for i, l in enumerate(stream):
+        _process_line(i, l, args, container_context)
+
+
+def _process_line(i: int, l: str, args, container_context: Dict) -> None:
+    # Keep blank nodes of each record apart in the combined output.
+    bnodes = BNodes(f'r{i}_')
+    process_source(json_decode(l) | container_context, args, bnodes)
+
+
+def run_in_pool(
+    items: Iterable[str],
+    args,
+    container_context: Optional[Dict] = None,
+    batch_size: int = 1,
+) -> None:
+    """
+    Process sources (or NDJSON lines, if a container context is given) in a
+    pool of `args.jobs` worker processes, and write their output in input
+    order (or as soon as each batch is done, if `args.unordered` is set).
+
+    Each worker keeps its own caches of loaded documents and contexts, for
+    all the items it is given. Batches are submitted as results are written,
+    so that only a few per worker are pending at a time.
+    """
+    for output in map_batches(
+        _process_batch,
+        enumerate(items),
+        args.jobs,
+        batch_size,
+        _init_worker,
+        (args, container_context),
+        ordered=not args.unordered,
+    ):
+        sys.stdout.write(output)
+        sys.stdout.flush()
+
+
+_worker_args: Any = None
+_worker_container_context: Optional[Dict] = None
+
+
+def _init_worker(args, container_context: Optional[Dict]) -> None:
+    global _worker_args, _worker_container_context
+    _worker_args = args
+    _worker_container_context = container_context
+    set_document_loader(cached_document_loader)
+
+
+def _process_batch(batch: List[Tuple[int, str]]) -> str:
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        for i, item in batch:
+            if _worker_container_context is not None:
+                _process_line(i, item, _worker_args, _worker_container_context)
+            else:
+                printerr(f"Parsing file: '{item}'")
+                process_source(item, _worker_args)
+
+    return buf.getvalue()
 
 
 def _absolutize(context_ref: str) -> str:
@@ -180,12 +341,22 @@ def make_argsparser():
     argparser.add_argument('-b', '--base',
                         help='Set the base IRI (default is current source)')
     argparser.add_argument('-f', '--flatten', action='store_true')
-    argparser.add_argument('-B', '--embed-blanks', action='store_true')
+    argparser.add_argument('-B', '--embed-blanks', action='store_true',
+                        help='Embed blank nodes referenced once (per record when streaming)')
     argparser.add_argument('-r', '--recompact', action='store_true',
                         help='Re-compact input into a Turtle-like shape (same as -e -f -c -B)')
     argparser.add_argument('-s', '--sorted', action='store_true', help='Sort output by @id and objects by key')
     argparser.add_argument('-C', '--no-context', help='Exclude context from result JSON-LD', action='store_true')
     argparser.add_argument('--c14n', help='Relabel blank nodes using RDF Canonicalization', action='store_true')
+    argparser.add_argument('--digest', const='sha256', nargs='?', metavar='ALGORITHM',
+                        help='Print the hash of the canonical N-Quads form (default algorithm is sha256)')
+    argparser.add_argument('--stats', help='Report memory use (held back nodes) when streaming', action='store_true')
+    argparser.add_argument('--stream', action='store_true',
+                        help='Read the @graph of a JSON-LD source one member at a time (for nq or ndjson output)')
+    argparser.add_argument('-j', '--jobs', type=int, metavar='N',
+                        help='Process sources (or NDJSON lines) in N worker processes')
+    argparser.add_argument('--unordered', action='store_true',
+                        help='With --jobs, write results as they are done rather than in input order')
 
     return argparser
 
@@ -203,6 +374,8 @@ def main():
 
     if args.input_format in ('ndjson', 'jsonl'):
         process_linestream(args, sys.stdin)
+    elif args.jobs and len(sources) > 1:
+        run_in_pool(sources, args)
     else:
         for source in sources:
             if len(sources) > 1:
@@ -20,10 +20,12 @@ class IRIConfusedWithPrefixError(JsonLdError):
 def compact(context: object, doc_data: JsonObject,
         base_iri: Optional[str] = None,
         compact_arrays = True,
-        ordered = False) -> JsonObject:
+        ordered = False,
+        shared_inverse_contexts: Optional[Dict[str, Dict]] = None) -> JsonObject:
 
     active_context: Context = (
-        context if isinstance(context, Context) else get_context(context, base_iri)
+        context if isinstance(context, Context)
+        else get_context(context, base_iri, shared_inverse_contexts)
     )
 
     result: JsonObject = compaction(
@@ -83,6 +83,8 @@ class Context:
     original_base_url: Optional[str] # IRI
 
     _inverse_context: Optional[Dict]
+    _shared_inverse_contexts: Dict[str, Dict]
+    _is_simple: Optional[bool]
 
     vocabulary_mapping: Optional[str] # IRI
     default_language: Optional[str] # Language
@@ -103,6 +105,7 @@ class Context:
         base_iri: Optional[str],
         original_base_url: Optional[str] = None,
         document_loader: Optional[LoadDocumentCallback] = None,
+        shared_inverse_contexts: Optional[Dict[str, Dict]] = None,
     ):
         # TODO: SPEC improvement? Document loader logic determined by original url.
         # TODO: improve transpile so we can go back to using `or` here...
@@ -113,6 +116,11 @@ class Context:
                 original_base_url if original_base_url is not None else base_iri
             )
         )
+        # Shared with the contexts copied from this one (see invcontext), and
+        # with any other contexts given the same table.
+        self._shared_inverse_contexts = (
+            shared_inverse_contexts if shared_inverse_contexts is not None else {}
+        )
         self.initialize(base_iri, original_base_url)
 
     def initialize(self, base_iri: Optional[str], original_base_url: Optional[str] = None):
@@ -132,6 +140,7 @@ class Context:
         self._processing_mode = DEFAULT_PROCESSING_MODE
         self._version = None
         self._inverse_context = None
+        self._is_simple = None
         #self._keyword_aliases = {}
 
     def copy(self) -> 'Context':
@@ -141,6 +150,7 @@ class Context:
         cloned.default_language = self.default_language
         cloned.default_base_direction = self.default_base_direction
         cloned._processing_mode = self._processing_mode
+        cloned._shared_inverse_contexts = self._shared_inverse_contexts
         return cloned
 
     def get_subcontext(self, context_data: object,
@@ -893,9 +903,10 @@ class Term:
                 self._local_context == other._local_context
 
 
-def get_context(context: object, base_iri: Optional[str] = None) -> Context:
+def get_context(context: object, base_iri: Optional[str] = None,
+        shared_inverse_contexts: Optional[Dict[str, Dict]] = None) -> Context:
     context_url: Optional[str] = context if isinstance(context, str) else None
     if isinstance(context, Dict):
         context = context.get(CONTEXT)
 
-    return Context(base_iri).get_subcontext(cast(object, context), context_url)
+    return Context(base_iri, None, None, shared_inverse_contexts).get_subcontext(cast(object, context), context_url)
@@ -25,6 +25,8 @@ OMIT_DEFAULT: str = '@omit_default'
 REQUIRES_ALL: str = '@requires_all'
 FRAMING_KEYWORDS: Set[str] = {DEFAULT, EMBED, EXPLICIT, OMIT_DEFAULT, REQUIRES_ALL}
 
+SIMPLE_CONTAINERS: Set[str] = {SET, LIST, LANGUAGE}
+
 
 class InvalidReversePropertyMapError(JsonLdError): pass
 
@@ -139,6 +141,17 @@ def expansion(active_context: Context,
     # 6)
     assert isinstance(element, Dict)
 
+    # NOTE: Not part of the spec. Node objects using only "simple" contexts
+    # take a shortcut through the steps below (see is_simple_context).
+    if not frame_expansion and (active_property is None or active_property != REVERSE) and \
+            CONTEXT not in element and is_simple_context(active_context):
+        expanded_keys: Optional[Dict[str, Optional[str]]] = _expand_simple_keys(active_context, element)
+        if expanded_keys is not None:
+            return _simple_node_expansion(
+                    active_context, active_property, element, expanded_keys,
+                    base_url, ordered, from_map,
+                    warn_on_keywordlike_terms, warn_on_empty_keys, warn_on_bnode_properties)
+
     # 7)
     # TODO: differs from spec (see spec problem 5f496df9)
     if not active_context._propagate and active_context.previous_context:
@@ -506,41 +519,7 @@ def _expand_element(active_context: Context,
 
         # 13.7)
         elif LANGUAGE in container_mapping and isinstance(value, Dict):
-            # 13.7.1)
-            expanded_value = expanded_list = []
-            # 13.7.2)
-            direction: Optional[str] = active_context.default_base_direction
-            # 13.7.3)
-            if key_term and key_term.direction is not None:
-                direction = key_term.direction
-            # 13.7.4)
-            languages: List[str] = list(value.keys())
-            if ordered:
-                languages.sort()
-            for lang in languages:
-                # 13.7.4.1)
-                langvalues: List[str] = as_list(value[lang])
-                # 13.7.4.2)
-                for item in langvalues:
-                    # 13.7.4.2.1)
-                    if item is None:
-                        continue
-                    # 13.7.4.2.2)
-                    if not isinstance(item, str):
-                        raise InvalidLanguageMapValueError
-                    # 13.7.4.2.3)
-                    o: Dict[str, str] = {VALUE: item, LANGUAGE: lang}
-                    # TODO: spec errata: s/If item/If language/
-                    if lang not in NULLS and not is_lang_tag(lang):
-                        warning(f'Language tag {value} is not well-formed')
-                    # 13.7.4.2.4)
-                    if lang in NULLS or active_context.expand_iri(lang) == NONE:
-                        del o[LANGUAGE]
-                    # 13.7.4.2.5)
-                    if direction not in NULLS: # TODO: marked from None
-                        o[DIRECTION] = cast(str, direction)
-                    # 13.7.4.2.6)
-                    expanded_list.append(o)
+            expanded_value = _expand_language_map(active_context, key_term, value, ordered)
 
         # 13.8)
         elif any(k in container_mapping for k in [INDEX, TYPE, ID]) and isinstance(value, Dict):
@@ -685,6 +664,168 @@ def _expand_element(active_context: Context,
                     warn_on_keywordlike_terms, warn_on_empty_keys, warn_on_bnode_properties)
 
 
+def _expand_language_map(active_context: Context,
+        key_term: Optional[Term],
+        value: JsonMap,
+        ordered: bool) -> List:
+    # 13.7.1)
+    expanded_list: List = []
+    # 13.7.2)
+    direction: Optional[str] = active_context.default_base_direction
+    # 13.7.3)
+    if key_term and key_term.direction is not None:
+        direction = key_term.direction
+    # 13.7.4)
+    languages: List[str] = list(value.keys())
+    if ordered:
+        languages.sort()
+    for lang in languages:
+        # 13.7.4.1)
+        langvalues: List[str] = as_list(value[lang])
+        # 13.7.4.2)
+        for item in langvalues:
+            # 13.7.4.2.1)
+            if item is None:
+                continue
+            # 13.7.4.2.2)
+            if not isinstance(item, str):
+                raise InvalidLanguageMapValueError
+            # 13.7.4.2.3)
+            o: Dict[str, str] = {VALUE: item, LANGUAGE: lang}
+            # TODO: spec errata: s/If item/If language/
+            if lang not in NULLS and not is_lang_tag(lang):
+                warning(f'Language tag {value} is not well-formed')
+            # 13.7.4.2.4)
+            if lang in NULLS or active_context.expand_iri(lang) == NONE:
+                del o[LANGUAGE]
+            # 13.7.4.2.5)
+            if direction not in NULLS: # TODO: marked from None
+                o[DIRECTION] = cast(str, direction)
+            # 13.7.4.2.6)
+            expanded_list.append(o)
+    return expanded_list
+
+
+# NOTE: Not part of the spec. A context is "simple" if its terms only use
+# plain IRI, @id/@vocab or datatype coercion, @language or @direction, and
+# @set, @list or @language containers. Expanding a node object then reduces to
+# steps 13.4.3, 13.4.4, 13.5-13.7, 13.9-13.11, 13.14, 16 and 19, since none of
+# the scoped contexts, propagation, type-scoped lookups (step 11) or nesting
+# can apply.
+def is_simple_context(active_context: Context) -> bool:
+    if active_context._is_simple is None:
+        simple: bool = active_context._propagate
+        if simple:
+            for term in active_context.terms.values():
+                if term is None:
+                    continue
+                if term.has_local_context or term.is_reverse_property or \
+                        term.nest_value is not None or term.index is not None or \
+                        term.type_mapping == JSON or \
+                        any(c not in SIMPLE_CONTAINERS for c in term.container):
+                    simple = False
+                    break
+        active_context._is_simple = simple
+    return active_context._is_simple
+
+
+def _expand_simple_keys(active_context: Context, element: JsonMap) -> Optional[Dict[str, Optional[str]]]:
+    expanded_keys: Dict[str, Optional[str]] = {}
+    for key in element.keys():
+        expanded_property: Optional[str] = active_context.expand_vocab_iri(key)
+        if expanded_property in KEYWORDS and expanded_property != ID and expanded_property != TYPE:
+            return None
+        expanded_keys[key] = expanded_property
+    return expanded_keys
+
+
+def _simple_node_expansion(active_context: Context,
+        active_property: Optional[str],
+        element: JsonMap,
+        expanded_keys: Dict[str, Optional[str]],
+        base_url: str,
+        ordered: bool,
+        from_map: bool,
+        warn_on_keywordlike_terms: bool,
+        warn_on_empty_keys: bool,
+        warn_on_bnode_properties: bool,
+        ) -> Optional[JsonObject]:
+    result: JsonOptMap = {}
+
+    keys: List[str] = list(element.keys())
+    if ordered:
+        keys.sort()
+    for key in keys:
+        value: Optional[JsonObject] = element[key]
+        expanded_value: Optional[JsonObject]
+
+        expanded_property: Optional[str] = expanded_keys[key]
+        if expanded_property is None or (':' not in expanded_property and expanded_property not in KEYWORDS):
+            continue
+
+        # 13.4.3)
+        if expanded_property == ID:
+            if not isinstance(value, str):
+                raise InvalidIdValueError
+            result[ID] = active_context.expand_doc_relative_iri(value)
+
+        # 13.4.4)
+        elif expanded_property == TYPE:
+            if not isinstance(value, (str, List)):
+                raise InvalidTypeValueError
+            expanded_list: List = []
+            for v in as_list(cast(JsonObject, value)):
+                expanded_list.append(active_context.expand_doc_relative_vocab_iri(cast(str, v)))
+            expanded_value = expanded_list
+            if len(expanded_list) == 1:
+                expanded_value = expanded_list[0]
+            if TYPE in result:
+                expanded_value = as_list(result[TYPE]) + as_list(expanded_value)
+            result[TYPE] = expanded_value
+
+        else:
+            # 13.5)
+            key_term: Optional[Term] = active_context.terms.get(key)
+            container_mapping: List = key_term.container if key_term else []
+
+            # 13.7)
+            if LANGUAGE in container_mapping and isinstance(value, Dict):
+                expanded_value = _expand_language_map(active_context, key_term, value, ordered)
+            # 13.9) (with no scoped contexts, scalars go straight to step 4.3)
+            elif value is not None and not isinstance(value, (Dict, List)):
+                expanded_value = value_expansion(active_context, key, value)
+            else:
+                expanded_value = expansion(active_context,
+                        key, value,
+                        base_url, False, ordered, from_map,
+                        warn_on_keywordlike_terms, warn_on_empty_keys, warn_on_bnode_properties)
+
+            # 13.10)
+            if expanded_value is None:
+                continue
+
+            # 13.11)
+            if LIST in container_mapping:
+                if not isinstance(expanded_value, Dict) or LIST not in expanded_value:
+                    expanded_value = {LIST: as_list(cast(JsonObject, expanded_value))}
+
+            # 13.14)
+            add_value_as_list(result, expanded_property, expanded_value)
+
+    # 16)
+    if TYPE in result and not isinstance(result[TYPE], List):
+        result[TYPE] = [result[TYPE]]
+
+    # 19)
+    if active_property is None or active_property == GRAPH:
+        if len(result) == 0:
+            return None
+        elif len(result) == 1 and ID in result:
+            return None
+
+    return result
+
+
 def value_expansion(active_context: Context, active_property: str, value: Scalar) -> JsonObject:
     # 1)
     active_term: Optional[Term] = active_context.terms.get(active_property)
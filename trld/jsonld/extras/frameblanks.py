@@ -1,5 +1,4 @@
-from collections import OrderedDict
-from typing import Dict, List, Optional, Tuple, cast
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, cast
 
 from ..keys import GRAPH, ID
 from ..base import JsonObject
@@ -16,12 +15,12 @@ def frameblanks(doc: JsonObject) -> JsonObject:
 
     items: List = data if isinstance(data, List) else [data] if data is not None else []
 
-    index: IndexType = OrderedDict()
+    index: IndexType = {}
 
     graphs = []
 
     for item in items:
-        assert isinstance(item, Dict)
+        assert isinstance(item, dict)
         if GRAPH in item:
             graphs.append(item)
             frameblanks(item)
@@ -60,30 +59,54 @@ def frameblanks(doc: JsonObject) -> JsonObject:
     return doc
 
 
-def visit_node(index: IndexType, node: Dict[str, object], parent: Optional[Dict]):
-    if ID in node:
-        node_id = cast(str, node[ID])
-        full_node: Optional[Dict]
-        refs: List[Dict]
-        if node_id in index:
-            full_node, refs = index[node_id]
-        else:
-            full_node = None
-            refs = []
+def frameblanks_records(records: Iterable[JsonObject]) -> Iterator[JsonObject]:
+    """
+    Frame each record (e.g. a line of NDJSON, or a member of a streamed
+    @graph) on its own, so that only one record at a time is held and indexed.
 
-        isref = len(node) == (2 if ANNOTATION in node else 1)
-        if isref:
-            assert parent, f"Unexpected orphaned ref: {node}"
-            refs.append(node)
-        else:
-            full_node = node
+    Blank nodes are expected to be local to the record they appear in; one
+    described in a record is embedded if referenced once within that record,
+    regardless of any references to it from other records.
+    """
+    for record in records:
+        yield frameblanks(record)
 
-        index[node_id] = full_node, refs
 
-    for value in node.values():
-        if isinstance(value, List):
-            for v in value:
-                if isinstance(v, Dict):
-                    visit_node(index, v, node)
-        elif isinstance(value, Dict):
-            visit_node(index, value, node)
+def visit_node(index: IndexType, node: Dict[str, object], parent: Optional[Dict]):
+    # An explicit stack is used in place of recursion, to handle arbitrarily
+    # deep nesting. Children are pushed in reverse, to visit nodes in document
+    # order (all but the given node have a parent).
+    stack: List[Dict] = [node]
+    has_parent = parent is not None
+
+    while stack:
+        node = stack.pop()
+
+        node_id = cast(Optional[str], node.get(ID))
+        if node_id is not None:
+            entry = index.get(node_id)
+            if entry is None:
+                entry = index[node_id] = (None, [])
+
+            isref = len(node) == (2 if ANNOTATION in node else 1)
+            if isref:
+                assert has_parent, f"Unexpected orphaned ref: {node}"
+                entry[1].append(node)
+            else:
+                index[node_id] = node, entry[1]
+
+        has_parent = True
+
+        # (Checking the builtin types, since the typing aliases are far slower.)
+        children: List[Dict] = []
+        for value in node.values():
+            if isinstance(value, dict):
+                children.append(value)
+            elif isinstance(value, list):
+                for v in value:
+                    if isinstance(v, dict):
+                        children.append(v)
+
+        if children:
+            children.reverse()
+            stack += children
@@ -0,0 +1,341 @@
+from collections import deque
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple, cast
+
+from ...rdfterms import RDF_FIRST, RDF_NIL, RDF_REST, RDF_TYPE
+from ..base import JsonMap, JsonObject, is_blank, node_equals
+from ..flattening import ValueIndex
+from ..keys import DEFAULT, GRAPH, ID, LIST, TYPE
+from ..rdf import (COMPOUND_LITERAL, RdfQuad, is_well_formed_list,
+                   to_jsonld_object)
+
+NodeKey = Tuple[str, str]
+
+
+class _Group:
+    key: NodeKey
+    node: JsonMap
+    value_index: ValueIndex
+
+    def __init__(self, key: NodeKey):
+        self.key = key
+        self.node = {ID: key[1]}
+        self.value_index = ValueIndex()
+
+
+class _Held:
+    key: NodeKey
+    node: JsonMap
+    expires: int
+    awaiting: Set[NodeKey]
+
+    def __init__(self, key: NodeKey, node: JsonMap, expires: int):
+        self.key = key
+        self.node = node
+        self.expires = expires
+        self.awaiting = set()
+
+
+class FromRdfStream:
+    """
+    Converts quads to JSON-LD node objects, one subject at a time. A node is
+    yielded as soon as the quads for its subject end, provided that the quads
+    are grouped by subject (otherwise a subject is yielded once for each group
+    of its quads). Groups of blank node subjects may be interleaved with those
+    of the last preceding IRI subject. Nodes in named graphs are wrapped in a
+    graph object with that node as its only `@graph` member.
+
+    Blank nodes making up well-formed lists are held back until the list is
+    referenced, and nodes referring to a list are held back until that list is
+    complete. Anything still held back after `window` subject groups is
+    yielded as is (i.e. with its lists in rdf:first/rdf:rest form). A list is
+    folded into the first node referring to it; if it is referenced again
+    (within `window` subject groups), its nodes are also yielded in that
+    form, for the other references.
+
+    The number of held back nodes is tracked in `held` and `max_held`.
+
+    >>> from ..rdf import RdfTriple
+    >>> nil = 'http://www.w3.org/1999/02/22-rdf-syntax-ns#nil'
+    >>> quads = [RdfQuad(RdfTriple(s, p, o), None) for s, p, o in [
+    ...     ('urn:x:1', 'urn:x:p', '_:l1'),
+    ...     ('_:l1', RDF_FIRST, 'urn:x:a'),
+    ...     ('_:l1', RDF_REST, '_:l2'),
+    ...     ('_:l2', RDF_FIRST, 'urn:x:b'),
+    ...     ('_:l2', RDF_REST, nil),
+    ...     ('urn:x:2', 'urn:x:p', 'urn:x:1'),
+    ... ]]
+    >>> nodes = to_jsonld_stream(quads)
+    >>> for node in nodes: print(node)
+    {'@id': 'urn:x:1', 'urn:x:p': [{'@list': [{'@id': 'urn:x:a'}, {'@id': 'urn:x:b'}]}]}
+    {'@id': 'urn:x:2', 'urn:x:p': [{'@id': 'urn:x:1'}]}
+    >>> nodes.max_held
+    2
+    """
+
+    def __init__(
+        self,
+        quads: Iterable[RdfQuad],
+        rdf_direction: Optional[str] = None,
+        use_native_types=False,
+        use_rdf_type=False,
+        window: int = 10000,
+    ):
+        if rdf_direction == COMPOUND_LITERAL:
+            raise ValueError(f'Unsupported rdf_direction: {rdf_direction}')
+        self.quads = quads
+        self.rdf_direction = rdf_direction
+        self.use_native_types = use_native_types
+        self.use_rdf_type = use_rdf_type
+        self.window = window
+
+        self.held = 0
+        self.max_held = 0
+
+        self._groups = 0
+        self._lists: Dict[NodeKey, Tuple[JsonMap, int]] = {}
+        self._folded: Dict[NodeKey, Tuple[List[Tuple[NodeKey, JsonMap]], int]] = {}
+        self._waiting: Dict[int, _Held] = {}
+        self._awaited: Dict[NodeKey, Set[int]] = {}
+        self._next_held_id = 0
+        self._recent: Deque[NodeKey] = deque(maxlen=window)
+        self._recent_set: Set[NodeKey] = set()
+
+    def __iter__(self) -> Iterator[JsonMap]:
+        current: Optional[_Group] = None
+        resumable: Optional[_Group] = None
+
+        for quad in self.quads:
+            graph_name = DEFAULT if quad.graph_name is None else quad.graph_name
+            key = (graph_name, quad.triple.subject)
+
+            if current is None or key != current.key:
+                if resumable is not None and key == resumable.key:
+                    assert current is not None
+                    yield from self._finish(current)
+                    current, resumable = resumable, None
+                else:
+                    if current is not None:
+                        if not is_blank(key[1]):
+                            yield from self._finish(current)
+                            if resumable is not None:
+                                yield from self._finish(resumable)
+                                resumable = None
+                        elif is_blank(current.key[1]):
+                            yield from self._finish(current)
+                        else:
+                            resumable = current
+                    current = _Group(key)
+
+            self._add(current, quad)
+
+        if current is not None:
+            yield from self._finish(current)
+        if resumable is not None:
+            yield from self._finish(resumable)
+
+        yield from self._flush()
+
+    def _add(self, group: _Group, quad: RdfQuad):
+        node = group.node
+        value_index = group.value_index
+        triple = quad.triple
+        if (
+            triple.predicate == RDF_TYPE
+            and not self.use_rdf_type
+            and isinstance(triple.object, str)
+        ):
+            types: List = cast(List, node.setdefault(TYPE, []))
+            if triple.object not in types:
+                types.append(triple.object)
+            return
+
+        value = to_jsonld_object(
+            triple.object, self.rdf_direction, self.use_native_types
+        )
+        values: List[JsonObject] = cast(List, node.setdefault(triple.predicate, []))
+        candidates = value_index.candidates(
+            DEFAULT, triple.subject, triple.predicate, values, value
+        )
+        if any(node_equals(v, value) for v in candidates):
+            return
+        value_index.append(DEFAULT, triple.subject, triple.predicate, values, value)
+
+    def _finish(self, group: _Group) -> Iterator[JsonMap]:
+        key = group.key
+        node = group.node
+        self._groups += 1
+
+        if is_well_formed_list(node):
+            self._lists[key] = (node, self._groups + self.window)
+            self._count_held(1)
+        else:
+            self._remember(key)
+            yield from self._resolve(_Held(key, node, self._groups + self.window))
+
+        for held_id in sorted(self._awaited.get(key, ())):
+            yield from self._resolve(self._unhold(held_id))
+
+        yield from self._expire()
+
+    def _resolve(self, held: _Held) -> Iterator[JsonMap]:
+        graph_name = held.key[0]
+        held.awaiting = set()
+        released: List[Tuple[NodeKey, JsonMap]] = []
+
+        values: List[JsonMap] = []
+        for prop, prop_values in held.node.items():
+            if prop != ID and prop != TYPE:
+                values += cast(List[JsonMap], prop_values)
+
+        while values:
+            value = values.pop()
+            ref = value.get(ID)
+            if ref == RDF_NIL:
+                del value[ID]
+                value[LIST] = []
+            elif isinstance(ref, str) and is_blank(ref):
+                awaiting = self._fold(graph_name, value, released)
+                if awaiting is not None:
+                    held.awaiting.add(awaiting)
+            if LIST in value:
+                values += cast(List[JsonMap], value[LIST])
+
+        for key, node in released:
+            yield from self._resolve(_Held(key, node, self._groups + self.window))
+
+        if not held.awaiting or held.expires <= self._groups:
+            yield self._wrap(graph_name, held.node)
+            return
+
+        held_id = self._next_held_id
+        self._next_held_id += 1
+        self._waiting[held_id] = held
+        self._count_held(1)
+        for key in held.awaiting:
+            self._awaited.setdefault(key, set()).add(held_id)
+
+    def _fold(
+        self,
+        graph_name: str,
+        head: JsonMap,
+        released: List[Tuple[NodeKey, JsonMap]],
+    ) -> Optional[NodeKey]:
+        chain: Dict[NodeKey, JsonMap] = {}
+        ref: object = head[ID]
+
+        while isinstance(ref, str):
+            key = (graph_name, ref)
+            if key in self._folded:
+                self._unfold(key, released)
+                break
+            if key not in self._lists:
+                if is_blank(ref) and key not in self._recent_set:
+                    return key
+                break
+            if key in chain:
+                break
+            list_node = self._lists[key][0]
+            chain[key] = list_node
+            ref = cast(List[JsonMap], list_node[RDF_REST])[0].get(ID)
+            if ref == RDF_NIL:
+                folded = list(chain.items())
+                expires = self._groups + self.window
+                for k in chain:
+                    del self._lists[k]
+                    self._folded[k] = (folded, expires)
+                self._count_held(-len(chain))
+                del head[ID]
+                head[LIST] = [cast(List, node[RDF_FIRST])[0] for node in chain.values()]
+                return None
+
+        for key, node in chain.items():
+            del self._lists[key]
+            self._remember(key)
+            released.append((key, node))
+        self._count_held(-len(chain))
+        return None
+
+    def _unfold(self, key: NodeKey, released: List[Tuple[NodeKey, JsonMap]]):
+        # A folded list is referenced again: release its nodes as they are.
+        chain: List[Tuple[NodeKey, JsonMap]] = self._folded[key][0]
+        for k, node in chain:
+            del self._folded[k]
+            self._remember(k)
+            released.append((k, node))
+
+    def _expire(self) -> Iterator[JsonMap]:
+        while self._lists:
+            key, (node, expires) = next(iter(self._lists.items()))
+            if expires > self._groups:
+                break
+            yield from self._release_list(key, node)
+
+        while self._folded:
+            key, (chain, expires) = next(iter(self._folded.items()))
+            if expires > self._groups:
+                break
+            del self._folded[key]
+
+        while self._waiting:
+            held_id, held = next(iter(self._waiting.items()))
+            if held.expires > self._groups:
+                break
+            yield from self._resolve(self._unhold(held_id))
+
+    def _flush(self) -> Iterator[JsonMap]:
+        while self._waiting:
+            held = self._unhold(next(iter(self._waiting)))
+            held.expires = self._groups
+            yield from self._resolve(held)
+
+        while self._lists:
+            key, (node, expires) = next(iter(self._lists.items()))
+            yield from self._release_list(key, node)
+
+    def _release_list(self, key: NodeKey, node: JsonMap) -> Iterator[JsonMap]:
+        del self._lists[key]
+        self._count_held(-1)
+        self._remember(key)
+        yield from self._resolve(_Held(key, node, self._groups))
+
+    def _unhold(self, held_id: int) -> _Held:
+        held = self._waiting.pop(held_id)
+        self._count_held(-1)
+        for key in held.awaiting:
+            awaited = self._awaited[key]
+            awaited.discard(held_id)
+            if not awaited:
+                del self._awaited[key]
+        return held
+
+    def _remember(self, key: NodeKey):
+        if len(self._recent) == self._recent.maxlen:
+            self._recent_set.discard(self._recent[0])
+        self._recent.append(key)
+        self._recent_set.add(key)
+
+    def _count_held(self, delta: int):
+        self.held += delta
+        if self.held > self.max_held:
+            self.max_held = self.held
+
+    def _wrap(self, graph_name: str, node: JsonMap) -> JsonMap:
+        if graph_name == DEFAULT:
+            return node
+        return {ID: graph_name, GRAPH: [node]}
+
+
+def to_jsonld_stream(
+    quads: Iterable[RdfQuad],
+    rdf_direction: Optional[str] = None,
+    use_native_types=False,
+    use_rdf_type=False,
+    window: int = 10000,
+) -> FromRdfStream:
+    """
+    A streaming variant of `to_jsonld`, for quads grouped by subject. See
+    `FromRdfStream`.
+    """
+    return FromRdfStream(
+        quads, rdf_direction, use_native_types, use_rdf_type, window
+    )
@@ -1,30 +1,108 @@
-from typing import Optional, Tuple, Dict, List, Union, cast
+from typing import Optional, Tuple, Dict, List, Set, Union, cast
 from ..keys import ID, GRAPH, REVERSE
 from ..base import JsonMap, as_list
 
 
-def make_index(graph: List[JsonMap], add_reverses=True) -> Dict[str, JsonMap]:
-    index: Dict[str, JsonMap] = {}
+class GraphIndex:
+    """
+    An index of nodes by @id, which can be updated as nodes are added or
+    removed.
+
+    If reverses are added, each node linked to gets an @reverse map of the
+    nodes linking to it. Nodes which are linked to but not described are
+    indexed as nodes with only an @id and an @reverse. These reverse links
+    are kept in step as nodes are added, replaced and removed.
+
+    >>> index = GraphIndex([{'@id': 'a', 'rel': {'@id': 'b'}}])
+    >>> index.get('b')
+    {'@id': 'b', '@reverse': {'rel': [{'@id': 'a'}]}}
+    >>> index.add({'@id': 'b', 'name': 'B'})
+    >>> index.get('b')
+    {'@id': 'b', 'name': 'B', '@reverse': {'rel': [{'@id': 'a'}]}}
+    >>> index.remove('a')['@id']
+    'a'
+    >>> index.get('b')
+    {'@id': 'b', 'name': 'B'}
+    """
+
+    nodes: Dict[str, JsonMap]
+    add_reverses: bool
+    _undescribed: Set[str]
+    _reverse_ids: Dict[str, Dict[str, Set[str]]]
+
+    def __init__(self, graph: Optional[List[JsonMap]] = None, add_reverses=True):
+        self.nodes = {}
+        self.add_reverses = add_reverses
+        self._undescribed = set()
+        self._reverse_ids = {}
+
+        if graph is not None:
+            for item in graph:
+                id: Optional[str] = cast(Optional[str], item.get(ID))
+                if isinstance(id, str):
+                    self.nodes[id] = item
+
+        if add_reverses:
+            for item in list(self.nodes.values()):
+                self._link(item)
+
+    def get(self, id: str) -> Optional[JsonMap]:
+        return self.nodes.get(id)
+
+    def add(self, node: JsonMap):
+        """
+        Add a node to the index, replacing any previous node with the same
+        @id (but keeping the links to it from other nodes).
+        """
+        id: Optional[str] = cast(Optional[str], node.get(ID))
+        if not isinstance(id, str):
+            return
 
-    for item in graph:
-        id: Optional[str] = cast(Optional[str], item.get(ID))
-        if isinstance(id, str):
-            index[id] = item
+        previous: Optional[JsonMap] = self.nodes.get(id)
+        if previous is not None and self.add_reverses:
+            if id in self._undescribed:
+                self._undescribed.remove(id)
+            else:
+                self._unlink(previous)
+            if id in self._reverse_ids:
+                del self._reverse_ids[id]
 
-    if add_reverses:
-        _index_reverses(index)
+        self.nodes[id] = node
 
-    return index
+        if self.add_reverses:
+            if previous is not None:
+                self._relink(id, previous, node)
+            self._link(node)
 
+    def remove(self, id: str) -> Optional[JsonMap]:
+        """
+        Remove the node with the given @id from the index, and return it. If
+        other nodes still link to it, it is kept as an undescribed node.
+        """
+        node: Optional[JsonMap] = self.nodes.get(id)
+        if node is None or id in self._undescribed:
+            return None
 
-def _index_reverses(index: Dict[str, JsonMap]):
-    undescribed: Dict[str, JsonMap] = {}
+        del self.nodes[id]
 
-    for item in index.values():
-        if ID not in item:
-            continue
+        if self.add_reverses:
+            self._unlink(node)
+            if id in self._reverse_ids:
+                del self._reverse_ids[id]
 
-        for link in list(item.keys()):
+            undescribed: JsonMap = {ID: id}
+            self._relink(id, node, undescribed)
+            if REVERSE in undescribed:
+                self.nodes[id] = undescribed
+                self._undescribed.add(id)
+
+        return node
+
+    def _link(self, item: JsonMap):
+        item_id: str = cast(str, item[ID])
+
+        links: List[str] = list(item.keys())
+        for link in links:
             refs: List = as_list(item[link])
 
             for ref in refs:
@@ -35,17 +113,103 @@ def _index_reverses(index: Dict[str, JsonMap]):
 
                 ref_id: str = ref[ID]
 
-                linked: Optional[Dict] = index.get(ref_id)
+                linked: Optional[JsonMap] = self.nodes.get(ref_id)
+                if linked is None:
+                    linked = {ID: ref_id}
+                    self.nodes[ref_id] = linked
+                    self._undescribed.add(ref_id)
+
+                self._add_reverse(linked, link, item_id)
+
+    def _unlink(self, item: JsonMap):
+        item_id: str = cast(str, item[ID])
+
+        links: List[str] = list(item.keys())
+        for link in links:
+            # (Get, since a link to itself may remove its own reverses.)
+            for ref in as_list(item.get(link)):
+                if not isinstance(ref, Dict) or ID not in ref:
+                    continue
+
+                ref_id: str = ref[ID]
+                linked: Optional[JsonMap] = self.nodes.get(ref_id)
                 if linked is None:
-                    linked = undescribed.get(ref_id)
-                    if linked is None:
-                        linked = {ID: ref_id}
-                        undescribed[ref_id] = linked
+                    continue
+
+                ids: Optional[Set[str]] = self._reverse_ids.get(ref_id, {}).get(link)
+                if ids is None or item_id not in ids:
+                    continue
+                ids.remove(item_id)
+
+                revmap: Dict[str, List[Dict]] = cast(Dict, linked[REVERSE])
+                revs: List[Dict] = [rev for rev in revmap[link] if rev.get(ID) != item_id]
+                if len(revs) > 0:
+                    revmap[link] = revs
+                else:
+                    del revmap[link]
+                    if len(revmap) == 0:
+                        del linked[REVERSE]
+                        if ref_id in self._undescribed:
+                            self._undescribed.remove(ref_id)
+                            del self.nodes[ref_id]
+                            del self._reverse_ids[ref_id]
+
+    def _relink(self, id: str, previous: JsonMap, current: JsonMap):
+        """
+        Add the reverse links of a previous node with the given @id to the
+        node now indexed in its place, for each link which still holds.
+        """
+        revmap: object = previous.get(REVERSE)
+        if not isinstance(revmap, Dict):
+            return
+
+        for link, revs in cast(Dict[str, object], revmap).items():
+            for rev in as_list(revs):
+                if not isinstance(rev, Dict) or ID not in rev:
+                    continue
+
+                referrer_id: str = rev[ID]
+                referrer: Optional[JsonMap] = self.nodes.get(referrer_id)
+                if referrer is None or referrer_id in self._undescribed:
+                    continue
+
+                for ref in as_list(referrer.get(link)):
+                    if isinstance(ref, Dict) and ref.get(ID) == id:
+                        self._add_reverse(current, link, referrer_id)
+                        break
+
+    def _add_reverse(self, linked: JsonMap, link: str, item_id: str):
+        linked_id: str = cast(str, linked[ID])
+
+        revmap: Dict = cast(Dict, linked.setdefault(REVERSE, {}))
+        revs: List[Dict] = revmap.setdefault(link, [])
+
+        links: Optional[Dict[str, Set[str]]] = self._reverse_ids.get(linked_id)
+        if links is None:
+            links = {}
+            self._reverse_ids[linked_id] = links
 
-                revmap: Dict = cast(Dict, linked.setdefault(REVERSE, {}))
+        # Sets of the @ids in each reverse list, checked instead of the lists.
+        ids: Optional[Set[str]] = links.get(link)
+        if ids is None:
+            ids = set()
+            for rev in revs:
+                if ID in rev:
+                    ids.add(rev[ID])
+            links[link] = ids
+
+        if item_id not in ids:
+            ids.add(item_id)
+            revs.append({ID: item_id})
+
+
+def make_index(graph: List[JsonMap], add_reverses=True) -> Dict[str, JsonMap]:
+    """
+    Index the nodes of a graph by @id. (Use make_graph_index to get an index
+    which can be updated as nodes are added or removed.)
+    """
+    return make_graph_index(graph, add_reverses).nodes
 
-                revs: List[Dict] = revmap.setdefault(link, [])
-                if not any(rev[ID] == item[ID] for rev in revs):
-                    revs.append({ID: item[ID]})
 
-    index.update(undescribed)
+def make_graph_index(graph: List[JsonMap], add_reverses=True) -> GraphIndex:
+    return GraphIndex(graph, add_reverses)
@@ -0,0 +1,105 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterable, Iterator, List, Optional
+
+from ..base import JsonMap, JsonObject, as_list
+from ..flattening import (BNodes, NodeMap, ValueIndex, flatten,
+                          flatten_node_map, make_node_map,
+                          merge_partial_node_map)
+from ..keys import DEFAULT
+
+
+class PartitionBNodes(BNodes):
+    """
+    Issues blank node identifiers which are unique to one partition of an
+    input, while labelled blank nodes get the same identifier in every
+    partition (so that their descriptions are merged).
+    """
+
+    def __init__(self, partition: int):
+        super().__init__(f'b{partition}_')
+
+    def make_bnode_id(self, identifier: Optional[str] = None) -> str:
+        if identifier is None:
+            return super().make_bnode_id()
+        return f'_:l_{identifier[2:]}'
+
+
+def flatten_parallel(
+    element: JsonObject,
+    ordered=False,
+    jobs: Optional[int] = None,
+    partition_size: Optional[int] = None,
+) -> List[JsonMap]:
+    """
+    Flatten an expanded document by partitioning its top-level nodes across
+    worker processes. The partial node maps are merged in partition order, so
+    the result only depends on the partitioning. It is the same as that of
+    `flatten`, except for the blank node identifiers.
+
+    >>> doc = [
+    ...     {'@id': 'urn:x:1', 'urn:x:p': [{'@id': '_:a'}, {'urn:x:q': [{'@value': 1}]}]},
+    ...     {'@id': '_:a', 'urn:x:q': [{'@value': 2}]},
+    ...     {'@id': 'urn:x:1', 'urn:x:p': [{'@id': '_:a'}]},
+    ... ]
+    >>> for node in flatten_parallel(doc, jobs=1, partition_size=1): print(node)
+    {'@id': 'urn:x:1', 'urn:x:p': [{'@id': '_:l_a'}, {'@id': '_:b0_0'}]}
+    {'@id': '_:l_a', 'urn:x:q': [{'@value': 2}]}
+    {'@id': '_:b0_0', 'urn:x:q': [{'@value': 1}]}
+    """
+    items: List = as_list(element)
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+
+    if partition_size is None:
+        partition_size = max(1, -(-len(items) // jobs))
+
+    partitions = [
+        items[i : i + partition_size] for i in range(0, len(items), partition_size)
+    ]
+
+    node_map: NodeMap = {DEFAULT: {}}
+    value_index = ValueIndex()
+
+    if jobs == 1 or len(partitions) < 2:
+        for i, partition in enumerate(partitions):
+            merge_partial_node_map(
+                node_map, _make_partial_node_map(partition, i), value_index
+            )
+    else:
+        with ProcessPoolExecutor(jobs) as executor:
+            partials = executor.map(
+                _make_partial_node_map, partitions, range(len(partitions))
+            )
+            for partial in partials:
+                merge_partial_node_map(node_map, partial, value_index)
+
+    return flatten_node_map(node_map, ordered)
+
+
+def flatten_documents(
+    documents: Iterable[JsonObject],
+    ordered=False,
+    jobs: Optional[int] = None,
+    chunksize: int = 1,
+) -> Iterator[List[JsonMap]]:
+    """
+    Flatten each of a batch of expanded documents in a pool of worker
+    processes, yielding the results in input order.
+    """
+    with ProcessPoolExecutor(jobs) as executor:
+        yield from executor.map(
+            _flatten_document, documents, repeat(ordered), chunksize=chunksize
+        )
+
+
+def _make_partial_node_map(items: List, partition: int) -> NodeMap:
+    node_map: NodeMap = {DEFAULT: {}}
+    make_node_map(PartitionBNodes(partition), items, node_map)
+    return node_map
+
+
+def _flatten_document(document: JsonObject, ordered: bool) -> List[JsonMap]:
+    return flatten(document, ordered)
@@ -3,7 +3,7 @@ from ..platform.common import warning
 from .base import (JsonLdError, JsonList, JsonMap, JsonObject, as_list,
                      is_blank, node_equals)
 from .keys import (DEFAULT, GRAPH, ID, INCLUDED, INDEX, KEYWORDS, LIST,
-                   REVERSE, TYPE, VALUE)
+                   NONE, REVERSE, TYPE, VALUE)
 
 
 NodeMap = Dict[str, JsonMap]
@@ -15,21 +15,90 @@ class ConflictingIndexesError(JsonLdError): pass
 class BNodes:
     i: int
     id_map: Dict[str, str]
+    prefix: str
 
-    def __init__(self):
+    def __init__(self, prefix: str = 'b'):
         self.i = 0
         self.id_map = {}
+        self.prefix = prefix
 
     def make_bnode_id(self, identifier: Optional[str] = None) -> str:
         if identifier in self.id_map:
             return self.id_map[identifier]
-        bnode_id: str = f'_:b{str(self.i)}'
+        bnode_id: str = f'_:{self.prefix}{str(self.i)}'
         self.i += 1
         if identifier is not None:
             self.id_map[identifier] = bnode_id
         return bnode_id
 
 
+# NOTE: Not part of the spec. Used to avoid linear scans of existing values
+# when checking for duplicates (which are quadratic for properties with many
+# values). It indexes the values of each (graph, node, property) by their @id
+# and scalar @value (a value without any is always a candidate), and yields
+# the candidates that node_equals needs to check, in either direction.
+class ValueIndex:
+    _graphs: Dict[str, Dict[str, Dict[str, Dict[str, List[JsonObject]]]]]
+
+    def __init__(self):
+        self._graphs = {}
+
+    def candidates(self, graph_name: str, node_id: str, property: str,
+            values: List[JsonObject], value: JsonObject) -> List[JsonObject]:
+        keyed: Dict[str, List[JsonObject]] = self._get_keyed(graph_name, node_id, property, values)
+        keys: List[str] = _value_keys(value)
+        if len(keys) == 0:
+            return values
+        result: List[JsonObject] = keyed.get(NONE, [])
+        for key in keys:
+            if key in keyed:
+                result = result + keyed[key]
+        return result
+
+    def append(self, graph_name: str, node_id: str, property: str,
+            values: List[JsonObject], value: JsonObject):
+        keyed: Dict[str, List[JsonObject]] = self._get_keyed(graph_name, node_id, property, values)
+        values.append(value)
+        _add_keyed(keyed, value)
+
+    def _get_keyed(self, graph_name: str, node_id: str, property: str,
+            values: List[JsonObject]) -> Dict[str, List[JsonObject]]:
+        nodes: Dict[str, Dict[str, Dict[str, List[JsonObject]]]] = self._graphs.setdefault(graph_name, {})
+        properties: Dict[str, Dict[str, List[JsonObject]]] = nodes.setdefault(node_id, {})
+        keyed: Optional[Dict[str, List[JsonObject]]] = properties.get(property)
+        if keyed is None:
+            keyed = {}
+            for v in values:
+                _add_keyed(keyed, v)
+            properties[property] = keyed
+        return keyed
+
+
+def _add_keyed(keyed: Dict[str, List[JsonObject]], value: JsonObject):
+    keys: List[str] = _value_keys(value)
+    if len(keys) == 0:
+        keys.append(NONE)
+    for key in keys:
+        keyed.setdefault(key, []).append(value)
+
+
+def _value_keys(value: JsonObject) -> List[str]:
+    keys: List[str] = []
+    if isinstance(value, Dict):
+        if ID in value:
+            keys.append(f'{ID} {str(value[ID])}')
+        if VALUE in value:
+            v: JsonObject = value[VALUE]
+            if isinstance(v, str):
+                keys.append(f'{VALUE} {v}')
+            elif isinstance(v, bool):
+                keys.append(f'{VALUE}:true' if v else f'{VALUE}:false')
+            elif isinstance(v, (int, float)):
+                # NOTE: 0.0 and -0.0 are equal, but differ as strings.
+                keys.append(f'{VALUE}:0' if v == 0 else f'{VALUE}:{str(v)}')
+    return keys
+
+
 def flatten(element: JsonObject, ordered=False, bnodes: Optional[BNodes] = None) -> List[JsonMap]:
     if bnodes is None:
         bnodes = BNodes()
@@ -38,6 +107,11 @@ def flatten(element: JsonObject, ordered=False, bnodes: Optional[BNodes] = None)
     node_map: NodeMap = {DEFAULT: {}}
     # 2)
     make_node_map(bnodes, element, node_map)
+    # 3) - 7)
+    return flatten_node_map(node_map, ordered)
+
+
+def flatten_node_map(node_map: NodeMap, ordered=False) -> List[JsonMap]:
     # 3)
     default_graph: Dict = node_map[DEFAULT]
     # 4)
@@ -84,15 +158,19 @@ def make_node_map(bnodes: BNodes,
         active_graph: str = DEFAULT,
         active_subject: Optional[Union[str, JsonMap]] = None,
         active_property: Optional[str] = None,
-        list_map: Optional[Dict[str, JsonObject]] = None):
+        list_map: Optional[Dict[str, JsonObject]] = None,
+        value_index: Optional[ValueIndex] = None):
     # TODO: See <https://github.com/w3c/json-ld-api/issues/549> about problems below.
 
+    if value_index is None:
+        value_index = ValueIndex()
+
     # 1)
     if isinstance(in_element, List):
         for item in in_element:
             # 1.1)
             make_node_map(bnodes, item, node_map, active_graph, active_subject,
-                          active_property, list_map)
+                          active_property, list_map, value_index)
         return
 
     # 2)
@@ -130,8 +208,9 @@ def make_node_map(bnodes: BNodes,
             # 4.1.2)
             else:
                 elements: List[JsonObject] = cast(List[JsonObject], subject_node[active_property])
-                if not any(node_equals(element, el) for el in elements):
-                    elements.append(element)
+                if not any(node_equals(element, el) for el in
+                        value_index.candidates(active_graph, cast(str, active_subject), active_property, elements, element)):
+                    value_index.append(active_graph, cast(str, active_subject), active_property, elements, element)
         # 4.2)
         else:
             cast(JsonList, list_map[LIST]).append(element)
@@ -144,10 +223,11 @@ def make_node_map(bnodes: BNodes,
         result: JsonMap = {LIST: []}
         # 5.2)
         make_node_map(bnodes, element[LIST], node_map, active_graph,
-                      active_subject, active_property, result)
+                      active_subject, active_property, result, value_index)
         # 5.3)
         if list_map is None:
-            cast(JsonList, subject_node[active_property]).append(result)
+            value_index.append(active_graph, cast(str, active_subject), active_property,
+                    cast(JsonList, subject_node[active_property]), result)
         # 5.4)
         else:
             cast(JsonList, list_map[LIST]).append(result)
@@ -176,9 +256,10 @@ def make_node_map(bnodes: BNodes,
                 node[active_property] = [active_subject]
             # 6.5.2)
             else:
-                subjects: List[JsonMap] = cast(List[JsonMap] , node[active_property])
-                if not any(node_equals(active_subject, subj) for subj in subjects):
-                    subjects.append(active_subject)
+                subjects: List[JsonObject] = cast(List[JsonObject] , node[active_property])
+                if not any(node_equals(active_subject, subj) for subj in
+                        value_index.candidates(active_graph, eid, active_property, subjects, active_subject)):
+                    value_index.append(active_graph, eid, active_property, subjects, active_subject)
 
         # 6.6)
         elif active_property is not None:
@@ -191,9 +272,9 @@ def make_node_map(bnodes: BNodes,
                 if active_property not in subject_node:
                     subject_node[active_property] = [reference]
                 # 6.6.2.2)
-                objects: List[JsonMap] = cast(List[JsonMap], subject_node[active_property])
-                if reference not in objects:
-                    objects.append(reference)
+                objects: List[JsonObject] = cast(List[JsonObject], subject_node[active_property])
+                if reference not in value_index.candidates(active_graph, cast(str, active_subject), active_property, objects, reference):
+                    value_index.append(active_graph, cast(str, active_subject), active_property, objects, reference)
             # 6.6.3)
             else:
                 cast(JsonList, list_map[LIST]).append(reference)
@@ -225,18 +306,20 @@ def make_node_map(bnodes: BNodes,
                 for value in cast(List, values):
                     # 6.9.3.1.1)
                     make_node_map(bnodes, value, node_map, active_graph,
-                                  referenced_node, property)
+                                  referenced_node, property, None, value_index)
             # 6.9.4)
             del element[REVERSE]
 
         # 6.10)
         if GRAPH in element:
-            make_node_map(bnodes, element[GRAPH], node_map, eid)
+            make_node_map(bnodes, element[GRAPH], node_map, eid,
+                          None, None, None, value_index)
             del element[GRAPH]
 
         # 6.11)
         if INCLUDED in element:
-            make_node_map(bnodes, element[INCLUDED], node_map, active_graph)
+            make_node_map(bnodes, element[INCLUDED], node_map, active_graph,
+                          None, None, None, value_index)
             del element[INCLUDED]
 
         # 6.12)
@@ -251,7 +334,8 @@ def make_node_map(bnodes: BNodes,
             if property not in node:
                 node[property] = []
             # 6.12.3)
-            make_node_map(bnodes, evalue, node_map, active_graph, eid, property)
+            make_node_map(bnodes, evalue, node_map, active_graph, eid, property,
+                          None, value_index)
 
 
 def merge_node_maps(node_maps: Dict[str, NodeMap]) -> JsonMap:
@@ -276,3 +360,48 @@ def merge_node_maps(node_maps: Dict[str, NodeMap]) -> JsonMap:
                     existing += cast(List, values)
     # 3)
     return result
+
+
+# NOTE: Not part of the spec. Adds a node map generated from a part of some
+# input to the node map of the whole, combining node descriptions like
+# make_node_map does. Blank node identifiers issued for different parts must
+# not collide (unless they denote the same node).
+def merge_partial_node_map(node_map: NodeMap, partial: NodeMap,
+        value_index: Optional[ValueIndex] = None):
+    if value_index is None:
+        value_index = ValueIndex()
+    for graph_name, partial_graph in partial.items():
+        graph: JsonMap = node_map.setdefault(graph_name, {})
+        for node_id, partial_node in partial_graph.items():
+            if node_id not in graph:
+                graph[node_id] = partial_node
+                continue
+
+            node: JsonMap = cast(JsonMap, graph[node_id])
+            for property, values in cast(JsonMap, partial_node).items():
+                if property == ID:
+                    continue
+                # (See step 6.8 of make_node_map.)
+                if property == INDEX:
+                    if INDEX in node and node[INDEX] != values:
+                        raise ConflictingIndexesError(str(node[INDEX]))
+                    node[INDEX] = values
+                    continue
+
+                if property not in node:
+                    node[property] = values
+                    continue
+
+                existing: List[JsonObject] = cast(List[JsonObject], node[property])
+                for value in cast(List[JsonObject], values):
+                    # (See step 6.7 of make_node_map.)
+                    if property == TYPE:
+                        if value not in existing:
+                            existing.append(value)
+                    # (See step 5.3 of make_node_map.)
+                    elif isinstance(value, Dict) and LIST in value:
+                        value_index.append(graph_name, node_id, property, existing, value)
+                    # (See steps 4.1.2, 6.5.2 and 6.6.2.2 of make_node_map.)
+                    elif not any(node_equals(value, v) for v in
+                            value_index.candidates(graph_name, node_id, property, existing, value)):
+                        value_index.append(graph_name, node_id, property, existing, value)
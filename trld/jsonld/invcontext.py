@@ -1,15 +1,50 @@
 from typing import Optional, Dict, List, cast
+from ..platform.common import json_encode_canonical
 from .base import JsonMap
 from .context import Context, Term
 from .keys import ANY, GRAPH, ID, LANGUAGE, NONE, NULL, REVERSE, TYPE
 
 
+MAX_SHARED_INVERSE_CONTEXTS: int = 256
+
+
 def get_inverse_context(active_context: Context) -> Dict:
     if active_context._inverse_context is None:
-        active_context._inverse_context = create_inverse_context(active_context)
+        # NOTE: Not part of the spec. Structurally identical contexts derived
+        # from the same context (e.g. repeated or type-scoped contexts) share
+        # one inverse context, keyed by a fingerprint of what it is made from.
+        shared: Dict[str, Dict] = active_context._shared_inverse_contexts
+        fingerprint: str = get_context_fingerprint(active_context)
+        inverse_context: Optional[JsonMap] = shared.get(fingerprint)
+        if inverse_context is None:
+            inverse_context = create_inverse_context(active_context)
+            if len(shared) < MAX_SHARED_INVERSE_CONTEXTS:
+                shared[fingerprint] = inverse_context
+        active_context._inverse_context = inverse_context
     return active_context._inverse_context
 
 
+def get_context_fingerprint(active_context: Context) -> str:
+    described: List[object] = [
+        active_context.default_language,
+        active_context.default_base_direction
+    ]
+    for term_key, term_dfn in active_context.terms.items():
+        if term_dfn is None:
+            described.append([term_key])
+        else:
+            described.append([
+                term_key,
+                term_dfn.iri,
+                term_dfn.container,
+                term_dfn.is_reverse_property,
+                term_dfn.type_mapping,
+                term_dfn.language,
+                term_dfn.direction
+            ])
+    return json_encode_canonical(described)
+
+
 def create_inverse_context(active_context: Context) -> JsonMap:
     # 1)
     result: JsonMap = {}
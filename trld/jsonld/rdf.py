@@ -10,7 +10,7 @@ from .base import (JsonMap, JsonObject, as_list, is_blank, is_iri, is_lang_tag,
                    node_equals)
 from .context import InvalidBaseDirectionError
 from .expansion import InvalidLanguageTaggedStringError
-from .flattening import BNodes, NodeMap, make_node_map
+from .flattening import BNodes, NodeMap, ValueIndex, make_node_map
 from .keys import (DEFAULT, DIRECTION, DIRECTIONS, GRAPH, ID, JSON, JSONLD10,
                    JSONLD11, KEYWORDS, LANGUAGE, LIST, TYPE, VALUE)
 
@@ -57,6 +57,11 @@ class RdfGraph:
 NamedGraph = Tuple[Optional[str], RdfGraph]
 
 
+class RdfQuad(NamedTuple):
+    triple: RdfTriple
+    graph_name: Optional[str]
+
+
 class RdfDataset:
     default_graph: RdfGraph
     named_graphs: Dict[str, RdfGraph]
@@ -113,36 +118,121 @@ def jsonld_to_rdf_dataset(node_map: NodeMap, dataset: RdfDataset,
             if not is_iri_or_blank(subject):
                 continue
             # 1.3.2)
-            for property in cast(Iterable[str], sorted(node.keys())):
-                # TODO: isn't this always a list if this is properly expanded
-                # and flattened (as this algoritm implicitly expects..)?
-                values: List[object] = as_list(node[property])
-                # 1.3.2.1)
-                if property == TYPE:
-                    for type in values:
-                        triples.add(RdfTriple(subject, RDF_TYPE, cast(str, type)))
-                # 1.3.2.2)
-                elif property in KEYWORDS:
-                    continue
-                # 1.3.2.3)
-                elif is_blank(property): # TODO: and not options.produce_generalized_rdf
-                    continue
-                # 1.3.2.4)
-                elif not is_iri_or_blank(property):
-                    continue
-                # 1.3.2.5)
-                else:
-                    for item in values:
-                        assert isinstance(item, Dict)
-                        # 1.3.2.5.1)
-                        list_triples: List[RdfTriple] = []
-                        # 1.3.2.5.2)
-                        rdf_object: RdfObject = cast(RdfObject,
-                                object_to_rdf_data(item, list_triples, bnodes, rdf_direction))
-                        list_triples.append(RdfTriple(subject, property, rdf_object))
-                        # 1.3.2.5.3)
-                        for triple in list_triples:
-                            triples.add(triple)
+            node_to_rdf_triples(subject, node, triples, bnodes, rdf_direction)
+
+
+def node_to_rdf_triples(subject: str, node: JsonMap, triples: RdfGraph,
+        bnodes: BNodes, rdf_direction: Optional[str] = None):
+    # 1.3.2)
+    for property in cast(Iterable[str], sorted(node.keys())):
+        # TODO: isn't this always a list if this is properly expanded
+        # and flattened (as this algoritm implicitly expects..)?
+        values: List[object] = as_list(node[property])
+        # 1.3.2.1)
+        if property == TYPE:
+            for type in values:
+                triples.add(RdfTriple(subject, RDF_TYPE, cast(str, type)))
+        # 1.3.2.2)
+        elif property in KEYWORDS:
+            continue
+        # 1.3.2.3)
+        elif is_blank(property): # TODO: and not options.produce_generalized_rdf
+            continue
+        # 1.3.2.4)
+        elif not is_iri_or_blank(property):
+            continue
+        # 1.3.2.5)
+        else:
+            for item in values:
+                assert isinstance(item, Dict)
+                # 1.3.2.5.1)
+                list_triples: List[RdfTriple] = []
+                # 1.3.2.5.2)
+                rdf_object: RdfObject = cast(RdfObject,
+                        object_to_rdf_data(item, list_triples, bnodes, rdf_direction))
+                list_triples.append(RdfTriple(subject, property, rdf_object))
+                # 1.3.2.5.3)
+                for triple in list_triples:
+                    triples.add(triple)
+
+
+# NOTE: Not part of the spec. A streaming variant of to_rdf_dataset, for input
+# which is already a flat list of nodes (e.g. the result of flatten). Every
+# node is turned into quads on its own, without building a node map. Blank
+# node identifiers are relabelled using bnodes (which also issues identifiers
+# for lists), so each batch of nodes written to the same output needs its own
+# BNodes (with a distinct prefix).
+def iter_rdf_quads(nodes: Iterable[JsonMap],
+        bnodes: Optional[BNodes] = None,
+        rdf_direction: Optional[str] = None) -> Iterable[RdfQuad]:
+    return RdfQuads(nodes, bnodes, rdf_direction)
+
+
+class RdfQuads:
+    nodes: Iterable[JsonMap]
+    bnodes: BNodes
+    rdf_direction: Optional[str]
+
+    def __init__(self, nodes: Iterable[JsonMap],
+            bnodes: Optional[BNodes] = None,
+            rdf_direction: Optional[str] = None):
+        self.nodes = nodes
+        self.bnodes = bnodes if bnodes is not None else BNodes()
+        self.rdf_direction = rdf_direction
+
+    def __iter__(self) -> Iterator[RdfQuad]:
+        for node in self.nodes:
+            relabelled: JsonMap = cast(JsonMap,
+                    _relabel_blank_nodes(node, self.bnodes))
+            for quad in _node_to_rdf_quads(relabelled, None,
+                    self.bnodes, self.rdf_direction):
+                yield quad
+
+
+def _node_to_rdf_quads(node: JsonMap, graph_name: Optional[str],
+        bnodes: BNodes, rdf_direction: Optional[str]) -> List[RdfQuad]:
+    quads: List[RdfQuad] = []
+
+    subject: str = cast(str, node[ID]) if ID in node else bnodes.make_bnode_id()
+    if not is_iri_or_blank(subject):
+        return quads
+
+    triples: RdfGraph = RdfGraph()
+    node_to_rdf_triples(subject, node, triples, bnodes, rdf_direction)
+    for triple in triples:
+        quads.append(RdfQuad(triple, graph_name))
+
+    if GRAPH in node:
+        for member in cast(List[JsonMap], as_list(node[GRAPH])):
+            quads += _node_to_rdf_quads(member, subject, bnodes, rdf_direction)
+
+    return quads
+
+
+def _relabel_blank_nodes(obj: JsonObject, bnodes: BNodes) -> JsonObject:
+    if isinstance(obj, List):
+        items: List[JsonObject] = []
+        for item in obj:
+            items.append(_relabel_blank_nodes(item, bnodes))
+        return items
+
+    if not isinstance(obj, Dict):
+        return obj
+
+    result: JsonMap = {}
+    for key, value in obj.items():
+        if key == ID and isinstance(value, str) and is_blank(value):
+            result[key] = bnodes.make_bnode_id(value)
+        elif key == TYPE and VALUE not in obj:
+            types: List[str] = []
+            for t in cast(List[str], as_list(value)):
+                types.append(bnodes.make_bnode_id(t) if is_blank(t) else t)
+            result[key] = types
+        elif key == VALUE:
+            result[key] = value
+        else:
+            result[key] = _relabel_blank_nodes(value, bnodes)
+    return result
 
 
 def object_to_rdf_data(item: JsonMap, list_triples: List, bnodes: BNodes,
@@ -264,6 +354,8 @@ def to_jsonld(dataset: RdfDataset,
     # 4)
     compound_literal_subjects: Dict[str, Set[str]] = {}
 
+    value_index: ValueIndex = ValueIndex()
+
     # 5)
     for graph_name, graph in dataset:
         # 5.1)
@@ -306,9 +398,10 @@ def to_jsonld(dataset: RdfDataset,
             # 5.7.8)
             # TODO: spec errata; continue instead, to avoid duplicates in 5.7.9
             # (see fromRdf/0022)
-            if any(node_equals(v, value) for v in values):
+            if any(node_equals(v, value) for v in
+                    value_index.candidates(name, triple.subject, triple.predicate, values, value)):
                 continue
-            values.append(value)
+            value_index.append(name, triple.subject, triple.predicate, values, value)
             # 5.7.9)
             if triple.object == RDF_NIL:
                 # 5.7.9.1)
@@ -0,0 +1,164 @@
+import json
+import re
+from typing import Dict, Iterator, Optional, Protocol
+
+from .jsonld.keys import GRAPH
+
+WHITESPACE = ' \t\n\r'
+
+NUMBER_TAIL = re.compile(r'[0-9.eE+-]*\Z')
+
+# An error for a literal or escape cut off at the end of the buffer is
+# reported at its start, at most this far from the end (as for '-Infinit').
+MAX_TRUNCATED_TOKEN = len('-Infinity') - 1
+
+
+class TextSource(Protocol):
+    def read(self, size: int = -1) -> str:
+        ...
+
+
+class JsonGraphReader:
+    """
+    Reads a JSON document incrementally, yielding the members of its top-level
+    `@graph` array (or the items of a top-level array) one at a time. Only the
+    member being read is held in memory (along with a read buffer of at least
+    `chunk_size` characters).
+
+    The entries of a top-level object preceding `@graph` (such as `@context`)
+    are read into `head` before the first member is yielded, and any entries
+    following it are read into `tail`. For a top-level array, `head` is None.
+    For an object without `@graph`, nothing is yielded and `head` holds the
+    whole object. Any other top-level value is rejected.
+
+    >>> from io import StringIO
+    >>> doc = '{"@context": {"@vocab": "urn:x:"}, "@graph": [{"a": 1}, [2, 3], 4]}'
+    >>> reader = JsonGraphReader(StringIO(doc), chunk_size=4)
+    >>> for member in reader: print(member)
+    {'a': 1}
+    [2, 3]
+    4
+    >>> reader.head
+    {'@context': {'@vocab': 'urn:x:'}}
+    >>> reader.tail
+    {}
+    """
+
+    head: Optional[Dict]
+    tail: Dict
+
+    def __init__(self, stream: TextSource, chunk_size: int = 65536):
+        self.head = None
+        self.tail = {}
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self) -> Iterator[object]:
+        c = self._next_char()
+        if c == '[':
+            yield from self._read_items()
+        elif c == '{':
+            yield from self._read_object()
+        else:
+            self._fail('Expecting an object or array')
+
+        if self._next_char() != '':
+            self._fail('Extra data')
+
+    def _read_object(self) -> Iterator[object]:
+        entries: Dict = {}
+        self.head = entries
+        self._pos += 1
+        if self._next_char() == '}':
+            self._pos += 1
+            return
+
+        while True:
+            key = self._read_value()
+            if not isinstance(key, str):
+                self._fail('Expecting property name enclosed in double quotes')
+            if self._next_char() != ':':
+                self._fail("Expecting ':' delimiter")
+            self._pos += 1
+
+            if key == GRAPH and entries is self.head and self._next_char() == '[':
+                yield from self._read_items()
+                entries = self.tail
+            else:
+                entries[key] = self._read_value()
+
+            c = self._next_char()
+            self._pos += 1
+            if c == '}':
+                return
+            if c != ',':
+                self._fail("Expecting ',' delimiter")
+
+    def _read_items(self) -> Iterator[object]:
+        self._pos += 1
+        if self._next_char() == ']':
+            self._pos += 1
+            return
+
+        while True:
+            yield self._read_value()
+
+            c = self._next_char()
+            self._pos += 1
+            if c == ']':
+                return
+            if c != ',':
+                self._fail("Expecting ',' delimiter")
+
+    def _read_value(self) -> object:
+        self._next_char()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                if self._eof or not self._may_be_truncated(e):
+                    raise
+                self._fill()
+                continue
+            # A value followed by nothing but number characters up to the end
+            # of the buffer may be a truncated number.
+            if not self._eof and NUMBER_TAIL.match(self._buffer, end):
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+    def _may_be_truncated(self, error: json.JSONDecodeError) -> bool:
+        # Any other error is raised at once, rather than after reading the
+        # rest of the input.
+        if error.msg.startswith('Unterminated string'):
+            return True
+        return len(self._buffer) - error.pos <= MAX_TRUNCATED_TOKEN
+
+    def _next_char(self) -> str:
+        while True:
+            while self._pos < len(self._buffer):
+                c = self._buffer[self._pos]
+                if c not in WHITESPACE:
+                    return c
+                self._pos += 1
+            if self._eof:
+                return ''
+            self._fill()
+
+    def _fill(self):
+        rest = self._buffer[self._pos:]
+        # Read at least as much as is pending, to keep re-decoding of large
+        # values linear.
+        chunk = self._stream.read(max(self._chunk_size, len(rest)))
+        if not chunk:
+            self._eof = True
+        self._buffer = rest + chunk
+        self._pos = 0
+
+    def _fail(self, msg: str):
+        raise json.JSONDecodeError(msg, self._buffer, self._pos)
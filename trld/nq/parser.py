@@ -1,9 +1,10 @@
-from typing import List, Optional, Iterable, Union, cast
+from typing import List, Optional, Iterable, Iterator, Union, cast
 from ..builtins import Char
 from ..platform.common import json_encode
 from ..platform.io import Input
 from ..jsonld.rdf import (
-        RdfDataset, RdfGraph, RdfTriple, RdfLiteral, RdfObject, to_jsonld)
+        RdfDataset, RdfGraph, RdfQuad, RdfTriple, RdfLiteral, RdfObject,
+        to_jsonld)
 
 # TODO: Rewrite more based on trig.parser and its nested state handling
 # Should basically become a ReadCompound subclass with restrictions on
@@ -30,128 +31,148 @@ READ_ESCAPES = ReadTerm(None)
 
 
 def load(dataset: RdfDataset, inp: Input):
-    state: Union[int, ReadTerm] = READ_STMT
-    prev_state: Union[int, ReadTerm] = -1
-    chars: List[str] = []
-    literal: Optional[str] = None
-    datatype: Optional[str] = None
-    language: Optional[str] = None
-    terms: List[RdfObject] = []
-    passed_dot = False
-
-    for c in cast(Iterable[Char], inp.characters()):
-        if READ_ESCAPES.handle_escape(c):
-            if state is not READ_ESCAPES:
-                READ_ESCAPES.escape_chars = ESC_CHARS if READ_STRING else {}
-                prev_state = state
-            state = READ_ESCAPES
-
-        if state == READ_LITERAL_FINISH:
-            assert literal is not None
-            terms.append(RdfLiteral(literal, datatype, language))
-
-            if passed_dot:
-                handle_statement(dataset, terms)
-                terms = []
-                passed_dot = False
-
-            literal = datatype = language = None
-            state = READ_STMT
-
-        if state == READ_ESCAPES:
-            if len(READ_ESCAPES.collected) == 1:
-                c = READ_ESCAPES.pop()
-                state = prev_state
-            else:
-                continue
-        elif state == READ_STMT:
-            if c.isspace():
-                continue
-            elif c == '<':
-                state = READ_IRI
-                continue
-            elif c == '_':
-                state = READ_BNODE_ID
-            elif c == '"':
-                state = READ_STRING
-                continue
-            elif c == '.':
-                handle_statement(dataset, terms)
-                terms = []
-                continue
-            elif c == '#':
-                state = READ_COMMENT
-                continue
-        elif state == READ_IRI or state == READ_DATATYPE_IRI:
-            if c == '>':
-                s: str = ''.join(chars)
-                if state == READ_IRI:
-                    terms.append(s)
+    for quad in read_quads(inp):
+        add_quad(dataset, quad)
+
+
+def read_quads(inp: Input) -> Iterable[RdfQuad]:
+    return QuadReader(inp)
+
+
+class QuadReader:
+    inp: Input
+
+    def __init__(self, inp: Input):
+        self.inp = inp
+
+    def __iter__(self) -> Iterator[RdfQuad]:
+        inp: Input = self.inp
+        state: Union[int, ReadTerm] = READ_STMT
+        prev_state: Union[int, ReadTerm] = -1
+        chars: List[str] = []
+        literal: Optional[str] = None
+        datatype: Optional[str] = None
+        language: Optional[str] = None
+        terms: List[RdfObject] = []
+        passed_dot = False
+
+        for c in cast(Iterable[Char], inp.characters()):
+            if READ_ESCAPES.handle_escape(c):
+                if state is not READ_ESCAPES:
+                    READ_ESCAPES.escape_chars = ESC_CHARS if READ_STRING else {}
+                    prev_state = state
+                state = READ_ESCAPES
+
+            if state == READ_LITERAL_FINISH:
+                assert literal is not None
+                terms.append(RdfLiteral(literal, datatype, language))
+
+                if passed_dot:
+                    yield to_quad(terms)
+                    terms = []
+                    passed_dot = False
+
+                literal = datatype = language = None
+                state = READ_STMT
+
+            if state == READ_ESCAPES:
+                if len(READ_ESCAPES.collected) == 1:
+                    c = READ_ESCAPES.pop()
+                    state = prev_state
+                else:
+                    continue
+            elif state == READ_STMT:
+                if c.isspace():
+                    continue
+                elif c == '<':
+                    state = READ_IRI
+                    continue
+                elif c == '_':
+                    state = READ_BNODE_ID
+                elif c == '"':
+                    state = READ_STRING
+                    continue
+                elif c == '.':
+                    yield to_quad(terms)
+                    terms = []
+                    continue
+                elif c == '#':
+                    state = READ_COMMENT
+                    continue
+            elif state == READ_IRI or state == READ_DATATYPE_IRI:
+                if c == '>':
+                    s: str = ''.join(chars)
+                    if state == READ_IRI:
+                        terms.append(s)
+                        state = READ_STMT
+                    else:
+                        datatype = s
+                        state = READ_LITERAL_FINISH
+                    chars = []
+                    continue
+            elif state == READ_BNODE_ID:
+                if c.isspace() or c == '.':
+                    terms.append(''.join(chars))
+                    chars = []
                     state = READ_STMT
+                    if c == '.':
+                        yield to_quad(terms)
+                        terms = []
+                    continue
+            elif state == READ_STRING:
+                if c == '"':
+                    literal = ''.join(chars)
+                    chars = []
+                    state = READ_LITERAL_END
+                    continue
+            elif state == READ_LITERAL_END:
+                if c == '@':
+                    state = READ_LANGUAGE
+                    continue
+                elif c == '^':
+                    state = READ_DATATYPE_START
+                    continue
                 else:
-                    datatype = s
                     state = READ_LITERAL_FINISH
-                chars = []
-                continue
-        elif state == READ_BNODE_ID:
-            if c.isspace() or c == '.':
-                terms.append(''.join(chars))
-                chars = []
-                state = READ_STMT
-                if c == '.':
-                    handle_statement(dataset, terms)
-                    terms = []
-                continue
-        elif state == READ_STRING:
-            if c == '"':
-                literal = ''.join(chars)
-                chars = []
-                state = READ_LITERAL_END
-                continue
-        elif state == READ_LITERAL_END:
-            if c == '@':
-                state = READ_LANGUAGE
-                continue
-            elif c == '^':
-                state = READ_DATATYPE_START
-                continue
-            else:
-                state = READ_LITERAL_FINISH
-                if c == '.':
-                    passed_dot = True
-                continue
-        elif state == READ_LANGUAGE:
-            if c.isspace():
-                language = ''.join(chars)
-                chars = []
-                state = READ_LITERAL_FINISH
-                if c == '.':
-                    passed_dot = True
-                continue
-        elif state == READ_DATATYPE_START:
-            if c == '^':
-                state = READ_DATATYPE_NEXT
-                continue
-            else:
-                raise Exception(f'Bad READ_DATATYPE_START char: {c}')
-        elif state == READ_DATATYPE_NEXT:
-            if c == '<':
-                state = READ_DATATYPE_IRI
+                    if c == '.':
+                        passed_dot = True
+                    continue
+            elif state == READ_LANGUAGE:
+                if c.isspace():
+                    language = ''.join(chars)
+                    chars = []
+                    state = READ_LITERAL_FINISH
+                    if c == '.':
+                        passed_dot = True
+                    continue
+            elif state == READ_DATATYPE_START:
+                if c == '^':
+                    state = READ_DATATYPE_NEXT
+                    continue
+                else:
+                    raise Exception(f'Bad READ_DATATYPE_START char: {c}')
+            elif state == READ_DATATYPE_NEXT:
+                if c == '<':
+                    state = READ_DATATYPE_IRI
+                    continue
+                else:
+                    raise Exception(f'Bad READ_DATATYPE_NEXT char: {c}')
+            elif state == READ_COMMENT:
+                if c == '\n':
+                    state = READ_STMT
                 continue
-            else:
-                raise Exception(f'Bad READ_DATATYPE_NEXT char: {c}')
-        elif state == READ_COMMENT:
-            if c == '\n':
-                state = READ_STMT
-            continue
 
-        chars.append(c)
+            chars.append(c)
 
-    if len(chars) != 0 or len(terms) != 0:
-        raise Exception(f'Trailing data: chars={"".join(chars)!r}, terms={terms!r}')
+        if len(chars) != 0 or len(terms) != 0:
+            raise Exception(f'Trailing data: chars={"".join(chars)!r}, terms={terms!r}')
 
 
 def handle_statement(dataset: RdfDataset, terms: List):
+    add_quad(dataset, to_quad(terms))
+
+
+def to_quad(terms: List) -> RdfQuad:
     if len(terms) < 3 or len(terms) > 4:
         raise Exception(f'Invalid NQuads statement {str(terms)}')
 
@@ -160,6 +181,12 @@ def handle_statement(dataset: RdfDataset, terms: List):
     o: RdfObject = terms[2]
     g: Optional[str] = cast(str, terms[3]) if len(terms) == 4 else None
 
+    return RdfQuad(RdfTriple(s, p, o), g)
+
+
+def add_quad(dataset: RdfDataset, quad: RdfQuad):
+    g: Optional[str] = quad.graph_name
+
     graph: RdfGraph
     if g is None:
         graph = dataset.default_graph
@@ -170,7 +197,7 @@ def handle_statement(dataset: RdfDataset, terms: List):
             dataset.named_graphs[g] = RdfGraph()
         graph = dataset.named_graphs[g]
 
-    graph.add(RdfTriple(s, p, o))
+    graph.add(quad.triple)
 
 
 def parse(inp: Input, use_native_types=True) -> object:
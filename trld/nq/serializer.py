@@ -1,8 +1,8 @@
-from typing import Optional
+from typing import Iterable, Optional
 from ..platform.common import escape_codepoints
 from ..platform.io import Output
 from ..jsonld.base import is_blank
-from ..jsonld.rdf import RdfDataset, RdfGraph, RdfLiteral, RdfObject, RdfTriple
+from ..jsonld.rdf import RdfDataset, RdfGraph, RdfLiteral, RdfObject, RdfQuad, RdfTriple
 from ..rdfterms import XSD_STRING
 
 
@@ -18,6 +18,11 @@ def write_graph(graph_name: Optional[str], graph: RdfGraph, out: Output):
         out.writeln(repr_quad(triple, graph_name))
 
 
+def write_quads(quads: Iterable[RdfQuad], out: Output):
+    for quad in quads:
+        out.writeln(repr_quad(quad.triple, quad.graph_name))
+
+
 def repr_quad(triple: RdfTriple, graph_name: Optional[str]) -> str:
     s: str = repr_term(triple.subject)
     p: str = repr_term(triple.predicate)
@@ -1,24 +1,70 @@
-from typing import Callable
+from types import ModuleType
+from typing import IO, Any, Callable, Optional, Union
 import hashlib
+import io
 import json
 import sys
+import time
 import uuid
 from itertools import permutations
 from urllib.parse import urljoin, urlparse
 
+orjson: Optional[ModuleType]
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# The JSON library used by json_decode, json_load, json_encode_bytes and
+# json_dump (a faster one if installed, otherwise the standard library).
+JSON_BACKEND = 'orjson' if orjson is not None else 'json'
+
 
 def hash_hexdigest(algorithm: str, data: str) -> str:
     return hashlib.new(algorithm, data.encode('utf-8')).hexdigest()
 
 
+class Hasher:
+    """
+    An incremental hash of text (encoded as UTF-8), for data too large to
+    pass to hash_hexdigest at once.
+
+    >>> hasher = Hasher('sha256')
+    >>> hasher.update('a')
+    >>> hasher.update('b')
+    >>> hasher.hexdigest() == hash_hexdigest('sha256', 'ab')
+    True
+    """
+
+    def __init__(self, algorithm: str):
+        self._hash = hashlib.new(algorithm)
+
+    def update(self, data: str) -> None:
+        self._hash.update(data.encode('utf-8'))
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
 def escape_codepoints(s: str, needs_esc: Callable[[int], bool]) -> str:
     return ''.join(fr"\u{ord(c):04X}" if needs_esc(ord(c)) else c for c in s)
 
 
-def json_decode(s: str) -> object:
+def json_decode(s: Union[str, bytes]) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            # E.g. integers beyond 64 bits, or NaN (or really invalid JSON,
+            # for which the standard error is raised below).
+            pass
     return json.loads(s)
 
 
+def json_load(fp: IO) -> Any:
+    return json_decode(fp.read())
+
+
 def json_encode(o: object, pretty=False, sort_keys=False) -> str:
     indent = 2 if pretty else None
     ensure_ascii = not pretty
@@ -29,6 +75,51 @@ def json_encode_canonical(o: object) -> str:
     return json.dumps(o, indent=None, separators=(',', ':'), sort_keys=True)
 
 
+def json_encode_bytes(o: object, pretty=False, sort_keys=False, newline=False) -> bytes:
+    """
+    Encode as UTF-8 JSON, either compact or (if pretty) indented by 2 spaces.
+    With sort_keys (and not pretty), this is a canonical form. (Except for the
+    notation of some floats, the output is the same for any JSON_BACKEND.)
+
+    >>> json_encode_bytes({'b': [1, 'å'], 'a': None}, sort_keys=True)
+    b'{"a":null,"b":[1,"\xc3\xa5"]}'
+    """
+    if orjson is not None:
+        option = 0
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        try:
+            return orjson.dumps(o, option=option)
+        except TypeError:
+            # E.g. integers beyond 64 bits, or non-string keys.
+            pass
+
+    s = json.dumps(o,
+            indent=2 if pretty else None,
+            separators=None if pretty else (',', ':'),
+            ensure_ascii=False,
+            sort_keys=sort_keys)
+    if newline:
+        s += '\n'
+    return s.encode('utf-8')
+
+
+def json_dump(o: object, fp: IO, pretty=False, sort_keys=False, newline=False) -> None:
+    """
+    Write o as JSON (see json_encode_bytes) to fp, as bytes if it is a binary
+    stream.
+    """
+    data = json_encode_bytes(o, pretty, sort_keys, newline)
+    if isinstance(fp, (io.RawIOBase, io.BufferedIOBase)):
+        fp.write(data)
+    else:
+        fp.write(data.decode('utf-8'))
+
+
 def resolve_iri(base: str, relative: str) -> str:
     if '//' in relative:
         url = urlparse(relative)
@@ -42,6 +133,10 @@ def resolve_iri(base: str, relative: str) -> str:
     return urljoin(base, relative)
 
 
+def monotonic_time() -> float:
+    return time.monotonic()
+
+
 def uuid4() -> str:
     return str(uuid.uuid4())
 
@@ -1,4 +1,3 @@
-import json
 import sys
 from http.client import HTTPResponse
 from io import StringIO, TextIOWrapper
@@ -10,6 +9,7 @@ from ..jsonld.keys import JSONLD_CONTEXT_RELATION
 from ..jsonld.base import JsonLdError, JsonObject
 from ..mimetypes import (JSONLD_MIME_TYPE, SUFFIX_MIME_TYPE_MAP, get_first_mime_type,
                          guess_mime_type)
+from .common import json_load
 
 ACCEPT_HEADER = 'Accept'
 
@@ -84,13 +84,13 @@ class Input:
 
     def load_json(self) -> JsonObject:
         if self._stream == sys.stdin:
-            return json.load(self._stream)
+            return json_load(self._stream)
         else:
             with self._stream as fp:
-                return json.load(fp)
+                return json_load(fp)
 
-    def read(self) -> str:
-        return self._stream.read()
+    def read(self, size: int = -1) -> str:
+        return self._stream.read(size)
 
     def lines(self) -> Iterator[str]:
         return self._stream
@@ -0,0 +1,264 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .jsonld.base import JsonMap
+from .jsonld.keys import DEFAULT
+from .jsonld.rdf import (RdfDataset, RdfGraph, RdfObject, RdfQuad, RdfTriple,
+                         to_jsonld)
+
+GraphNames = Dict[Optional[str], None]
+
+
+class QuadStore:
+    """
+    An in-memory store of RDF quads, indexed by subject, predicate and object
+    (as SPO, POS and OSP), and by graph. Quads can be matched by any pattern
+    of terms, where None is a wildcard. To match only the default graph, give
+    DEFAULT (`@default`) as graph name (None matches any graph).
+
+    The three term indexes lead to the same set of graph names for each
+    triple, and the graph index holds the triples of each graph in the order
+    they were added. Duplicate quads are ignored.
+
+    >>> store = QuadStore()
+    >>> store.add(RdfTriple('urn:x:a', 'urn:x:p', 'urn:x:b'))
+    True
+    >>> store.add(RdfTriple('urn:x:b', 'urn:x:p', 'urn:x:c'), 'urn:x:g')
+    True
+    >>> [q.triple.subject for q in store.match(object='urn:x:c')]
+    ['urn:x:b']
+    >>> [q.graph_name for q in store.match(predicate='urn:x:p')]
+    [None, 'urn:x:g']
+    >>> store.count(graph_name=DEFAULT)
+    1
+    """
+
+    _spo: Dict[str, Dict[str, Dict[RdfObject, GraphNames]]]
+    _pos: Dict[str, Dict[RdfObject, Dict[str, GraphNames]]]
+    _osp: Dict[RdfObject, Dict[str, Dict[str, GraphNames]]]
+    _graphs: Dict[Optional[str], Dict[RdfTriple, None]]
+    _size: int
+
+    def __init__(self, dataset: Optional[RdfDataset] = None):
+        self._spo = {}
+        self._pos = {}
+        self._osp = {}
+        self._graphs = {}
+        self._size = 0
+
+        if dataset is not None:
+            self.load_dataset(dataset)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, quad: RdfQuad) -> bool:
+        triples = self._graphs.get(quad.graph_name)
+        return triples is not None and quad.triple in triples
+
+    def __iter__(self) -> Iterator[RdfQuad]:
+        return self.match()
+
+    def add(self, triple: RdfTriple, graph_name: Optional[str] = None) -> bool:
+        triples = self._graphs.get(graph_name)
+        if triples is None:
+            triples = self._graphs[graph_name] = {}
+        elif triple in triples:
+            return False
+
+        # (As RdfTriple, in case a plain tuple is given.)
+        s, p, o = triple
+        triples[RdfTriple(s, p, o)] = None
+
+        objects = self._spo.setdefault(s, {}).setdefault(p, {})
+        graph_names = objects.get(o)
+        if graph_names is None:
+            graph_names = objects[o] = {}
+            self._pos.setdefault(p, {}).setdefault(o, {})[s] = graph_names
+            self._osp.setdefault(o, {}).setdefault(s, {})[p] = graph_names
+
+        graph_names[graph_name] = None
+        self._size += 1
+
+        return True
+
+    def add_quads(self, quads: Iterable[RdfQuad]) -> int:
+        """
+        Add quads (e.g. as read by `trld.nq.parser.read_quads`), and return
+        the number of them which were not already in the store.
+        """
+        added = 0
+        for quad in quads:
+            if self.add(quad.triple, quad.graph_name):
+                added += 1
+        return added
+
+    def load_dataset(self, dataset: RdfDataset) -> int:
+        added = 0
+        for graph_name, graph in dataset:
+            for triple in graph:
+                if self.add(triple, graph_name):
+                    added += 1
+        return added
+
+    def remove(self, triple: RdfTriple, graph_name: Optional[str] = None) -> bool:
+        triples = self._graphs.get(graph_name)
+        if triples is None or triple not in triples:
+            return False
+
+        del triples[triple]
+        if not triples:
+            del self._graphs[graph_name]
+
+        s, p, o = triple
+        graph_names = self._spo[s][p][o]
+        del graph_names[graph_name]
+        if not graph_names:
+            _prune(self._spo, s, p, o)
+            _prune(self._pos, p, o, s)
+            _prune(self._osp, o, s, p)
+
+        self._size -= 1
+
+        return True
+
+    def match(self,
+            subject: Optional[str] = None,
+            predicate: Optional[str] = None,
+            object: Optional[RdfObject] = None,
+            graph_name: Optional[str] = None) -> Iterator[RdfQuad]:
+        """
+        Yield the quads matching the given terms, using the index keyed by
+        the first of them given (in the order subject, predicate, object).
+        """
+        g: Optional[str] = None if graph_name == DEFAULT else graph_name
+        any_graph = graph_name is None
+
+        if subject is None and predicate is None and object is None:
+            for name, triples in self._graphs.items():
+                if any_graph or name == g:
+                    for triple in triples:
+                        yield RdfQuad(triple, name)
+            return
+
+        for s, p, o, graph_names in self._find(subject, predicate, object):
+            if any_graph:
+                for name in graph_names:
+                    yield RdfQuad(RdfTriple(s, p, o), name)
+            elif g in graph_names:
+                yield RdfQuad(RdfTriple(s, p, o), g)
+
+    def count(self,
+            subject: Optional[str] = None,
+            predicate: Optional[str] = None,
+            object: Optional[RdfObject] = None,
+            graph_name: Optional[str] = None) -> int:
+        if subject is None and predicate is None and object is None:
+            if graph_name is None:
+                return self._size
+            triples = self._graphs.get(None if graph_name == DEFAULT else graph_name)
+            return 0 if triples is None else len(triples)
+
+        return sum(1 for quad in self.match(subject, predicate, object, graph_name))
+
+    def subjects(self,
+            predicate: Optional[str] = None,
+            object: Optional[RdfObject] = None,
+            graph_name: Optional[str] = None) -> List[str]:
+        """
+        Get the distinct subjects of the matching quads (e.g. those of a
+        given rdf:type).
+        """
+        found: Dict[str, None] = {}
+        for quad in self.match(None, predicate, object, graph_name):
+            found[quad.triple.subject] = None
+        return list(found)
+
+    def objects(self,
+            subject: Optional[str] = None,
+            predicate: Optional[str] = None,
+            graph_name: Optional[str] = None) -> List[RdfObject]:
+        found: Dict[RdfObject, None] = {}
+        for quad in self.match(subject, predicate, None, graph_name):
+            found[quad.triple.object] = None
+        return list(found)
+
+    def graph_names(self) -> List[str]:
+        return [name for name in self._graphs if name is not None]
+
+    def index_sizes(self) -> Dict[str, int]:
+        """
+        Get the number of keys held in each index, at all of its levels (e.g.
+        for SPO: the distinct subjects, subject-predicate pairs and triples).
+        For the graph index, this is the graphs plus the triples in each.
+        """
+        return {
+            'spo': _count_keys(self._spo),
+            'pos': _count_keys(self._pos),
+            'osp': _count_keys(self._osp),
+            'graph': len(self._graphs) + sum(len(triples) for triples in self._graphs.values()),
+        }
+
+    def to_dataset(self) -> RdfDataset:
+        dataset = RdfDataset()
+        for name, triples in self._graphs.items():
+            graph: RdfGraph
+            if name is None:
+                graph = dataset.default_graph
+            else:
+                graph = RdfGraph()
+                dataset.add(name, graph)
+            for triple in triples:
+                graph.add(triple)
+        return dataset
+
+    def to_jsonld(self, ordered=False, use_native_types=False, use_rdf_type=False) -> List[JsonMap]:
+        return to_jsonld(self.to_dataset(), ordered=ordered,
+                use_native_types=use_native_types, use_rdf_type=use_rdf_type)
+
+    def _find(self,
+            subject: Optional[str],
+            predicate: Optional[str],
+            object: Optional[RdfObject]) -> Iterator[tuple]:
+        if subject is not None:
+            for p, objects in _select(self._spo.get(subject), predicate):
+                for o, graph_names in _select(objects, object):
+                    yield subject, p, o, graph_names
+
+        elif predicate is not None:
+            for o, subjects in _select(self._pos.get(predicate), object):
+                for s, graph_names in subjects.items():
+                    yield s, predicate, o, graph_names
+
+        else:
+            assert object is not None
+            for s, predicates in _select(self._osp.get(object), None):
+                for p, graph_names in predicates.items():
+                    yield s, p, object, graph_names
+
+
+def _select(index: Optional[Dict], key) -> Iterable[tuple]:
+    if index is None:
+        return ()
+    if key is None:
+        return index.items()
+    value = index.get(key)
+    return () if value is None else ((key, value),)
+
+
+def _prune(index: Dict, a, b, c) -> None:
+    level_b = index[a]
+    level_c = level_b[b]
+    del level_c[c]
+    if not level_c:
+        del level_b[b]
+        if not level_b:
+            del index[a]
+
+
+def _count_keys(index: Dict) -> int:
+    count = len(index)
+    for level_b in index.values():
+        count += len(level_b)
+        for level_c in level_b.values():
+            count += len(level_c)
+    return count
@@ -0,0 +1,404 @@
+import sqlite3
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, cast
+
+from .jsonld.base import JsonMap
+from .jsonld.keys import DEFAULT, GRAPH, ID
+from .jsonld.rdf import (RdfDataset, RdfGraph, RdfLiteral, RdfObject, RdfQuad,
+                         RdfTriple, to_jsonld)
+from .platform.io import Output
+
+TermRow = Tuple[str, int, str, str]
+
+IRI_OR_BNODE = 0
+LITERAL = 1
+
+DEFAULT_GRAPH_ID = 0
+
+SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS terms (
+        id INTEGER PRIMARY KEY,
+        value TEXT NOT NULL,
+        kind INTEGER NOT NULL,
+        datatype TEXT NOT NULL,
+        language TEXT NOT NULL,
+        UNIQUE (value, kind, datatype, language)
+    )''',
+    '''CREATE TABLE IF NOT EXISTS quads (
+        s INTEGER NOT NULL,
+        p INTEGER NOT NULL,
+        o INTEGER NOT NULL,
+        g INTEGER NOT NULL,
+        PRIMARY KEY (s, p, o, g)
+    ) WITHOUT ROWID''',
+    'CREATE INDEX IF NOT EXISTS quads_pos ON quads (p, o, s)',
+    'CREATE INDEX IF NOT EXISTS quads_gsp ON quads (g, s, p)',
+]
+
+SELECT_QUADS = '''SELECT
+    ts.value, tp.value, tobj.value, tobj.kind, tobj.datatype, tobj.language, tg.value
+    FROM quads AS q
+    JOIN terms AS ts ON ts.id = q.s
+    JOIN terms AS tp ON tp.id = q.p
+    JOIN terms AS tobj ON tobj.id = q.o
+    LEFT JOIN terms AS tg ON tg.id = q.g'''
+
+
+class SqliteQuadStore:
+    """
+    A quad store kept in an SQLite database (in a file, or in memory), for
+    datasets larger than memory. It is matched like `trld.quadstore.QuadStore`
+    (with None as wildcard, and DEFAULT for the default graph alone).
+
+    Terms are stored once each in a dictionary table, and quads as rows of
+    term ids. The quads are keyed by subject (SPOG), and indexed by predicate
+    (POS) and by graph (GSP). (Matching by object alone scans all quads.)
+
+    Use `load` or `add_quads` to add many quads at once (in batches, within a
+    transaction). Quads are exported (by `write_nquads`, `write_trig` and
+    `iter_nodes`) grouped by graph and subject, without holding them all in
+    memory.
+
+    >>> store = SqliteQuadStore()
+    >>> store.add_quads([
+    ...     RdfQuad(RdfTriple('urn:x:a', 'urn:x:p', RdfLiteral('A', language='en')), None),
+    ...     RdfQuad(RdfTriple('urn:x:a', 'urn:x:p', 'urn:x:b'), 'urn:x:g'),
+    ... ])
+    2
+    >>> [q.graph_name for q in store.match('urn:x:a', graph_name='urn:x:g')]
+    ['urn:x:g']
+    >>> for node in store.iter_nodes(): print(node)
+    {'@id': 'urn:x:a', 'urn:x:p': [{'@language': 'en', '@value': 'A'}]}
+    {'@id': 'urn:x:g', '@graph': [{'@id': 'urn:x:a', 'urn:x:p': [{'@id': 'urn:x:b'}]}]}
+    >>> store.close()
+    """
+
+    path: str
+    batch_size: int
+    cache_size: int
+    _conn: sqlite3.Connection
+    _term_ids: Dict[RdfObject, int]
+
+    def __init__(self, path: str = ':memory:', batch_size: int = 10000, cache_size: int = 100000):
+        self.path = path
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self._conn = sqlite3.connect(path)
+        self._term_ids = {}
+
+        with self._conn:
+            for statement in SCHEMA:
+                self._conn.execute(statement)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> 'SqliteQuadStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute('SELECT COUNT(*) FROM quads').fetchone()[0]
+
+    def __contains__(self, quad: RdfQuad) -> bool:
+        return self.count(*quad.triple, quad.graph_name or DEFAULT) > 0
+
+    def __iter__(self) -> Iterator[RdfQuad]:
+        return self.match()
+
+    def add(self, triple: RdfTriple, graph_name: Optional[str] = None) -> bool:
+        return self.add_quads([RdfQuad(triple, graph_name)]) > 0
+
+    def add_quads(self, quads: Iterable[RdfQuad]) -> int:
+        """
+        Add quads (e.g. as read by `trld.nq.parser.read_quads`) in batches,
+        and return the number of them which were not already in the store.
+        """
+        inserted = 0
+
+        try:
+            with self._conn:
+                batch: List[Tuple[int, int, int, int]] = []
+                for quad in quads:
+                    s, p, o = quad.triple
+                    g = quad.graph_name
+                    batch.append((
+                        self._encode(s),
+                        self._encode(p),
+                        self._encode(o),
+                        DEFAULT_GRAPH_ID if g is None else self._encode(g),
+                    ))
+                    if len(batch) >= self.batch_size:
+                        inserted += self._insert(batch)
+                        batch = []
+
+                if batch:
+                    inserted += self._insert(batch)
+        except BaseException:
+            # Any terms added in the transaction are rolled back.
+            self._term_ids.clear()
+            raise
+
+        return inserted
+
+    def load_dataset(self, dataset: RdfDataset) -> int:
+        return self.add_quads(
+            RdfQuad(triple, graph_name)
+            for graph_name, graph in dataset
+            for triple in graph
+        )
+
+    def load(self, source: Any, fmt: Optional[str] = None) -> int:
+        """
+        Load RDF from a source. N-Triples and N-Quads are streamed into the
+        store as read (keeping their blank node labels). Other formats (e.g.
+        TriG) are parsed, expanded and converted first.
+        """
+        from .api import NT_OR_NQ, open_input, parse_rdf
+
+        inp = open_input(source, fmt)
+
+        if inp.content_type in NT_OR_NQ:
+            from .nq import parser as nq
+
+            with inp:
+                return self.add_quads(nq.read_quads(inp))
+
+        from .jsonld.expansion import expand
+        from .jsonld.rdf import to_rdf_dataset
+
+        data = parse_rdf(inp)
+        return self.load_dataset(to_rdf_dataset(expand(data, inp.document_url or '')))
+
+    def remove(self, triple: RdfTriple, graph_name: Optional[str] = None) -> bool:
+        where = self._where(*triple, graph_name or DEFAULT)
+        if where is None:
+            return False
+
+        clause, params = where
+        with self._conn:
+            cursor = self._conn.execute(f'DELETE FROM quads WHERE {clause}', params)
+
+        return cursor.rowcount > 0
+
+    def match(self,
+            subject: Optional[str] = None,
+            predicate: Optional[str] = None,
+            object: Optional[RdfObject] = None,
+            graph_name: Optional[str] = None) -> Iterator[RdfQuad]:
+        where = self._where(subject, predicate, object, graph_name)
+        if where is None:
+            return iter(())
+
+        clause, params = where
+        return self._query(f'{SELECT_QUADS} WHERE {clause}', params)
+
+    def count(self,
+            subject: Optional[str] = None,
+            predicate: Optional[str] = None,
+            object: Optional[RdfObject] = None,
+            graph_name: Optional[str] = None) -> int:
+        where = self._where(subject, predicate, object, graph_name)
+        if where is None:
+            return 0
+
+        clause, params = where
+        return self._conn.execute(f'SELECT COUNT(*) FROM quads AS q WHERE {clause}', params).fetchone()[0]
+
+    def subjects(self,
+            predicate: Optional[str] = None,
+            object: Optional[RdfObject] = None,
+            graph_name: Optional[str] = None) -> List[str]:
+        where = self._where(None, predicate, object, graph_name)
+        if where is None:
+            return []
+
+        clause, params = where
+        rows = self._conn.execute(
+            f'''SELECT t.value FROM terms AS t WHERE t.id IN
+                (SELECT q.s FROM quads AS q WHERE {clause}) ORDER BY t.id''', params)
+        return [row[0] for row in rows]
+
+    def objects(self,
+            subject: Optional[str] = None,
+            predicate: Optional[str] = None,
+            graph_name: Optional[str] = None) -> List[RdfObject]:
+        where = self._where(subject, predicate, None, graph_name)
+        if where is None:
+            return []
+
+        clause, params = where
+        rows = self._conn.execute(
+            f'''SELECT t.value, t.kind, t.datatype, t.language FROM terms AS t WHERE t.id IN
+                (SELECT q.o FROM quads AS q WHERE {clause}) ORDER BY t.id''', params)
+        return [_decode(*row) for row in rows]
+
+    def graph_names(self) -> List[str]:
+        rows = self._conn.execute(
+            '''SELECT t.value FROM terms AS t WHERE t.id IN
+               (SELECT DISTINCT g FROM quads WHERE g != ?) ORDER BY t.id''',
+            (DEFAULT_GRAPH_ID,))
+        return [row[0] for row in rows]
+
+    def iter_quads(self) -> Iterator[RdfQuad]:
+        """
+        Yield all quads, grouped by graph (the default graph first) and by
+        subject (in the order the terms were first added).
+        """
+        return self._query(f'{SELECT_QUADS} ORDER BY q.g, q.s', ())
+
+    def iter_nodes(self, use_native_types=False, use_rdf_type=False, window: int = 10000) -> Iterator[JsonMap]:
+        """
+        Yield a JSON-LD node object for each subject, as given by
+        `trld.jsonld.extras.fromrdf.to_jsonld_stream`. (Nodes in named graphs
+        are wrapped in a graph object.) These can be written as NDJSON, or
+        framed one at a time (see `frameblanks_records`).
+        """
+        from .jsonld.extras.fromrdf import to_jsonld_stream
+
+        return iter(to_jsonld_stream(self.iter_quads(),
+                use_native_types=use_native_types, use_rdf_type=use_rdf_type, window=window))
+
+    def write_nquads(self, out: Output) -> None:
+        from .nq import serializer as nq
+
+        nq.write_quads(self.iter_quads(), out)
+
+    def write_trig(self, out: Output, chunk_size: int = 1000) -> None:
+        """
+        Write the quads as TriG, one node at a time. The nodes of a named
+        graph are written in blocks of at most `chunk_size` nodes (repeating
+        the graph name).
+        """
+        from .trig.serializer import SerializerState, Settings
+
+        state = SerializerState(out, Settings(), None)
+
+        graph_name: Optional[str] = None
+        chunk: List[JsonMap] = []
+
+        def write_chunk():
+            if graph_name is not None and chunk:
+                state.write_object({ID: graph_name, GRAPH: chunk})
+
+        for node in self.iter_nodes(use_native_types=True):
+            node_graph: Optional[str] = None
+            if GRAPH in node:
+                node_graph = cast(str, node[ID])
+                node = cast(JsonMap, cast(List, node[GRAPH])[0])
+
+            if node_graph is None:
+                state.write_object(node)
+                continue
+
+            if node_graph != graph_name or len(chunk) >= chunk_size:
+                write_chunk()
+                graph_name = node_graph
+                chunk = []
+
+            chunk.append(node)
+
+        write_chunk()
+
+    def to_dataset(self) -> RdfDataset:
+        dataset = RdfDataset()
+        graphs: Dict[str, RdfGraph] = {}
+        for quad in self.iter_quads():
+            graph: RdfGraph
+            if quad.graph_name is None:
+                graph = dataset.default_graph
+            else:
+                if quad.graph_name not in graphs:
+                    graphs[quad.graph_name] = RdfGraph()
+                    dataset.add(quad.graph_name, graphs[quad.graph_name])
+                graph = graphs[quad.graph_name]
+            graph.add(quad.triple)
+        return dataset
+
+    def to_jsonld(self, ordered=False, use_native_types=False, use_rdf_type=False) -> List[JsonMap]:
+        return to_jsonld(self.to_dataset(), ordered=ordered,
+                use_native_types=use_native_types, use_rdf_type=use_rdf_type)
+
+    def _insert(self, batch: List[Tuple[int, int, int, int]]) -> int:
+        before = self._conn.total_changes
+        self._conn.executemany('INSERT OR IGNORE INTO quads VALUES (?, ?, ?, ?)', batch)
+        return self._conn.total_changes - before
+
+    def _encode(self, term: RdfObject) -> int:
+        term_id = self._term_ids.get(term)
+        if term_id is not None:
+            return term_id
+
+        # Insert first, and only look the term up if it was already there.
+        row = _term_row(term)
+        cursor = self._conn.execute(
+            'INSERT OR IGNORE INTO terms (value, kind, datatype, language) VALUES (?, ?, ?, ?)', row)
+        if cursor.rowcount == 1:
+            term_id = cursor.lastrowid
+        else:
+            term_id = self._lookup(row)
+        assert term_id is not None
+
+        # Bounded, to keep memory use in check when loading huge datasets.
+        if len(self._term_ids) >= self.cache_size:
+            self._term_ids.clear()
+        self._term_ids[term] = term_id
+
+        return term_id
+
+    def _lookup(self, row: TermRow) -> Optional[int]:
+        found = self._conn.execute(
+            'SELECT id FROM terms WHERE value = ? AND kind = ? AND datatype = ? AND language = ?',
+            row).fetchone()
+        return None if found is None else found[0]
+
+    def _where(self,
+            subject: Optional[RdfObject],
+            predicate: Optional[RdfObject],
+            object: Optional[RdfObject],
+            graph_name: Optional[str]) -> Optional[Tuple[str, List[int]]]:
+        """
+        Get an SQL condition (and its parameters) for the given pattern, or
+        None if any given term is not in the store (so nothing can match).
+        """
+        conditions: List[str] = []
+        params: List[int] = []
+
+        for column, term in (('s', subject), ('p', predicate), ('o', object)):
+            if term is None:
+                continue
+            term_id = self._term_ids.get(term)
+            if term_id is None:
+                term_id = self._lookup(_term_row(term))
+                if term_id is None:
+                    return None
+            conditions.append(f'{column} = ?')
+            params.append(term_id)
+
+        if graph_name is not None:
+            graph_id: Optional[int] = DEFAULT_GRAPH_ID
+            if graph_name != DEFAULT:
+                graph_id = self._lookup(_term_row(graph_name))
+            if graph_id is None:
+                return None
+            conditions.append('g = ?')
+            params.append(graph_id)
+
+        return ' AND '.join(conditions) if conditions else '1', params
+
+    def _query(self, sql: str, params: Iterable) -> Iterator[RdfQuad]:
+        for s, p, value, kind, datatype, language, g in self._conn.execute(sql, tuple(params)):
+            yield RdfQuad(RdfTriple(s, p, _decode(value, kind, datatype, language)), g)
+
+
+def _term_row(term: RdfObject) -> TermRow:
+    if isinstance(term, RdfLiteral):
+        return (term.value, LITERAL, term.datatype or '', term.language or '')
+    return (term, IRI_OR_BNODE, '', '')
+
+
+def _decode(value: str, kind: int, datatype: str, language: str) -> RdfObject:
+    if kind == LITERAL:
+        return RdfLiteral(value, datatype or None, language or None)
+    return value
@@ -1,13 +1,15 @@
 import json
 import os
+import sys
 
 from ..jsonld.keys import CONTEXT, VOCAB
 from ..jsonld.expansion import expand
 from ..jsonld.compaction import compact
-from ..api import parse_rdf, serialize_rdf
+from ..api import NDJSON_FORMATS, parse_rdf, serialize_rdf
 
-from .mapmaker import make_target_map
+from .cache import TargetMapCache
 from .mapper import map_to
+from .stream import map_record_lines
 
 
 def run(args):
@@ -23,14 +25,14 @@ def run(args):
     else:
         target = {"@context": {"@vocab": targetref}}
 
+    target_maps = TargetMapCache(args.cache_dir)
+
     def _get_target_map():
-        vocab_data = []
-        for vocab_id in vocab_refs:
-            vocab = parse_rdf(vocab_id)
-            vocab_data += expand(vocab, vocab_id, context_ref)
-        return make_target_map(vocab_data, target)
+        return target_maps.get(vocab_refs, target, context_ref)
 
-    if not sources:
+    if args.input_format in NDJSON_FORMATS:
+        _map_record_stream(args, _get_target_map(), target)
+    elif not sources:
         target_map = _get_target_map()
         print(json.dumps(target_map, indent=2))
     else:
@@ -39,9 +41,8 @@ def run(args):
         for source in sources:
             indata = parse_rdf(source, args.input_format)
 
-            ctx = None
-            if not vocab_refs and VOCAB in ctx:
-                ctx = indata[CONTEXT]
+            ctx = indata.get(CONTEXT) if isinstance(indata, dict) else None
+            if not vocab_refs and isinstance(ctx, dict) and VOCAB in ctx:
                 vocabref = ctx[VOCAB]
                 vocab_refs = vocabref if isinstance(vocabref, list) else [vocabref]
 
@@ -60,6 +61,23 @@ def run(args):
         serialize_rdf(result, args.output_format)
 
 
+def _map_record_stream(args, target_map, target) -> None:
+    out = sys.stdout.buffer
+    for source in args.source or ['-']:
+        with (sys.stdin if source == '-' else open(source)) as lines:
+            for line in map_record_lines(
+                lines,
+                target_map,
+                target,
+                args.context,
+                args.drop,
+                args.base,
+                jobs=args.jobs,
+            ):
+                out.write(line)
+    out.flush()
+
+
 if __name__ == '__main__':
     import argparse
 
@@ -70,10 +88,17 @@ if __name__ == '__main__':
     argparser.add_argument('-v', '--vocab', help="Source vocabulary (figure out from source if not given)", nargs='+')
     argparser.add_argument('-t', '--target-profile')
     argparser.add_argument('-d', '--drop', action='store_true', help="Drop unmapped terms")
-    argparser.add_argument('-i', '--input-format', help='Set RDF input format')
+    argparser.add_argument('-i', '--input-format',
+                           help='Set RDF input format (ndjson maps each line as a record, to ndjson)')
     argparser.add_argument('-o', '--output-format', help='Set RDF output format')
     argparser.add_argument('-B', '--embed-blanks', action='store_true')
+    argparser.add_argument('-j', '--jobs', type=int, default=1,
+                           help='Map ndjson records in this many worker processes')
+    argparser.add_argument('--cache-dir', default=os.environ.get('TRLD_CACHE_DIR'),
+                           help='Store compiled target maps in this directory (default is $TRLD_CACHE_DIR)')
 
     args = argparser.parse_args()
+    if args.input_format in NDJSON_FORMATS and not args.vocab:
+        argparser.error(f'-v is required with -i {args.input_format}')
 
     run(args)
@@ -0,0 +1,117 @@
+import os
+from io import StringIO
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from ..api import parse_rdf
+from ..jsonld.expansion import expand
+from ..platform.common import (hash_hexdigest, json_dump, json_encode_canonical,
+                               json_load)
+from ..platform.io import ACCEPT_HEADER, Input
+from . import mapmaker
+from .mapmaker import make_target_map
+
+# Target maps made by other versions of the mapmaker are not reused.
+MAPMAKER_HASH = hash_hexdigest('sha256', Path(mapmaker.__file__).read_text('utf-8'))
+
+
+class VocabSource(NamedTuple):
+    ref: str
+    content_type: Optional[str]
+    text: str
+
+
+class TargetMapCache:
+    """
+    Makes target maps (see `make_target_map`) once for each combination of
+    vocabularies, target and context, and keeps them for reuse. If given a
+    directory, they are also stored there as JSON files, named by a hash of
+    the content of these inputs. Later runs (and worker processes) then load
+    a stored target map instead of parsing and expanding the vocabularies.
+    """
+
+    cache_dir: Optional[Path]
+    _by_refs: Dict[str, Dict]
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._by_refs = {}
+
+    def get(
+        self, vocab_refs: List[str], target: object, context_ref: Optional[str] = None
+    ) -> Dict:
+        if not vocab_refs:
+            raise ValueError('No source vocabulary given to make a target map from')
+
+        refs_key = json_encode_canonical([vocab_refs, target, context_ref])
+        target_map = self._by_refs.get(refs_key)
+        if target_map is not None:
+            return target_map
+
+        sources = [_read_source(ref) for ref in vocab_refs]
+
+        path: Optional[Path] = None
+        if self.cache_dir is not None:
+            key = make_content_key(sources, target, context_ref)
+            path = self.cache_dir / f'{key}.json'
+            if path.is_file():
+                with path.open('rb') as fp:
+                    target_map = json_load(fp)
+
+        if target_map is None:
+            target_map = _make_target_map(sources, target, context_ref)
+            if path is not None:
+                _store(path, target_map)
+
+        self._by_refs[refs_key] = target_map
+        return target_map
+
+
+def make_content_key(
+    sources: List[VocabSource], target: object, context_ref: Optional[str] = None
+) -> str:
+    context_hash: Optional[str] = None
+    if context_ref is not None and os.path.isfile(context_ref):
+        context_hash = hash_hexdigest('sha256', Path(context_ref).read_text('utf-8'))
+
+    return hash_hexdigest(
+        'sha256',
+        json_encode_canonical(
+            {
+                'mapmaker': MAPMAKER_HASH,
+                'vocab': [
+                    [src.ref, src.content_type, hash_hexdigest('sha256', src.text)]
+                    for src in sources
+                ],
+                'target': target,
+                'context': [context_ref, context_hash],
+            }
+        ),
+    )
+
+
+def _read_source(ref: str) -> VocabSource:
+    with Input(ref) as inp:
+        return VocabSource(ref, inp.content_type, inp.read())
+
+
+def _make_target_map(
+    sources: List[VocabSource], target: object, context_ref: Optional[str]
+) -> Dict:
+    vocab_data: List = []
+    for src in sources:
+        headers = {ACCEPT_HEADER: src.content_type} if src.content_type else None
+        inp = Input(StringIO(src.text), headers)
+        inp.document_url = src.ref
+        vocab_data += expand(parse_rdf(inp), src.ref, context_ref)
+    return make_target_map(vocab_data, target)
+
+
+def _store(path: Path, target_map: Dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Written in full before being renamed, so that concurrent runs never
+    # read a partial file.
+    tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+    with tmp_path.open('wb') as fp:
+        json_dump(target_map, fp)
+    os.replace(tmp_path, path)
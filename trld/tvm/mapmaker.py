@@ -61,6 +61,341 @@ class BaseRelation(NamedTuple):
     priority: int = -1
 
 
+class ClosureIndex:
+    """
+    Transitive relations between the terms of a vocabulary, computed once for
+    all terms rather than walked anew from each. Each closure is found by one
+    breadth-first search backwards from the terms it leads to (visiting every
+    term at most once, so cycles are harmless), and is then kept for reuse.
+    """
+
+    vocab_index: Dict[str, JsonMap]
+    target: Dict[str, object]
+    _referrers: Dict[str, Dict[str, List[str]]]
+    _leading_to: Dict[str, Dict[str, int]]
+    _target_distances: Dict[str, Dict[str, int]]
+    _first_targets: Dict[str, Dict[str, str]]
+    _targets_above: Dict[str, Dict[str, List[str]]]
+    _acyclic: Dict[str, bool]
+    _tracing_inverse_of_subject: Optional[Dict[str, int]]
+
+    def __init__(self, vocab_index: Dict[str, JsonMap], target: Dict[str, object]):
+        self.vocab_index = vocab_index
+        self.target = target
+        self._referrers = {}
+        self._leading_to = {}
+        self._target_distances = {}
+        self._first_targets = {}
+        self._targets_above = {}
+        self._acyclic = {}
+        self._tracing_inverse_of_subject = None
+
+    def leads_to(self, s: Dict, rel: str, o: str) -> bool:
+        """
+        Equivalent to `leads_to(s, self.vocab_index, rel, o)`, for terms in
+        a flattened vocabulary.
+        """
+        if s.get(ID) == o:
+            return True
+
+        if ID in s and s[ID] in self.vocab_index:
+            key: str = f'{rel} {o}'
+            leading: Optional[Dict[str, int]] = self._leading_to.get(key)
+            if leading is None:
+                leading = self._collect_distances([rel], [o])
+                self._leading_to[key] = leading
+            return s[ID] in leading
+
+        for x in cast(List[Dict], s.get(rel, [])):
+            if self.leads_to(x, rel, o):
+                return True
+
+        return False
+
+    def can_reach_target(self, id: str, rels: List[str]) -> bool:
+        return id in self._get_target_distances(rels)
+
+    def find_first_target(self, ids: List[str], rels: List[str]) -> Optional[str]:
+        """
+        Find the target term which would be found first by a breadth-first
+        search over `rels` from the given terms (in order), stopping at each
+        target term. That is the closest one, and among those at the same
+        distance, the one reached through the earliest references.
+        """
+        distances: Dict[str, int] = self._get_target_distances(rels)
+
+        closest: Optional[str] = None
+        closest_distance: int = -1
+        for id in ids:
+            if id in distances:
+                distance: int = distances[id]
+                if closest is None or distance < closest_distance:
+                    closest = id
+                    closest_distance = distance
+
+        if closest is None:
+            return None
+
+        key: str = ' '.join(rels)
+        first_targets: Optional[Dict[str, str]] = self._first_targets.get(key)
+        if first_targets is None:
+            first_targets = {}
+            self._first_targets[key] = first_targets
+
+        path: List[str] = []
+        current: str = closest
+        while distances[current] > 0 and current not in first_targets:
+            path.append(current)
+            next_distance: int = distances[current] - 1
+            next_ids: List[str] = self._get_refs(current, rels)
+            for ref_id in next_ids:
+                if ref_id in distances and distances[ref_id] == next_distance:
+                    current = ref_id
+                    break
+
+        found: str = first_targets[current] if current in first_targets else current
+        for id in path:
+            first_targets[id] = found
+
+        return found
+
+    def find_targets(self, ids: List[str], rels: List[str]) -> List[str]:
+        """
+        Find the target terms in the order (and as many times) as they would
+        be found by a breadth-first search over `rels` from the given terms,
+        stopping at each target term.
+        """
+        found: List[str] = []
+        expandable: List[str] = []
+        for id in ids:
+            if _get_target_priority(self.target, id):
+                found.append(id)
+            elif id not in expandable and self.can_reach_target(id, rels):
+                expandable.append(id)
+
+        return found + self._find_targets_above(expandable, rels)
+
+    def _find_targets_above(self, ids: List[str], rels: List[str]) -> List[str]:
+        if len(ids) == 1 and self._is_acyclic(rels):
+            return self._get_targets_above(ids[0], rels)
+
+        found: List[str] = []
+        queue: List[str] = list(ids)
+        queued: Set[str] = set(ids)
+        i: int = 0
+        while i < len(queue):
+            expanded: List[str] = self._expand(queue[i], rels, found)
+            for ref_id in expanded:
+                if ref_id not in queued:
+                    queued.add(ref_id)
+                    queue.append(ref_id)
+            i += 1
+
+        return found
+
+    def _get_targets_above(self, id: str, rels: List[str]) -> List[str]:
+        """
+        Find the targets above a term (as `find_targets`), memoized along each
+        chain of terms with only one way up (which, unless the relations form
+        cycles, continues to the same targets from anywhere).
+        """
+        key: str = ' '.join(rels)
+        targets_above: Optional[Dict[str, List[str]]] = self._targets_above.get(key)
+        if targets_above is None:
+            targets_above = {}
+            self._targets_above[key] = targets_above
+
+        path: List[str] = []
+        found_in_path: List[List[str]] = []
+        above: Optional[List[str]] = None
+        current: str = id
+        while above is None:
+            if current in targets_above:
+                above = targets_above[current]
+            else:
+                found: List[str] = []
+                ref_ids: List[str] = self._expand(current, rels, found)
+                path.append(current)
+                found_in_path.append(found)
+                if len(ref_ids) == 1:
+                    current = ref_ids[0]
+                else:
+                    above = self._find_targets_above(ref_ids, rels)
+
+        j: int = len(path)
+        while j > 0:
+            j -= 1
+            found_here: List[str] = found_in_path[j]
+            if len(found_here) > 0:
+                above = found_here + above
+            targets_above[path[j]] = above
+
+        return above
+
+    def _expand(self, id: str, rels: List[str], found: List[str]) -> List[str]:
+        """
+        Add the target terms referenced by the given term to `found`, and
+        return the other terms it references which lead to any target term.
+        """
+        ref_ids: List[str] = []
+        referenced: List[str] = self._get_refs(id, rels)
+        for ref_id in referenced:
+            if _get_target_priority(self.target, ref_id):
+                found.append(ref_id)
+            elif ref_id not in ref_ids and self.can_reach_target(ref_id, rels):
+                ref_ids.append(ref_id)
+        return ref_ids
+
+    def _is_acyclic(self, rels: List[str]) -> bool:
+        """
+        Check that there are no cycles among the terms leading to any target
+        term (removing each term not referenced by any other, until none are
+        left).
+        """
+        key: str = ' '.join(rels)
+        if key not in self._acyclic:
+            distances: Dict[str, int] = self._get_target_distances(rels)
+
+            ref_counts: Dict[str, int] = {}
+            for id, distance in distances.items():
+                if distance > 0:
+                    ref_counts.setdefault(id, 0)
+                    referenced: List[str] = self._get_refs(id, rels)
+                    for ref_id in referenced:
+                        if ref_id in distances and distances[ref_id] > 0:
+                            ref_counts[ref_id] = ref_counts.get(ref_id, 0) + 1
+
+            unreferenced: List[str] = []
+            for id, count in ref_counts.items():
+                if count == 0:
+                    unreferenced.append(id)
+            i: int = 0
+            while i < len(unreferenced):
+                ref_ids: List[str] = self._get_refs(unreferenced[i], rels)
+                i += 1
+                for ref_id in ref_ids:
+                    if ref_id in ref_counts:
+                        ref_counts[ref_id] = ref_counts[ref_id] - 1
+                        if ref_counts[ref_id] == 0:
+                            unreferenced.append(ref_id)
+
+            removed: int = len(unreferenced)
+            self._acyclic[key] = removed == len(ref_counts)
+
+        return self._acyclic[key]
+
+    def trace_inverse_of_subject(self, obj: Dict) -> Optional[Dict]:
+        """
+        Find the property which `obj` (or the first of its superproperties
+        leading to such a property) is the inverse of, if that leads to
+        rdf:subject.
+        """
+        invs = cast(Optional[List[Dict]], obj.get(OWL_inverseOf))
+
+        if invs is not None:
+            for p in invs:
+                if self.leads_to(p, RDFS_subPropertyOf, RDF_subject):
+                    return p
+
+        supers = cast(Optional[List[Dict]], obj.get(RDFS_subPropertyOf))
+        if supers is None:
+            return None
+
+        tracing: Dict[str, int] = self._get_tracing_inverse_of_subject()
+
+        for supref in supers:
+            sup = cast(Dict, self.vocab_index.get(supref[ID], supref) if ID in supref else supref)
+            if ID in sup and sup[ID] in self.vocab_index:
+                if sup[ID] in tracing:
+                    return sup
+            elif self.trace_inverse_of_subject(sup) is not None:
+                return sup
+
+        return None
+
+    def _get_tracing_inverse_of_subject(self) -> Dict[str, int]:
+        if self._tracing_inverse_of_subject is None:
+            inverses: List[str] = []
+            for id, node in self.vocab_index.items():
+                for p in cast(List[Dict], node.get(OWL_inverseOf, [])):
+                    if self.leads_to(p, RDFS_subPropertyOf, RDF_subject):
+                        inverses.append(id)
+                        break
+            self._tracing_inverse_of_subject = self._collect_distances(
+                [RDFS_subPropertyOf], inverses
+            )
+        return self._tracing_inverse_of_subject
+
+    def _get_target_distances(self, rels: List[str]) -> Dict[str, int]:
+        key: str = ' '.join(rels)
+        distances: Optional[Dict[str, int]] = self._target_distances.get(key)
+        if distances is None:
+            targets: List[str] = []
+            for id in self._get_referrers(rels).keys():
+                if _get_target_priority(self.target, id):
+                    targets.append(id)
+            for id in self.vocab_index.keys():
+                if _get_target_priority(self.target, id):
+                    targets.append(id)
+            distances = self._collect_distances(rels, targets)
+            self._target_distances[key] = distances
+        return distances
+
+    def _collect_distances(self, rels: List[str], ids: List[str]) -> Dict[str, int]:
+        """
+        Map each term leading to any of the given terms (through `rels`) to
+        the number of steps from it to the closest one.
+        """
+        referrers: Dict[str, List[str]] = self._get_referrers(rels)
+        distances: Dict[str, int] = {}
+        queue: List[str] = []
+        for id in ids:
+            if id not in distances:
+                distances[id] = 0
+                queue.append(id)
+
+        # NOTE: Reading from a growing list (rather than popping), to keep each
+        # step constant in time.
+        i: int = 0
+        while i < len(queue):
+            reached: str = queue[i]
+            i += 1
+            referring: List[str] = referrers.get(reached, [])
+            for referrer in referring:
+                if referrer not in distances:
+                    distances[referrer] = distances[reached] + 1
+                    queue.append(referrer)
+
+        return distances
+
+    def _get_referrers(self, rels: List[str]) -> Dict[str, List[str]]:
+        key: str = ' '.join(rels)
+        referrers: Optional[Dict[str, List[str]]] = self._referrers.get(key)
+        if referrers is None:
+            referrers = {}
+            for id in self.vocab_index.keys():
+                referenced: List[str] = self._get_refs(id, rels)
+                for ref_id in referenced:
+                    if ref_id in referrers:
+                        referrers[ref_id].append(id)
+                    else:
+                        referrers[ref_id] = [id]
+            self._referrers[key] = referrers
+        return referrers
+
+    def _get_refs(self, id: str, rels: List[str]) -> List[str]:
+        ref_ids: List[str] = []
+        node: Optional[JsonMap] = self.vocab_index.get(id)
+        if node is not None:
+            for rel in rels:
+                refs: object = node.get(rel)
+                if isinstance(refs, List):
+                    for ref in refs:
+                        if isinstance(ref, Dict) and ID in ref:
+                            ref_ids.append(cast(str, ref[ID]))
+        return ref_ids
+
+
 def make_target_map(vocab: object, target: object) -> Dict:
     target_dfn: Dict[str, object] = OrderedDict()
     if isinstance(target, str):
@@ -77,6 +412,8 @@ def make_target_map(vocab: object, target: object) -> Dict:
 
     vocab_index: Dict[str, JsonMap] = make_index(graph)
 
+    closure: ClosureIndex = ClosureIndex(vocab_index, target_dfn)
+
     target_map: Dict[str, object] = {}
 
     identity_set: Set[str] = set()
@@ -84,11 +421,11 @@ def make_target_map(vocab: object, target: object) -> Dict:
     for obj in graph:
         id: Optional[str] = cast(Optional[str], obj[ID]) if ID in obj else None
 
-        _process_class_relations(obj, vocab_index, target_dfn, target_map)
+        _process_class_relations(obj, vocab_index, closure, target_dfn, target_map)
 
-        _process_property_relations(obj, vocab_index, target_dfn, target_map)
+        _process_property_relations(obj, vocab_index, closure, target_dfn, target_map)
 
-        _process_reified_forms(obj, vocab_index, target_map)
+        _process_reified_forms(obj, vocab_index, closure, target_map)
 
         if id and id not in target_map:
             if _get_target_priority(target_dfn, id) > 0:
@@ -119,7 +456,7 @@ def make_target_map(vocab: object, target: object) -> Dict:
     return target_map
 
 
-def _process_class_relations(obj: Dict, vocab_index: Dict, target: Dict[str, object], target_map: Dict):
+def _process_class_relations(obj: Dict, vocab_index: Dict, closure: ClosureIndex, target: Dict[str, object], target_map: Dict):
     rels: List[str] = [OWL_equivalentClass, RDFS_subClassOf]
 
     # TODO: rework this even more like process_property_relations
@@ -135,10 +472,11 @@ def _process_class_relations(obj: Dict, vocab_index: Dict, target: Dict[str, obj
 
     candidates: Candidates = _collect_candidates(obj, rels)
 
-    seen_candidates: Set[str] = set()
+    # Only the first base class found is used, which is looked up in the
+    # closure index instead of by following each candidate up to its bases.
+    candidate_ids: List[str] = []
 
-    while candidates:
-        crel, candidate = candidates.pop(0)
+    for crel, candidate in candidates:
         if ID not in candidate:
             continue
 
@@ -156,7 +494,7 @@ def _process_class_relations(obj: Dict, vocab_index: Dict, target: Dict[str, obj
                 _add_rule(target_map, source_id, rule, id_target_prio)
                 continue
 
-        candidate = cast(Dict, vocab_index.get(candidate_id, candidate))
+        candidate_ids.append(candidate_id)
 
         target_prio: int = _get_target_priority(target, candidate_id)
         if target_prio:
@@ -164,14 +502,15 @@ def _process_class_relations(obj: Dict, vocab_index: Dict, target: Dict[str, obj
         elif crel in SYMMETRIC and id_target_prio:
             assert id is not None
             _add_rule(target_map, candidate_id, id, id_target_prio)
-        elif candidate_id not in seen_candidates:
-            _extend_candidates(candidates, candidate, rels)
-
-        seen_candidates.add(candidate_id)
 
     if id is not None and not id_target_prio:
         base_rels = [it for it in base_rels if it.base != id]
 
+        if len(base_rels) == 0:
+            base_id: Optional[str] = closure.find_first_target(candidate_ids, rels)
+            if base_id is not None:
+                base_rels.append(BaseRelation(None, base_id))
+
         if len(base_rels) > 0:
             base_classes: List[str] = []
             for baserel in base_rels:
@@ -185,7 +524,7 @@ def _process_class_relations(obj: Dict, vocab_index: Dict, target: Dict[str, obj
             _add_rule(target_map, id, base_classes)
 
 
-def _process_property_relations(obj: Dict, vocab_index: Dict, target: Dict[str, object], target_map: Dict):
+def _process_property_relations(obj: Dict, vocab_index: Dict, closure: ClosureIndex, target: Dict[str, object], target_map: Dict):
     rels: List[str] = [OWL_equivalentProperty, RDFS_subPropertyOf]
 
     if ID not in obj: # TODO: OK?
@@ -208,32 +547,32 @@ def _process_property_relations(obj: Dict, vocab_index: Dict, target: Dict[str,
 
     candidate_prop: Optional[str] = None
 
-    seen_candidates: Set[str] = set()
+    candidate_ids: List[str] = []
 
-    while candidates:
-        crel, candidate = candidates.pop(0)
+    for crel, candidate in candidates:
         if ID not in candidate:
             continue
 
         candidate_id: str = candidate[ID]
-        candidate = cast(Dict, vocab_index.get(candidate_id, candidate))
+        candidate_ids.append(candidate_id)
 
         target_prio: int = _get_target_priority(target, candidate_id)
-        if not id_target_prio and target_prio:
-            baseprops.append((target_prio, candidate_id))
-            _add_rule(target_map, id, candidate_id, target_prio)
-            candidate_prop = candidate_id
-            prop_prio = target_prio
-            #break
-        elif crel in SYMMETRIC and not target_prio and id_target_prio:
+        if crel in SYMMETRIC and not target_prio and id_target_prio:
             _add_rule(target_map, candidate_id, id, id_target_prio)
             candidate_prop = candidate_id
             prop_prio = target_prio
             #break
-        elif candidate_id not in seen_candidates:
-            _extend_candidates(candidates, candidate, rels)
 
-        seen_candidates.add(candidate_id)
+    # All target properties found above a non-target property are used, in
+    # the order in which they are reached.
+    if not id_target_prio:
+        base_ids: List[str] = closure.find_targets(candidate_ids, rels)
+        for base_id in base_ids:
+            base_prio: int = _get_target_priority(target, base_id)
+            baseprops.append((base_prio, base_id))
+            _add_rule(target_map, id, base_id, base_prio)
+            candidate_prop = base_id
+            prop_prio = base_prio
 
     _process_property_chain(obj, vocab_index, target, target_map, candidate_prop, baseprops)
 
@@ -353,15 +692,6 @@ def _collect_candidates(obj: Dict, rels: List[str]) -> Candidates:
     return candidates
 
 
-def _extend_candidates(candidates: Candidates, candidate: Dict, rels: List[str]):
-    for rel in rels:
-        superrefs: Optional[List[Dict]] = cast(Optional[List[Dict]], candidate.get(rel))
-        if superrefs is not None:
-            for sup in superrefs:
-                if ID in sup:
-                    candidates.append((None, sup))
-
-
 def _class_to_match_node(rtype: Optional[str], vocab_index: Dict[str, JsonMap]) -> Optional[Dict]:
     if rtype is None:
         return None
@@ -401,8 +731,8 @@ def _class_to_match_node(rtype: Optional[str], vocab_index: Dict[str, JsonMap])
     return {TYPE: rtype}
 
 
-def _process_reified_forms(obj: Dict, vocab_index: Dict, target_map: Dict[str, object]):
-    prop = _trace_inverse_of_subject(obj, vocab_index)
+def _process_reified_forms(obj: Dict, vocab_index: Dict, closure: ClosureIndex, target_map: Dict[str, object]):
+    prop = closure.trace_inverse_of_subject(obj)
 
     if prop is not None:
         ranges: List[Dict] = []
@@ -424,9 +754,9 @@ def _process_reified_forms(obj: Dict, vocab_index: Dict, target_map: Dict[str, o
             reverses: Optional[Dict] = cast(Dict, range_node.get(REVERSE))
             in_domain_of: List[Dict] = cast(List[Dict], reverses.get(RDFS_domain, [])) if reverses is not None else []
             for domain_prop in in_domain_of:
-                if leads_to(domain_prop, vocab_index, RDFS_subPropertyOf, RDF_predicate):
+                if closure.leads_to(domain_prop, RDFS_subPropertyOf, RDF_predicate):
                     property_from = domain_prop[ID]
-                elif leads_to(domain_prop, vocab_index, RDFS_subPropertyOf, RDF_object):
+                elif closure.leads_to(domain_prop, RDFS_subPropertyOf, RDF_object):
                     value_from = domain_prop[ID]
 
         if property_from and value_from and isinstance(prop_id, str):
@@ -436,26 +766,6 @@ def _process_reified_forms(obj: Dict, vocab_index: Dict, target_map: Dict[str, o
             _add_rule(target_map, prop_id, rule, target_prio)
 
 
-def _trace_inverse_of_subject(obj: Dict, vocab_index: Dict) -> Optional[Dict]:
-    invs = cast(Optional[List[Dict]], obj.get(OWL_inverseOf))
-
-    if invs is not None:
-        for p in invs:
-            if leads_to(p, vocab_index, RDFS_subPropertyOf, RDF_subject):
-                return p
-
-    supers = cast(Optional[List[Dict]], obj.get(RDFS_subPropertyOf))
-    if supers is None:
-        return None
-
-    for supref in supers:
-        sup = cast(Dict, vocab_index.get(supref[ID], supref) if ID in supref else supref)
-        if _trace_inverse_of_subject(sup, vocab_index):
-            return sup
-
-    return None
-
-
 def _add_rule(target_map: Dict[str, object],
               source_id: str,
               rule: Union[str, List, Dict],
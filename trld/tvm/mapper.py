@@ -8,17 +8,140 @@ from ..jsonld.base import as_list, JsonMap
 ListOrJsonMap = Union[List, Dict[str, object]]
 
 
+class DataIndex:
+    """
+    Index of the nodes in the input data, made on first use (i.e. only if a
+    rule matches the type of a node referenced by @id).
+    """
+
+    graph: List[JsonMap]
+    _index: Optional[Dict[str, JsonMap]]
+
+    def __init__(self, graph: List[JsonMap]):
+        self.graph = graph
+        self._index = None
+
+    def get(self, id: str) -> Optional[JsonMap]:
+        if self._index is None:
+            # Reverse links are not used (and would be added to the data).
+            self._index = make_index(self.graph, False)
+        return self._index.get(id)
+
+
 def map_to(target_map: Dict, indata: ListOrJsonMap, drop_unmapped=False) -> ListOrJsonMap:
     result: ListOrJsonMap = {} if isinstance(indata, Dict) else []
 
-    data_index: Dict[str, JsonMap] = make_index(as_list(indata))
+    data_index: DataIndex = DataIndex(as_list(indata))
 
     _modify(data_index, target_map, indata, result, drop_unmapped)
 
     return result
 
 
-def _modify(data_index: Dict, target_map: Dict, ino: ListOrJsonMap, outo: Union[Dict, List], drop_unmapped: bool):
+def map_to_targets(target_maps: List[Dict], indata: ListOrJsonMap, drop_unmapped=False) -> List[ListOrJsonMap]:
+    """
+    Map the input data with each of the given target maps, in one traversal
+    of the input. Results are returned in the order of the target maps, and
+    are the same as those of `map_to` for each.
+
+    Input nodes are visited once for all target maps which keep them as is,
+    or only rename the key leading to them. Where a target map applies any
+    other rule, the values are mapped for that target map alone.
+    """
+    results: List[ListOrJsonMap] = []
+    for target_map in target_maps:
+        results.append({} if isinstance(indata, Dict) else [])
+
+    data_index: DataIndex = DataIndex(as_list(indata))
+
+    _modify_each(data_index, target_maps, indata, results, drop_unmapped)
+
+    return results
+
+
+def _modify_each(data_index: DataIndex, target_maps: List[Dict], ino: ListOrJsonMap, outos: List, drop_unmapped: bool):
+    if isinstance(ino, Dict):
+        for k, v in cast(Dict[str, object], ino).items(): # TODO: cast just for transpile
+            _modify_pair_each(data_index, target_maps, k, v, outos, drop_unmapped)
+    elif isinstance(ino, List):
+        i: int = 0
+        for v in ino:
+            _modify_pair_each(data_index, target_maps, i, v, outos, drop_unmapped)
+            i += 1
+
+
+def _modify_pair_each(data_index: DataIndex, target_maps: List[Dict], k: Union[str, int], v: object, outos: List, drop_unmapped: bool):
+    shared_maps: List[Dict] = []
+    shared_outos: List = []
+    shared_keys: List[Union[str, int]] = []
+
+    j: int = 0
+    for target_map in target_maps:
+        outo: Union[Dict, List] = outos[j]
+        j += 1
+
+        somerule: object = target_map.get(k)
+        if drop_unmapped and somerule is None and isinstance(k, str) and k[0] != '@':
+            continue
+
+        if somerule is None:
+            shared_keys.append(k)
+        else:
+            rules: List = as_list(somerule)
+            if len(rules) > 0 and isinstance(rules[0], str):
+                shared_keys.append(rules[0])
+            else:
+                _modify_pair(data_index, target_map, k, v, outo, drop_unmapped)
+                continue
+
+        shared_maps.append(target_map)
+        shared_outos.append(outo)
+
+    if len(shared_maps) == 0:
+        return
+
+    mapvs: List[object] = []
+
+    if isinstance(v, List):
+        outlists: List[List] = []
+        for target_map in shared_maps:
+            outlists.append([])
+
+        for item in v:
+            if isinstance(item, Dict):
+                outvs: List = []
+                for target_map in shared_maps:
+                    outvs.append({})
+                _modify_each(data_index, shared_maps, item, outvs, drop_unmapped)
+                j = 0
+                for outv in outvs:
+                    outlists[j].append(outv)
+                    j += 1
+            else:
+                j = 0
+                for target_map in shared_maps:
+                    outlist: List = outlists[j]
+                    j += 1
+                    mapped: object = target_map[item] if isinstance(item, str) and item in target_map else item
+                    for it in as_list(mapped):
+                        _modify_pair(data_index, target_map, len(outlist), it, outlist, drop_unmapped)
+
+        mapvs += outlists
+    elif isinstance(v, Dict):
+        for target_map in shared_maps:
+            mapvs.append({})
+        _modify_each(data_index, shared_maps, v, mapvs, drop_unmapped)
+    else:
+        for target_map in shared_maps:
+            mapvs.append(v)
+
+    j = 0
+    for mapv in mapvs:
+        _put(shared_outos[j], shared_keys[j], mapv)
+        j += 1
+
+
+def _modify(data_index: DataIndex, target_map: Dict, ino: ListOrJsonMap, outo: Union[Dict, List], drop_unmapped: bool):
     if isinstance(ino, Dict):
         for k, v in cast(Dict[str, object], ino).items(): # TODO: cast just for transpile
             _modify_pair(data_index, target_map, k, v, outo, drop_unmapped)
@@ -29,7 +152,7 @@ def _modify(data_index: Dict, target_map: Dict, ino: ListOrJsonMap, outo: Union[
             i += 1
 
 
-def _modify_pair(data_index: Dict, target_map: Dict, k: Union[str, int], v: object, outo: Union[Dict, List], drop_unmapped: bool):
+def _modify_pair(data_index: DataIndex, target_map: Dict, k: Union[str, int], v: object, outo: Union[Dict, List], drop_unmapped: bool):
     mapo: Dict[Union[str, int], Union[List, Dict, str]] = _map(data_index, target_map, k, v, drop_unmapped)
 
     for mapk, mapv in mapo.items():
@@ -43,18 +166,22 @@ def _modify_pair(data_index: Dict, target_map: Dict, k: Union[str, int], v: obje
             _modify(data_index, target_map, mapv, outv, drop_unmapped)
             mapv = outv
 
-        if isinstance(outo, Dict):
-            if mapk in outo:
-                values: List = as_list(outo[mapk])
-                values += as_list(mapv)
-                mapv = values
+        _put(outo, mapk, mapv)
 
-            outo[mapk] = mapv
-        else:
-            outo.append(mapv)
+
+def _put(outo: Union[Dict, List], mapk: Union[str, int], mapv: object):
+    if isinstance(outo, Dict):
+        if mapk in outo:
+            values: List = as_list(outo[mapk])
+            values += as_list(mapv)
+            mapv = values
+
+        outo[mapk] = mapv
+    else:
+        outo.append(mapv)
 
 
-def _map(data_index: Dict, target_map: Dict, key: Union[str, int], value, drop_unmapped=False) -> Dict:
+def _map(data_index: DataIndex, target_map: Dict, key: Union[str, int], value, drop_unmapped=False) -> Dict:
     somerule: object = target_map.get(key)
 
     if drop_unmapped and somerule is None and isinstance(key, str) and key[0] != '@':
@@ -115,8 +242,10 @@ def _map(data_index: Dict, target_map: Dict, key: Union[str, int], value, drop_u
                         vo: Dict = v
                         if TYPE in v:
                             vo = v
-                        elif ID in v and v[ID] in data_index:
-                            vo = data_index[v[ID]]
+                        elif ID in v:
+                            described: Optional[JsonMap] = data_index.get(v[ID])
+                            if described is not None:
+                                vo = described
 
                         for t in cast(List, vo.get(TYPE, [])):
                             if t == match[TYPE]:
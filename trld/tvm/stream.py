@@ -0,0 +1,105 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from ..batches import batched, map_batches
+from ..jsonld.compaction import compact
+from ..jsonld.context import Context, get_context
+from ..jsonld.expansion import expand
+from ..jsonld.keys import CONTEXT
+from ..platform.common import json_decode, json_encode_bytes
+from .mapper import map_to
+
+
+class RecordMapper:
+    """
+    Maps NDJSON records, each on its own line: expands a record, maps it
+    with a shared target map, and compacts the result using the target
+    context (omitted from the result).
+
+    >>> mapper = RecordMapper(
+    ...     {'urn:x:name': ['urn:y:label']}, {'@context': {'@vocab': 'urn:y:'}})
+    >>> mapper.map_line('{"@id": "urn:r:1", "urn:x:name": "One"}')
+    b'{"@id":"urn:r:1","label":"One"}\\n'
+    """
+
+    target_map: Dict
+    target_context: Context
+    context_ref: Optional[str]
+    drop_unmapped: bool
+    base_iri: Optional[str]
+
+    def __init__(
+        self,
+        target_map: Dict,
+        target: object,
+        context_ref: Optional[str] = None,
+        drop_unmapped=False,
+        base_iri: Optional[str] = None,
+    ):
+        self.target_map = target_map
+        # Parsed once, rather than for each record compacted.
+        self.target_context = get_context(target, base_iri)
+        self.context_ref = context_ref
+        self.drop_unmapped = drop_unmapped
+        self.base_iri = base_iri
+
+    def map_line(self, line: str) -> bytes:
+        record = json_decode(line)
+        expanded = expand(record, self.base_iri, self.context_ref)  # type: ignore
+        mapped = map_to(self.target_map, expanded, self.drop_unmapped)
+        result = compact(self.target_context, mapped, self.base_iri)
+        if isinstance(result, dict):
+            result.pop(CONTEXT, None)
+        return json_encode_bytes(result, newline=True)
+
+    def map_lines(self, lines: List[str]) -> List[bytes]:
+        return [self.map_line(line) for line in lines]
+
+
+def map_record_lines(
+    lines: Iterable[str],
+    target_map: Dict,
+    target: object,
+    context_ref: Optional[str] = None,
+    drop_unmapped=False,
+    base_iri: Optional[str] = None,
+    jobs: int = 1,
+    batch_size: int = 1000,
+) -> Iterator[bytes]:
+    """
+    Map a stream of NDJSON records (see `RecordMapper`), yielding the results
+    as NDJSON lines, in input order. Blank lines are skipped.
+
+    With more than one job, batches of lines are mapped in a pool of worker
+    processes. At most two batches per worker are pending at any time, so
+    memory use is bounded regardless of the number of records.
+    """
+    records = (line for line in lines if line.strip())
+
+    if jobs < 2:
+        mapper = RecordMapper(target_map, target, context_ref, drop_unmapped, base_iri)
+        for batch in batched(records, batch_size):
+            yield from mapper.map_lines(batch)
+        return
+
+    initargs = (target_map, target, context_ref, drop_unmapped, base_iri)
+    for results in map_batches(_map_lines, records, jobs, batch_size, _init_worker, initargs):
+        yield from results
+
+
+_worker_mapper: Optional[RecordMapper] = None
+
+
+def _init_worker(
+    target_map: Dict,
+    target: object,
+    context_ref: Optional[str],
+    drop_unmapped: bool,
+    base_iri: Optional[str],
+) -> None:
+    global _worker_mapper
+    _worker_mapper = RecordMapper(target_map, target, context_ref, drop_unmapped, base_iri)
+
+
+def _map_lines(lines: List[str]) -> List[bytes]:
+    assert _worker_mapper is not None
+    return _worker_mapper.map_lines(lines)
@@ -7,7 +7,7 @@ from ..jsonld.flattening import flatten
 from ..jsonld.compaction import compact
 from ..jsonld.extras.index import make_index
 from .mapmaker import make_target_map, leads_to
-from .mapper import ListOrJsonMap, map_to
+from .mapper import ListOrJsonMap, map_to, map_to_targets
 
 
 DEBUG = False
@@ -109,6 +109,29 @@ def test_cope_with_circular_references():
     print_ok()
 
 
+def test_cope_with_circular_property_references():
+    target = {"@vocab": "http://www.w3.org/2000/01/rdf-schema#"}
+
+    assuming = {
+        "@graph": [
+            {
+                "@id": "ex:name",
+                "rdfs:subPropertyOf": {"@id": "ex:title"}
+            },
+            {
+                "@id": "ex:title",
+                "rdfs:subPropertyOf": [{"@id": "ex:name"}, {"@id": "rdfs:label"}]
+            }
+        ]
+    }
+
+    target_map: Dict = _to_target_map(target, assuming)
+    assert target_map["http://example.org/ns#name"][0] == "http://www.w3.org/2000/01/rdf-schema#label"
+    assert target_map["http://example.org/ns#title"][0] == "http://www.w3.org/2000/01/rdf-schema#label"
+
+    print_ok()
+
+
 def test_reducing_foaf_to_rdfs():
     given = {
         "@id": "",
@@ -636,6 +659,88 @@ def test_add_to_existing_key():
     check(given, target, expect, assuming)
 
 
+def test_linked_nodes_are_not_modified():
+    given = {
+        "@graph": [
+            {"@id": "ex:a", "dc:title": "A", "dc:creator": {"@id": "ex:b"}},
+            {"@id": "ex:b", "foaf:name": "B"}
+        ]
+    }
+
+    expect = {
+        "@graph": [
+            {"@id": "ex:a", "rdfs:label": "A", "dc:creator": {"@id": "ex:b"}},
+            {"@id": "ex:b", "rdfs:label": "B"}
+        ]
+    }
+
+    target = {"@vocab": "http://www.w3.org/2000/01/rdf-schema#"}
+
+    assuming = {
+        "@graph": [
+            {
+                "@id": "foaf:name",
+                "rdfs:subPropertyOf": {"@id": "rdfs:label"}
+            },
+            {
+                "@id": "dc:title",
+                "rdfs:subPropertyOf": {"@id": "rdfs:label"}
+            }
+        ]
+    }
+
+    check(given, target, expect, assuming)
+
+
+def test_map_to_several_targets() -> None:
+    given = {
+        "@graph": [
+            {"@id": "ex:a", "@type": "bibo:Book", "dc:title": "A", "dc:creator": {"@id": "ex:b"}},
+            {"@id": "ex:b", "foaf:name": "B"}
+        ]
+    }
+
+    assuming = {
+        "@graph": [
+            {
+                "@id": "bibo:Book",
+                "rdfs:subClassOf": {"@id": "schema:Book"}
+            },
+            {
+                "@id": "foaf:name",
+                "rdfs:subPropertyOf": {"@id": "rdfs:label"},
+                "owl:equivalentProperty": {"@id": "schema:name"}
+            },
+            {
+                "@id": "dc:title",
+                "rdfs:subPropertyOf": {"@id": "rdfs:label"},
+                "owl:equivalentProperty": {"@id": "schema:name"}
+            },
+            {
+                "@id": "dc:creator",
+                "owl:equivalentProperty": {"@id": "schema:author"}
+            }
+        ]
+    }
+
+    target_maps: List[Dict] = [
+        _to_target_map({"@vocab": "http://www.w3.org/2000/01/rdf-schema#"}, assuming),
+        _to_target_map({"@vocab": "http://schema.org/"}, assuming)
+    ]
+
+    indata: JsonObject = expand(dict(context, **given), "")
+    for drop_unmapped in [False, True]:
+        results: List = map_to_targets(target_maps, cast(ListOrJsonMap, indata), drop_unmapped)
+        assert len(results) == 2
+        i: int = 0
+        for target_map in target_maps:
+            expected: ListOrJsonMap = map_to(target_map, cast(ListOrJsonMap, indata), drop_unmapped)
+            assert _jsonstr(results[i]) == _jsonstr(expected)
+            i += 1
+
+    print_ok()
+
+
 def test_only_add_most_specific() -> None:
     given = {
         "@id": "",